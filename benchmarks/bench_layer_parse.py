@@ -0,0 +1,125 @@
+"""
+bench_layer_parse.py - Benchmark: extent switch latency vs number of parse processes.
+
+Writes a synthetic extent (one GeoJSON file per layer, no .geobin copies)
+and measures the time until every layer has its geometry and spatial index,
+as done when an extent is selected in SettingView:
+
+    - in-process:  layer_parse_geojson() of every file, one after another
+    - N processes: every file submitted to a LayerParsePool(N) at once,
+                   arrays returned through shared memory
+
+The worker processes are started (and warmed up) before timing, to measure
+the parsing alone; MapVisualize starts them with the first layer of an extent
+and stops them once the extent is parsed.
+
+Execution:
+    python benchmarks/bench_layer_parse.py [--layers 12] [--features 2000] [--vertices 64] [--processes 1 2 4]
+
+Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Allow running from anywhere: make the project root importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from views.map.map_layer.layer_geometry import LayerGeometry
+from views.map.map_layer.layer_index import LayerGridIndex
+from views.map.map_layer.layer_parse import LayerParsePool, layer_parse_geojson
+
+
+# ********************************************************************************************
+def make_layer(path, features, vertices, seed):
+    """Write a GeoJSON layer of `features` random polygons with `vertices` points each."""
+    rng = random.Random(seed)
+    items = []
+    for i in range(features):
+        cx = 106.0 + rng.random()
+        cy = 10.0 + rng.random()
+        radius = 0.001 + 0.01 * rng.random()
+        ring = [
+            [cx + radius * math.cos(2 * math.pi * k / vertices), cy + radius * math.sin(2 * math.pi * k / vertices)]
+            for k in range(vertices)
+        ]
+        ring.append(ring[0])
+        items.append({
+            "type": "Feature",
+            "properties": {"OBJNAM": f"feature {i}", "SCAMIN": 22000, "RECID": seed * features + i},
+            "geometry": {"type": "Polygon", "coordinates": [ring]},
+        })
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"type": "FeatureCollection", "name": os.path.basename(path), "features": items}, f)
+
+
+def layer_finish(layer_data):
+    """Build what GeoJSONLayer builds from parsed data (geometry + spatial index)."""
+    geometry = LayerGeometry(
+        layer_data.merc, layer_data.ring_offsets, layer_data.ring_feature,
+        layer_data.ring_closed, layer_data.feature_count,
+    )
+    return LayerGridIndex(geometry.feature_bbox)
+
+
+def bench_in_process(paths):
+    """Return milliseconds to load every layer one after another."""
+    start = time.perf_counter()
+    for path in paths:
+        layer_finish(layer_parse_geojson(path))
+    return (time.perf_counter() - start) * 1000.0
+
+
+def bench_pool(paths, processes, warmup_path):
+    """Return milliseconds to load every layer through a LayerParsePool."""
+    pool = LayerParsePool(processes, idle_shutdown=False)
+    try:
+        for future in [pool.submit(warmup_path) for _ in range(processes)]:
+            future.result()
+
+        start = time.perf_counter()
+        for future in [pool.submit(path) for path in paths]:
+            layer_finish(future.result())
+        return (time.perf_counter() - start) * 1000.0
+    finally:
+        pool.shutdown()
+# ********************************************************************************************
+
+
+# ********************************************************************************************
+if __name__ == "__main__":
+    cpu_count = os.cpu_count() or 1
+    default_processes = sorted({1, 2, 4, 8, cpu_count} & set(range(1, cpu_count + 1)))
+
+    parser = argparse.ArgumentParser(description="Benchmark extent switch latency against parse processes")
+    parser.add_argument("--layers", type=int, default=12)
+    parser.add_argument("--features", type=int, default=2000, help="Polygons per layer")
+    parser.add_argument("--vertices", type=int, default=64, help="Vertices per polygon")
+    parser.add_argument("--processes", type=int, nargs="+", default=default_processes)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as extent_dir:
+        paths = []
+        for i in range(args.layers):
+            path = os.path.join(extent_dir, f"LAYER{i:02d}.geojson")
+            make_layer(path, args.features, args.vertices, i)
+            paths.append(path)
+        warmup_path = os.path.join(extent_dir, "WARMUP.geojson")
+        make_layer(warmup_path, 1, 4, 0)
+
+        size_mb = sum(os.path.getsize(p) for p in paths) / (1024 * 1024)
+        print(f"Extent: {args.layers} layers x {args.features} polygons x {args.vertices} vertices "
+              f"({size_mb:.1f} MB GeoJSON), {cpu_count} CPU cores")
+
+        base_ms = bench_in_process(paths)
+        print(f"  in-process        : {base_ms:9.1f} ms")
+        for processes in args.processes:
+            pool_ms = bench_pool(paths, processes, warmup_path)
+            print(f"  {processes:2d} process(es)   : {pool_ms:9.1f} ms  ({base_ms / pool_ms:5.2f}x)")
+# ********************************************************************************************
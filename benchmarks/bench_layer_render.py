@@ -0,0 +1,139 @@
+"""
+bench_layer_render.py - Micro-benchmark: per-ring vs batched vector layer rendering.
+
+Renders a synthetic layer of 10k polygon rings (20 MultiPolygon features of
+500 rings each) into a 1920x1080 surface:
+
+    - per-ring: path, set_source, set_dash, show_text, fill_preserve and
+                stroke for every ring (the former GeoJSONLayer renderer)
+    - batched:  GeoJSONLayer.render_transform(): one even-odd fill per feature
+                (all its rings), one compound path and one stroke per layer
+
+Execution:
+    python benchmarks/bench_layer_render.py [--frames 20] [--features 20] [--rings 500] [--vertices 16]
+
+Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Allow running from anywhere: make the project root importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import cairo
+
+from views.map.map_layer.geojson_layer import GeoJSONLayer
+from views.map.map_projection import MapViewTransform
+
+VIEWPORT_W = 1920
+VIEWPORT_H = 1080
+
+
+# ********************************************************************************************
+def make_layer(path, features, rings, vertices):
+    """Write a GeoJSON layer of `features` MultiPolygons with `rings` small rings each."""
+    rng = random.Random(0)
+    items = []
+    for i in range(features):
+        polygons = []
+        for _ in range(rings):
+            cx = 106.0 + 0.2 * rng.random()
+            cy = 10.0 + 0.1 * rng.random()
+            radius = 0.0005 + 0.002 * rng.random()
+            ring = [
+                [cx + radius * math.cos(2 * math.pi * k / vertices), cy + radius * math.sin(2 * math.pi * k / vertices)]
+                for k in range(vertices)
+            ]
+            ring.append(ring[0])
+            polygons.append([ring])
+        items.append({
+            "type": "Feature",
+            "properties": {"OBJNAM": f"feature {i}"},
+            "geometry": {"type": "MultiPolygon", "coordinates": polygons},
+        })
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"type": "FeatureCollection", "name": "BENCH", "features": items}, f)
+
+
+def view_transform(layer):
+    """Return a transform fitting the whole layer in the viewport (finest zoom that fits)."""
+    bbox = layer.geometry.feature_bbox
+    min_x, min_y = bbox[:, 0].min(), bbox[:, 1].min()
+    max_x, max_y = bbox[:, 2].max(), bbox[:, 3].max()
+    zoom = int(math.floor(math.log2(min(VIEWPORT_W / (max_x - min_x), VIEWPORT_H / (max_y - min_y)) / 256)))
+    scale = (1 << zoom) * 256
+    return MapViewTransform(
+        zoom, scale,
+        VIEWPORT_W / 2 - (min_x + max_x) / 2 * scale,
+        VIEWPORT_H / 2 - (min_y + max_y) / 2 * scale,
+    )
+
+
+def render_per_ring(layer, ctx, transform):
+    """The former renderer: every ring is pathed, styled, filled and stroked on its own."""
+    ctx.set_line_width(layer.line_width)
+    geometry = layer.lod.level_for_zoom(transform.zoom)
+    x0, y0, x1, y1 = ctx.clip_extents()
+    visible = layer.index.query(*transform.pixel_bbox_to_mercator(x0, y0, x1, y1))
+
+    for feature_idx in visible.tolist():
+        for ring_idx in geometry.feature_rings(feature_idx):
+            start, end = geometry.ring_range(ring_idx)
+            layer._draw_linestring(ctx, transform.apply(geometry.merc[start:end]).tolist())
+            if geometry.ring_closed[ring_idx]:
+                ctx.close_path()
+                if layer.fill_color:
+                    ctx.set_source_rgba(*layer.fill_color, layer.fill_opacity)
+                    ctx.fill_preserve()
+            ctx.set_source_rgb(*layer.line_color)
+            ctx.set_dash(layer.line_style)
+            ctx.show_text(layer.name)
+            ctx.stroke()
+
+
+def bench(layer, transform, render, frames):
+    """Return average milliseconds per frame."""
+    target = cairo.ImageSurface(cairo.FORMAT_ARGB32, VIEWPORT_W, VIEWPORT_H)
+    ctx = cairo.Context(target)
+    render(layer, ctx, transform)  # warm-up
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        render(layer, ctx, transform)
+    target.flush()
+    return (time.perf_counter() - start) * 1000.0 / frames
+# ********************************************************************************************
+
+
+# ********************************************************************************************
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-ring vs batched layer rendering")
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--rings", type=int, default=500, help="Rings per MultiPolygon feature")
+    parser.add_argument("--vertices", type=int, default=16, help="Vertices per ring")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "BENCH.geojson")
+        make_layer(path, args.features, args.rings, args.vertices)
+        layer = GeoJSONLayer(path, line_color=(0.2, 0.2, 0.6), line_width=1, fill_color=(0.7, 0.85, 1.0))
+
+    transform = view_transform(layer)
+    per_ring_ms = bench(layer, transform, render_per_ring, args.frames)
+    batched_ms = bench(layer, transform, lambda l, ctx, t: l.render_transform(ctx, t), args.frames)
+
+    print(f"Layer: {args.features} features x {args.rings} rings x {args.vertices} vertices "
+          f"({layer.geometry.ring_count} rings), zoom {transform.zoom}, {VIEWPORT_W}x{VIEWPORT_H}, {args.frames} frames")
+    print(f"  per-ring (fill + stroke per ring): {per_ring_ms:8.2f} ms/frame")
+    print(f"  batched  (fill per feature)      : {batched_ms:8.2f} ms/frame")
+    if batched_ms > 0:
+        print(f"  speed-up                         : {per_ring_ms / batched_ms:8.2f}x")
+# ********************************************************************************************
@@ -0,0 +1,101 @@
+"""
+bench_tile_surface.py - Micro-benchmark: pixbuf vs pre-converted surface tile painting.
+
+Measures the per-frame cost of painting the tiles of a 1920x1080 viewport:
+
+    - pixbuf:  Gdk.cairo_set_source_pixbuf() + paint() per tile
+               (RGB(A) → premultiplied conversion on every paint)
+    - surface: ctx.set_source_surface() + paint() per tile
+               (tiles converted once by tile_surface_from_pixbuf())
+
+Execution:
+    python benchmarks/bench_tile_surface.py [--frames 200] [--alpha]
+
+Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+# Allow running from anywhere: make the project root importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import cairo
+import gi
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gdk, GdkPixbuf
+
+from views.map.map_tile.tile_surface import tile_surface_from_pixbuf
+
+TILE_SIZE = 256
+VIEWPORT_W = 1920
+VIEWPORT_H = 1080
+
+
+# ********************************************************************************************
+def make_tiles(count, has_alpha):
+    """Create `count` distinct synthetic tile pixbufs."""
+    tiles = []
+    for i in range(count):
+        pixbuf = GdkPixbuf.Pixbuf.new(GdkPixbuf.Colorspace.RGB, has_alpha, 8, TILE_SIZE, TILE_SIZE)
+        pixbuf.fill(((i * 2654435761) & 0xFFFFFF00) | 0xFF)
+        tiles.append(pixbuf)
+    return tiles
+
+
+def paint_frame(ctx, tiles, use_surface):
+    """Paint one viewport worth of tiles."""
+    cols = math.ceil(VIEWPORT_W / TILE_SIZE)
+    rows = math.ceil(VIEWPORT_H / TILE_SIZE)
+    for n in range(cols * rows):
+        x = (n % cols) * TILE_SIZE
+        y = (n // cols) * TILE_SIZE
+        tile = tiles[n % len(tiles)]
+        if use_surface:
+            ctx.set_source_surface(tile, x, y)
+        else:
+            Gdk.cairo_set_source_pixbuf(ctx, tile, x, y)
+        ctx.paint()
+
+
+def bench(tiles, use_surface, frames):
+    """Return average milliseconds per frame."""
+    target = cairo.ImageSurface(cairo.FORMAT_ARGB32, VIEWPORT_W, VIEWPORT_H)
+    ctx = cairo.Context(target)
+    paint_frame(ctx, tiles, use_surface)  # warm-up
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        paint_frame(ctx, tiles, use_surface)
+    target.flush()
+    return (time.perf_counter() - start) * 1000.0 / frames
+# ********************************************************************************************
+
+
+# ********************************************************************************************
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark tile painting for a 1920x1080 viewport")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--alpha", action="store_true", help="Use RGBA tiles (default: RGB)")
+    args = parser.parse_args()
+
+    count = math.ceil(VIEWPORT_W / TILE_SIZE) * math.ceil(VIEWPORT_H / TILE_SIZE)
+    pixbufs = make_tiles(count, args.alpha)
+
+    start = time.perf_counter()
+    surfaces = [tile_surface_from_pixbuf(p) for p in pixbufs]
+    convert_ms = (time.perf_counter() - start) * 1000.0
+
+    pixbuf_ms = bench(pixbufs, False, args.frames)
+    surface_ms = bench(surfaces, True, args.frames)
+
+    print(f"Viewport {VIEWPORT_W}x{VIEWPORT_H}: {count} tiles/frame, {args.frames} frames, alpha={args.alpha}")
+    print(f"  pixbuf  (convert on paint): {pixbuf_ms:8.3f} ms/frame")
+    print(f"  surface (pre-converted)   : {surface_ms:8.3f} ms/frame")
+    print(f"  one-time conversion       : {convert_ms:8.3f} ms total ({convert_ms / count:.3f} ms/tile)")
+    if surface_ms > 0:
+        print(f"  speed-up                  : {pixbuf_ms / surface_ms:8.2f}x")
+# ********************************************************************************************
@@ -10,19 +10,86 @@ Settings:
         Enable/disable runtime tile downloading feature.
         Default = False
 
+    ENABLE_FEATURE_LAYER_RASTER_CACHE (bool):
+        Draw vector layers from pre-rendered, cached 256x256 overlay tiles
+        (rendered in background) instead of stroking every path per compose.
+        Default = False
+
     VNEST_AUTOPILOT_DATABASE_PATH (str): 
         Path to the ENC metadata database directory.
         Default = "database"
 
+    MAP_TILE_CACHE_MAX_BYTES (int):
+        Memory budget of the in-memory map tile cache, in bytes.
+        Least recently used tiles are evicted once the budget is exceeded.
+        Default = 128 MB
+
+    MAP_TILE_LOADER_WORKERS (int):
+        Number of worker threads decoding map tiles in the background.
+        Default = 4
+
+    MAP_TILE_PREFETCH_LOOKAHEAD_S (float):
+        How far ahead, in seconds, the viewport is predicted from the pan
+        velocity / ship motion when prefetching tiles.
+        Default = 1.5
+
+    MAP_TILE_PREFETCH_BUDGET_RATIO (float):
+        Share of MAP_TILE_CACHE_MAX_BYTES that prefetched (not yet visible)
+        tiles may occupy. 0 disables prefetching.
+        Default = 0.25
+
+    MAP_LAYER_RASTER_CACHE_MAX_BYTES (int):
+        Memory budget of the vector layer overlay tiles, in bytes
+        (only used with ENABLE_FEATURE_LAYER_RASTER_CACHE).
+        Default = 64 MB
+
+    MAP_LAYER_RASTER_WORKERS (int):
+        Number of worker threads rendering overlay tiles.
+        Default = 2
+
+    MAP_LAYER_CACHE_MAX_BYTES (int):
+        Memory budget of loaded vector layers kept for re-use after they are
+        hidden or their extent is left (LRU).
+        Default = 256 MB
+
+    MAP_LAYER_LOADER_WORKERS (int):
+        Number of worker threads parsing / projecting GeoJSON layers
+        off the GTK main loop.
+        Default = 2
+
+    MAP_LAYER_PARSE_PROCESSES (int):
+        Number of worker processes decoding GeoJSON layers without a .geobin
+        copy (0 = one per CPU core, at most 2). The processes are stopped once
+        the pending layers are parsed.
+        Default = 0
+
 Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
 """
 
 # ********************************************************************************************
 # [Feature Flags]
 ENABLE_FEATURE_TILE_DOWNLOAD_RUNTIME = False
+ENABLE_FEATURE_LAYER_RASTER_CACHE = False
 # ********************************************************************************************
 
 # ********************************************************************************************
 # [Database Settings]
 VNEST_AUTOPILOT_DATABASE_PATH = "database"
 # ********************************************************************************************
+
+# ********************************************************************************************
+# [Map Tile Settings]
+MAP_TILE_CACHE_MAX_BYTES = 128 * 1024 * 1024
+MAP_TILE_LOADER_WORKERS = 4
+MAP_TILE_PREFETCH_LOOKAHEAD_S = 1.5
+MAP_TILE_PREFETCH_BUDGET_RATIO = 0.25
+# ********************************************************************************************
+
+# ********************************************************************************************
+# [Map Layer Settings]
+MAP_LAYER_RASTER_CACHE_MAX_BYTES = 64 * 1024 * 1024
+MAP_LAYER_RASTER_WORKERS = 2
+MAP_LAYER_CACHE_MAX_BYTES = 256 * 1024 * 1024
+MAP_LAYER_LOADER_WORKERS = 2
+MAP_LAYER_PARSE_PROCESSES = 0
+# ********************************************************************************************
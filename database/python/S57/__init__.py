@@ -14,6 +14,9 @@ from .export_geojson import (
 	extract_named_locations		# Extract location name to display on application
 )
 
+# Export a parsed GeoJSON layer to the binary geometry format read by the map
+from .export_geobin import export_geobin
+
 # Bounding box utilities
 from .bounding_box import (
     bounding_box,               # Extract the largest bounding box from S57 layers
@@ -26,6 +29,7 @@ from .bounding_box import (
 __all__ = [
     "export_geojson",
     "extract_named_locations",
+    "export_geobin",
     "bounding_box",
     "bounding_box_padded",
     "bounding_box_get_center",
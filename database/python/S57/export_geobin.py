@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+"""
+Binary layer geometry format (read by views/map/map_layer/layer_geobin.py)
+
+    <LAYER>.geobin, little-endian, every section 8-byte aligned:
+
+        header          magic b"VGEO", version uint32 (= 1),
+                        feature_count, ring_count, vertex_count,
+                        meta_size, props_size                  (uint64 each)
+        coords          vertex_count x 2 float64   (lon, lat), ring after ring
+        ring_offsets    (ring_count + 1) int64     ring r = coords[ring_offsets[r]:ring_offsets[r + 1]]
+        ring_feature    ring_count int32           feature owning ring r
+        ring_closed     ring_count uint8           1 = polygon ring, 0 = linestring
+        props_offsets   (feature_count + 1) int64  feature f = props[props_offsets[f]:props_offsets[f + 1]]
+        props           props_size bytes           UTF-8 JSON object per feature, concatenated
+        meta            meta_size bytes            UTF-8 JSON {"name": ..., "crs": ...}
+
+Rings of one feature are contiguous and in feature order. Only LineString,
+Polygon and MultiPolygon geometries produce rings; other features keep their
+properties with no ring.
+"""
+
+import json
+import os
+import struct
+import sys
+from array import array
+
+GEOBIN_MAGIC = b"VGEO"
+GEOBIN_VERSION = 1
+GEOBIN_HEADER = struct.Struct("<4sI5Q")
+GEOBIN_SUFFIX = ".geobin"
+
+def __print_debug(msg, debug=False):
+    if debug:
+        print(f"[GEOBIN] {msg}")
+
+def __pad(f, size):
+    """Write zero bytes up to the next 8-byte boundary after `size` bytes."""
+    if size % 8:
+        f.write(b"\0" * (8 - size % 8))
+
+def __write_array(f, arr):
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()  # file is little-endian
+    arr.tofile(f)
+    __pad(f, len(arr) * arr.itemsize)
+
+def export_geobin(geojson: dict, output_path, debug: bool = False) -> int:
+    """
+    Write a parsed GeoJSON FeatureCollection as a .geobin file.
+
+    Args:
+        geojson (dict): Parsed FeatureCollection.
+        output_path (str | Path): Output .geobin path.
+        debug (bool): Enable verbose debug output.
+
+    Returns:
+        int: Number of vertices written.
+    """
+    features = geojson.get("features", [])
+
+    coords = array("d")
+    ring_offsets = array("q", [0])
+    ring_feature = array("i")
+    ring_closed = array("B")
+    props_offsets = array("q", [0])
+    props = bytearray()
+
+    def add_ring(ring, feature_idx, closed):
+        if not ring:
+            return
+        for point in ring:
+            coords.append(float(point[0]))
+            coords.append(float(point[1]))
+        ring_offsets.append(len(coords) // 2)
+        ring_feature.append(feature_idx)
+        ring_closed.append(1 if closed else 0)
+
+    for feature_idx, feature in enumerate(features):
+        geometry = feature.get("geometry") or {}
+        geom_type = geometry.get("type")
+        geom_coords = geometry.get("coordinates")
+
+        if geom_type == "LineString":
+            add_ring(geom_coords, feature_idx, False)
+        elif geom_type == "Polygon":
+            for ring in geom_coords:
+                add_ring(ring, feature_idx, True)
+        elif geom_type == "MultiPolygon":
+            for polygon in geom_coords:
+                for ring in polygon:
+                    add_ring(ring, feature_idx, True)
+
+        props += json.dumps(feature.get("properties") or {}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        props_offsets.append(len(props))
+
+    crs = None
+    crs_obj = geojson.get("crs")
+    if isinstance(crs_obj, dict) and isinstance(crs_obj.get("properties"), dict):
+        crs = crs_obj["properties"].get("name")
+    meta = json.dumps({"name": geojson.get("name"), "crs": crs}, ensure_ascii=False).encode("utf-8")
+
+    vertex_count = len(coords) // 2
+    tmp_path = str(output_path) + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(GEOBIN_HEADER.pack(
+            GEOBIN_MAGIC, GEOBIN_VERSION,
+            len(features), len(ring_feature), vertex_count, len(meta), len(props),
+        ))
+        __write_array(f, coords)
+        __write_array(f, ring_offsets)
+        __write_array(f, ring_feature)
+        __write_array(f, ring_closed)
+        __write_array(f, props_offsets)
+        f.write(props)
+        __pad(f, len(props))
+        f.write(meta)
+
+    os.replace(tmp_path, output_path)
+    __print_debug(f"Saved {len(features)} features / {vertex_count} vertices to {output_path}", debug)
+    return vertex_count
+
+# --- Main CLI ---
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not (2 <= len(args) <= 3):
+        print("Usage: export_geobin.py <LAYER.geojson> <LAYER.geobin> [--debug]")
+        sys.exit(1)
+
+    with open(args[0], "r", encoding="utf-8") as f:
+        parsed = json.load(f)
+
+    total = export_geobin(parsed, args[1], debug=len(args) == 3 and args[2] == "--debug")
+    print(f"Total vertices written: {total} → {args[1]}")
@@ -9,6 +9,11 @@ from datetime import datetime
 from pathlib import Path
 from osgeo import ogr
 
+try:
+    from .export_geobin import export_geobin, GEOBIN_SUFFIX
+except ImportError:  # executed as a script
+    from export_geobin import export_geobin, GEOBIN_SUFFIX
+
 ogr.UseExceptions()  # Avoid GDAL 4.0 warning
 
 def __print_debug(msg, debug=False):
@@ -42,7 +47,10 @@ def __export_layer_to_geojson(s57_path, layer_name, output_path, debug=False):
         parsed = json.load(f)
 
     with open(final_path, "w") as f:
-        json.dump(parsed, f, indent=2)
+        json.dump(parsed, f, separators=(",", ":"))
+
+    # Binary geometry + properties read by the map at runtime (GeoJSON kept for tools)
+    export_geobin(parsed, output_path.with_suffix(GEOBIN_SUFFIX), debug=debug)
 
     raw_path.unlink()  # delete .raw.json
     __print_debug(f"Saved final GeoJSON to {final_path}", debug)
@@ -9,6 +9,8 @@ importing from the `map` package directly.
 
 Included utilities:
 - `download_bbox_tiles`: Download raster tiles for a given bounding box
+- `mbtiles_pack_tile_dir`: Pack a downloaded tile directory into a single MBTiles file
+- `tile_pack_write`: Pack a downloaded tile directory into a memory-mappable tile pack
 - `export_geojson`: Export features as GeoJSON (imported for side effects or internal use)
 """
 
@@ -16,8 +18,16 @@ Included utilities:
 from .raster_tile_download import (
     download_bbox_tiles,  # Download raster tiles within a bounding box
 )
+from .mbtiles_pack import (
+    mbtiles_pack_tile_dir,  # Pack <zoom>/<x>/<y>.png tiles into an MBTiles archive
+)
+from .tile_pack import (
+    tile_pack_write,        # Pack <zoom>/<x>/<y>.png tiles into a .tpk data file + .tpx index
+)
 
 # Define the public API of the map package
 __all__ = [
     "download_bbox_tiles",
+    "mbtiles_pack_tile_dir",
+    "tile_pack_write",
 ]
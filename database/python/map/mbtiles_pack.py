@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+import math
+import os
+import sqlite3
+import argparse
+
+try:
+    from .tile_dir import tile_dir_iter
+except ImportError:  # executed as a script
+    from tile_dir import tile_dir_iter
+
+def __print_debug(msg: str, debug: bool):
+    if debug:
+        print(msg)
+
+def __num2deg(x, y, zoom):
+    n = 2.0 ** zoom
+    lon_deg = x / n * 360.0 - 180.0
+    lat_deg = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    return lat_deg, lon_deg
+
+def mbtiles_pack_tile_dir(tile_dir: str, mbtiles_path: str, name: str = None, debug: bool = False) -> int:
+    """
+    Pack a <zoom>/<x>/<y>.png tile directory into a single MBTiles (SQLite) file.
+
+    Tiles are stored with the TMS row scheme required by the MBTiles spec.
+    An existing output file is replaced.
+
+    Returns:
+        int: Number of tiles packed
+    """
+    if not os.path.isdir(tile_dir):
+        raise FileNotFoundError(f"Tile directory not found: {tile_dir}")
+
+    if os.path.exists(mbtiles_path):
+        os.remove(mbtiles_path)
+    if os.path.dirname(mbtiles_path):
+        os.makedirs(os.path.dirname(mbtiles_path), exist_ok=True)
+
+    conn = sqlite3.connect(mbtiles_path)
+    try:
+        conn.execute("CREATE TABLE metadata (name TEXT, value TEXT)")
+        conn.execute("CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB)")
+
+        count = 0
+        min_zoom, max_zoom = None, None
+        bounds = None  # [min_lon, min_lat, max_lon, max_lat] from the lowest zoom
+        for zoom, x, y, path in tile_dir_iter(tile_dir):
+            with open(path, "rb") as f:
+                data = f.read()
+            tms_y = (1 << zoom) - 1 - y
+            conn.execute("INSERT INTO tiles VALUES (?, ?, ?, ?)", (zoom, x, tms_y, sqlite3.Binary(data)))
+            count += 1
+
+            if min_zoom is None or zoom < min_zoom:
+                min_zoom, bounds = zoom, None
+            if max_zoom is None or zoom > max_zoom:
+                max_zoom = zoom
+            if zoom == min_zoom:
+                north, west = __num2deg(x, y, zoom)
+                south, east = __num2deg(x + 1, y + 1, zoom)
+                if bounds is None:
+                    bounds = [west, south, east, north]
+                else:
+                    bounds = [min(bounds[0], west), min(bounds[1], south),
+                              max(bounds[2], east), max(bounds[3], north)]
+            __print_debug(f"[+] Packed: {zoom}/{x}/{y}", debug)
+
+        conn.execute("CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row)")
+
+        metadata = {
+            "name": name or os.path.basename(os.path.normpath(tile_dir)),
+            "format": "png",
+            "type": "baselayer",
+            "version": "1.0",
+        }
+        if min_zoom is not None:
+            metadata["minzoom"] = str(min_zoom)
+            metadata["maxzoom"] = str(max_zoom)
+            metadata["bounds"] = ",".join(f"{v:.6f}" for v in bounds)
+        conn.executemany("INSERT INTO metadata VALUES (?, ?)", metadata.items())
+        conn.commit()
+    finally:
+        conn.close()
+
+    return count
+
+# --- Main CLI ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack a <zoom>/<x>/<y>.png tile directory into an MBTiles file")
+    parser.add_argument("--input", type=str, required=True, help="Tile directory (tile_dir of an ENC extent)")
+    parser.add_argument("--output", type=str, required=True, help="Output .mbtiles file")
+    parser.add_argument("--name", type=str, default=None, help="Tileset name stored in metadata")
+    parser.add_argument("--debug", action="store_true", help="Enable debug output")
+
+    args = parser.parse_args()
+
+    total = mbtiles_pack_tile_dir(args.input, args.output, name=args.name, debug=args.debug)
+
+    print(f"\n✅ Total tiles packed: {total} → {args.output}")
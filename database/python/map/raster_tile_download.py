@@ -6,6 +6,11 @@ import urllib.request
 import argparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+try:
+    from .tile_pack import tile_pack_write
+except ImportError:  # executed as a script
+    from tile_pack import tile_pack_write
+
 def __print_debug(msg: str, debug: bool):
     if debug:
         print(msg)
@@ -56,10 +61,14 @@ def __read_user_agent(file_path = None):
     return "MyMapDownloader/1.0 (ntkhuong.coder@gmail.com)"
 
 def download_bbox_tiles(bounding_box: dict, zoom_range: dict, tile_dir: str,
-                        user_agent: str = None, max_workers: int = 10, debug: bool = False) -> int:
+                        user_agent: str = None, max_workers: int = 10, debug: bool = False,
+                        pack_path: str = None) -> int:
     """
     Download all map tiles for a bounding box and zoom range.
 
+    If pack_path is given, the tile directory is also written as a memory-mappable
+    tile pack (<pack_path> data file + .tpx index) once the download completes.
+
     Returns:
         int: Total number of tiles found or successfully downloaded
     """
@@ -81,6 +90,10 @@ def download_bbox_tiles(bounding_box: dict, zoom_range: dict, tile_dir: str,
                 if future.result():
                     total_handled += 1  # Count downloaded or already exists
 
+    if pack_path:
+        packed = tile_pack_write(tile_dir, pack_path, debug=debug)
+        print(f"[▣] Packed {packed} tiles into: {pack_path}")
+
     return total_handled
 
 # --- Main CLI ---
@@ -95,6 +108,7 @@ if __name__ == "__main__":
     parser.add_argument("--output", type=str, default="tiles")
     parser.add_argument("--workers", type=int, default=10)
     parser.add_argument("--ua-file", type=str, default="user_agent.inc", help="Path to user-agent file")
+    parser.add_argument("--pack", type=str, default=None, help="Also write a tile pack (.tpk + .tpx index) to this path")
     parser.add_argument("--debug", action="store_true", help="Enable debug output")
 
     args = parser.parse_args()
@@ -122,7 +136,8 @@ if __name__ == "__main__":
         tile_dir=args.output,
         user_agent=user_agent,
         max_workers=args.workers,
-        debug=args.debug
+        debug=args.debug,
+        pack_path=args.pack
     )
 
     print(f"\n✅ Total tiles downloaded: {total}")
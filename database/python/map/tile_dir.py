@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+
+"""
+Tile directory layout shared by the tile packers (tile_pack.py, mbtiles_pack.py)
+
+    <tile_dir>/<zoom>/<x>/<y>.png   as written by raster_tile_download.py
+"""
+
+import os
+
+def tile_dir_iter(tile_dir):
+    """Yield (zoom, x, y, path) for every <zoom>/<x>/<y>.png file in tile_dir."""
+    for zoom_name in os.listdir(tile_dir):
+        zoom_path = os.path.join(tile_dir, zoom_name)
+        if not zoom_name.isdigit() or not os.path.isdir(zoom_path):
+            continue
+        for x_name in os.listdir(zoom_path):
+            x_path = os.path.join(zoom_path, x_name)
+            if not x_name.isdigit() or not os.path.isdir(x_path):
+                continue
+            for file_name in os.listdir(x_path):
+                y_name, ext = os.path.splitext(file_name)
+                if ext.lower() == ".png" and y_name.isdigit():
+                    yield int(zoom_name), int(x_name), int(y_name), os.path.join(x_path, file_name)
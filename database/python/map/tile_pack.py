@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+"""
+Tile pack format (read by views/map/map_tile/tile_source.py::PackTileSource)
+
+    <name>.tpk  Data file: tile bytes (PNG) concatenated, no header.
+    <name>.tpx  Index file, little-endian:
+                    magic   b"VTPX"
+                    version uint32 (= 1)
+                    count   uint64
+                    keys    count x uint64, sorted ascending,
+                            key = (zoom << 56) | (x << 28) | y
+                    offsets count x uint64 (byte offset in the data file)
+                    lengths count x uint32 (byte length in the data file)
+
+Both files are memory-mapped by the reader; a lookup is a binary search
+over the key array, then a slice of the data mapping.
+"""
+
+import os
+import sys
+import struct
+import argparse
+from array import array
+
+try:
+    from .tile_dir import tile_dir_iter
+except ImportError:  # executed as a script
+    from tile_dir import tile_dir_iter
+
+TILE_PACK_MAGIC = b"VTPX"
+TILE_PACK_VERSION = 1
+TILE_PACK_HEADER = struct.Struct("<4sIQ")
+TILE_PACK_INDEX_SUFFIX = ".tpx"
+
+def __print_debug(msg: str, debug: bool):
+    if debug:
+        print(msg)
+
+def tile_pack_key(zoom: int, x: int, y: int) -> int:
+    return (zoom << 56) | (x << 28) | y
+
+def tile_pack_index_path(pack_path: str) -> str:
+    return os.path.splitext(pack_path)[0] + TILE_PACK_INDEX_SUFFIX
+
+def tile_pack_write(tile_dir: str, pack_path: str, debug: bool = False) -> int:
+    """
+    Pack a <zoom>/<x>/<y>.png tile directory into a tile pack (<name>.tpk + <name>.tpx).
+
+    Existing pack files are replaced atomically.
+
+    Returns:
+        int: Number of tiles packed
+    """
+    if not os.path.isdir(tile_dir):
+        raise FileNotFoundError(f"Tile directory not found: {tile_dir}")
+
+    index_path = tile_pack_index_path(pack_path)
+    if os.path.dirname(pack_path):
+        os.makedirs(os.path.dirname(pack_path), exist_ok=True)
+
+    # Sorted by key so that the data file is laid out in index order as well
+    tiles = sorted(tile_dir_iter(tile_dir), key=lambda t: tile_pack_key(t[0], t[1], t[2]))
+
+    keys = array("Q")
+    offsets = array("Q")
+    lengths = array("I")
+
+    tmp_pack_path = pack_path + ".tmp"
+    tmp_index_path = index_path + ".tmp"
+
+    offset = 0
+    with open(tmp_pack_path, "wb") as data_file:
+        for zoom, x, y, path in tiles:
+            with open(path, "rb") as f:
+                data = f.read()
+            data_file.write(data)
+            keys.append(tile_pack_key(zoom, x, y))
+            offsets.append(offset)
+            lengths.append(len(data))
+            offset += len(data)
+            __print_debug(f"[+] Packed: {zoom}/{x}/{y} ({len(data)} bytes)", debug)
+
+    if sys.byteorder == "big":
+        for arr in (keys, offsets, lengths):
+            arr.byteswap()  # index is little-endian
+
+    with open(tmp_index_path, "wb") as index_file:
+        index_file.write(TILE_PACK_HEADER.pack(TILE_PACK_MAGIC, TILE_PACK_VERSION, len(keys)))
+        keys.tofile(index_file)
+        offsets.tofile(index_file)
+        lengths.tofile(index_file)
+
+    os.replace(tmp_pack_path, pack_path)
+    os.replace(tmp_index_path, index_path)
+    __print_debug(f"[i] Tile pack: {pack_path} + {index_path}", debug)
+
+    return len(keys)
+
+# --- Main CLI ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack a <zoom>/<x>/<y>.png tile directory into a memory-mappable tile pack")
+    parser.add_argument("--input", type=str, required=True, help="Tile directory (tile_dir of an ENC extent)")
+    parser.add_argument("--output", type=str, required=True, help="Output .tpk file (index written next to it as .tpx)")
+    parser.add_argument("--debug", action="store_true", help="Enable debug output")
+
+    args = parser.parse_args()
+
+    total = tile_pack_write(args.input, args.output, debug=args.debug)
+
+    print(f"\n✅ Total tiles packed: {total} → {args.output}")
@@ -106,7 +106,7 @@ class EncMetadata:
         bounding_box_with_margin (BoundingBox): Bounding box with margin applied.
         center (Center): Center coordinate for map display.
         zoom_range (ZoomRange): Min/max zoom levels supported.
-        tile_dir (str): Directory path for pre-rendered tiles.
+        tile_dir (str): Directory path for pre-rendered tiles, or a packed tile archive (.mbtiles / .tpk).
         tile_count (int): Number of tiles generated.
         tile_dir_size_kb (float): Disk usage of the tile directory in KB.
         created_at (str): Creation timestamp (ISO8601 format).
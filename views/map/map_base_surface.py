@@ -0,0 +1,169 @@
+"""
+map_base_surface.py - Offscreen composited base map for MapVisualize.
+
+This module defines the `MapBaseSurface` class, a cached cairo ImageSurface
+holding the composed raster tiles and vector layers for one view
+(center, zoom, widget size). It lets `MapVisualize` turn panning into a blit:
+
+    - The surface is larger than the widget by `margin` pixels on each side.
+    - It is composed once at a given pan offset (`composed_offset`).
+    - While only the pan offset changes, `on_draw` paints the surface shifted
+      by (offset - composed_offset); no tile or vertex is touched.
+    - It is recomposed when the view key changes (release of a drag, zoom,
+      resize), when it is invalidated (layer changes), or when the pan offset
+      moves further than the margin.
+    - Parts of it can be marked damaged (e.g. tiles that arrived) and
+      redrawn alone, in one pass clipped to the damaged areas (`begin_repair`).
+
+Usage:
+    from views.map.map_base_surface import MapBaseSurface
+
+    base = MapBaseSurface(margin=256)
+    if base.needs_compose(view_key, offset_x, offset_y):
+        surface_ctx = base.begin_compose(view_key, width, height, offset_x, offset_y)
+        ...  # draw tiles + layers into surface_ctx using widget coordinates
+    elif base.damaged:
+        surface_ctx = base.begin_repair()
+        ...  # same drawing code, clipped to the damaged areas
+    base.blit(ctx, offset_x, offset_y)
+
+Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
+"""
+
+import cairo
+
+
+# ********************************************************************************************
+class MapBaseSurface:
+    """
+    Cached offscreen surface of the composed base map.
+
+    Attributes:
+        margin (int): Extra pixels composed around each side of the widget.
+        surface (cairo.ImageSurface|None): Composed base map.
+        view_key (tuple|None): View the surface was composed for.
+        composed_offset (tuple): Pan offset (x, y) at compose time.
+        dirty (bool): True when the content must be recomposed.
+        damaged (list): Areas (x, y, w, h), widget coordinates of the composition, to redraw.
+    """
+
+    def __init__(self, margin: int = 256):
+        """
+        Args:
+            margin (int): Extra pixels composed around each side of the widget.
+        """
+        self.margin = margin
+        self.surface = None
+        self.view_key = None
+        self.composed_offset = (0, 0)
+        self.dirty = True
+        self.damaged = []
+
+    def invalidate(self):
+        """Mark the surface content as stale (layer changes, ...)."""
+        self.dirty = True
+        self.damaged.clear()
+
+    def damage(self, x, y, w, h):
+        """
+        Mark an area of the composition as stale (widget coordinates at compose time).
+
+        Ignored when the whole surface is recomposed anyway.
+        """
+        if not self.dirty and self.surface is not None:
+            self.damaged.append((x, y, w, h))
+
+    def to_widget(self, area, offset_x, offset_y):
+        """Return where a composition area (x, y, w, h) is shown at the given pan offset."""
+        x, y, w, h = area
+        return (
+            x + round(offset_x - self.composed_offset[0]),
+            y + round(offset_y - self.composed_offset[1]),
+            w, h,
+        )
+
+    def needs_compose(self, view_key, offset_x, offset_y) -> bool:
+        """
+        Return True if the surface cannot be reused for this view and pan offset.
+
+        Args:
+            view_key (tuple): (center_lat, center_lon, zoom, width, height, ...).
+            offset_x (float): Current horizontal pan offset.
+            offset_y (float): Current vertical pan offset.
+        """
+        if self.dirty or self.surface is None or view_key != self.view_key:
+            return True
+        dx = offset_x - self.composed_offset[0]
+        dy = offset_y - self.composed_offset[1]
+        return abs(dx) > self.margin or abs(dy) > self.margin
+
+    def begin_compose(self, view_key, width, height, offset_x, offset_y):
+        """
+        Prepare the surface for a new composition and return a context for it.
+
+        The returned context is translated by the margin, so callers draw
+        in widget coordinates.
+
+        Returns:
+            cairo.Context: Context drawing into the (cleared) surface.
+        """
+        surf_w = width + 2 * self.margin
+        surf_h = height + 2 * self.margin
+        if (
+            self.surface is None or
+            self.surface.get_width() != surf_w or
+            self.surface.get_height() != surf_h
+        ):
+            self.surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, surf_w, surf_h)
+
+        surface_ctx = cairo.Context(self.surface)
+        surface_ctx.set_operator(cairo.OPERATOR_CLEAR)
+        surface_ctx.paint()
+        surface_ctx.set_operator(cairo.OPERATOR_OVER)
+        surface_ctx.translate(self.margin, self.margin)
+
+        self.view_key = view_key
+        self.composed_offset = (offset_x, offset_y)
+        self.dirty = False
+        self.damaged.clear()
+        return surface_ctx
+
+    def begin_repair(self):
+        """
+        Clear the damaged areas and return a context clipped to them (and forget them).
+
+        The context is translated by the margin like in `begin_compose`, so the
+        composition code can run unchanged; it should skip what lies outside
+        `ctx.clip_extents()`. All areas damaged since the last frame are
+        redrawn in this one pass.
+
+        Returns:
+            cairo.Context: Context drawing into the surface, clipped to the damaged areas.
+        """
+        surface_ctx = cairo.Context(self.surface)
+        surface_ctx.translate(self.margin, self.margin)
+        for area in self.damaged:
+            surface_ctx.rectangle(*area)
+        surface_ctx.clip()
+        self.damaged = []
+        surface_ctx.set_operator(cairo.OPERATOR_CLEAR)
+        surface_ctx.paint()
+        surface_ctx.set_operator(cairo.OPERATOR_OVER)
+        return surface_ctx
+
+    def blit(self, ctx, offset_x, offset_y):
+        """
+        Paint the composed surface onto `ctx`, shifted to the current pan offset.
+
+        Args:
+            ctx (cairo.Context): Widget drawing context.
+            offset_x (float): Current horizontal pan offset.
+            offset_y (float): Current vertical pan offset.
+        """
+        if self.surface is None:
+            return
+        dx = round(offset_x - self.composed_offset[0]) - self.margin
+        dy = round(offset_y - self.composed_offset[1]) - self.margin
+        ctx.set_source_surface(self.surface, dx, dy)
+        ctx.paint()
+# ********************************************************************************************
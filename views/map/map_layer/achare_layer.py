@@ -32,7 +32,8 @@ class ACHARELayer(GeoJSONLayer):
         fill_color=(1.0, 1.0, 0),
         fill_opacity=0.3,
         line_style=None,
-        layer_id="ACHARE"
+        layer_id="ACHARE",
+        layer_data=None
     ):
         """
         Initialize the ACHARE (Anchorage Area) layer.
@@ -45,6 +46,7 @@ class ACHARELayer(GeoJSONLayer):
             fill_opacity (float): Fill transparency (0.0 = transparent, 1.0 = opaque).
             line_style (list, optional): Cairo dash pattern (from LINE_STYLE_PATTERNS). Defaults to solid line if None.
             layer_id: Unique ENC identifier, default ACHARE
+            layer_data (LayerData, optional): File content already parsed (e.g. by LayerParsePool).
         """
         super().__init__(
             filepath=filepath,
@@ -54,7 +56,8 @@ class ACHARELayer(GeoJSONLayer):
             fill_color=fill_color,        # Polygon fill color
             fill_opacity=fill_opacity,    # Fill transparency
             line_style=line_style,        # Pass None → solid, or custom pattern
-            layer_id=layer_id             # Unique ENC identifier
+            layer_id=layer_id,            # Unique ENC identifier
+            layer_data=layer_data         # Already parsed file content (optional)
         )
 
     # =========================================================================
@@ -4,25 +4,43 @@ geojson_layer.py
 Base class for rendering GeoJSON layers on the map using Cairo + GTK.
 
 Responsibilities:
-    - Load and store features from a GeoJSON file.
+    - Load features from a GeoJSON file, or from its binary .geobin copy. Only the
+      geometry stays decoded in memory; feature properties are kept packed
+      (LayerPropertiesStore) and decoded when a feature is clicked.
+    - Keep the feature geometry as flat NumPy arrays (LayerGeometry).
+    - Index feature bounding boxes (LayerGridIndex) to cull features outside the view.
+    - Draw zoom-dependent simplified geometry (LayerLODPyramid).
+    - Provide one label anchor per feature to the label placement pass
+      (layer_labels.LayerLabelRenderer); labels are not drawn by render().
     - Render polygons, multipolygons, and linestrings with stroke/fill styles.
     - Support customizable line color, fill color, opacity, and dash patterns.
-    - Perform hit-testing on rendered geometries for user interaction.
+    - Perform hit-testing on rendered geometries for user interaction
+      (indexed candidates, point-to-segment distance and point-in-polygon).
 
 Dependencies:
     - Uses LINE_STYLE_PATTERNS from style_constants.py for predefined dash styles.
-    - Relies on map_obj.latlon_to_pixels() for coordinate projection.
+    - Relies on map_obj.view_transform_get() for coordinate projection: vertices
+      are stored in normalized Mercator units, a frame only scales + offsets them.
 
 Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
 """
 
-import json
-import math
+import cairo
+import numpy as np
 import gi
 gi.require_version("Gtk", "3.0")
 from gi.repository import Gdk
 
 from views.map.map_layer.style_constants import LINE_STYLE_PATTERNS
+from views.map.map_layer.layer_geometry import LayerGeometry
+from views.map.map_layer.layer_index import LayerGridIndex
+from views.map.map_layer.layer_lod import LayerLODPyramid
+from views.map.map_layer.layer_labels import layer_label_anchors
+from views.map.map_layer.layer_geobin import LayerGeobin, layer_geobin_path, layer_geobin_is_fresh
+from views.map.map_layer.layer_properties import LayerPropertiesStore
+from views.map.map_layer.layer_parse import layer_parse_geojson
+from views.map.map_layer.layer_cache import layer_file_version
+from views.map.map_projection import projection_lonlat_to_mercator
 
 class GeoJSONLayer:
     # =========================================================================
@@ -37,7 +55,8 @@ class GeoJSONLayer:
         fill_color=None,
         fill_opacity=0.3,
         line_style=None,
-        layer_id=None
+        layer_id=None,
+        layer_data=None
     ):
         """
         Initialize a GeoJSON layer for rendering on the map.
@@ -49,6 +68,7 @@ class GeoJSONLayer:
             fill_color (tuple): Fill color as RGB (0-1), default light blue.
             fill_opacity (float): Fill transparency (0.0 = transparent, 1.0 = opaque).
             line_style (list, optional): Cairo dash pattern (from LINE_STYLE_PATTERNS). Defaults to solid line if None.
+            layer_data (LayerData, optional): File content already parsed (e.g. by LayerParsePool).
         """
         # Metadata and styling
         self.layer_id = layer_id
@@ -65,32 +85,130 @@ class GeoJSONLayer:
         # Storage for name, crs, features loaded from the GeoJSON file
         self.name = None
         self.crs = None # crs = crs => properties => name
-        self.features = []
+        self.file_version = None      # (mtime_ns, size) of the file when it was loaded
+        self.properties_store = None  # LayerPropertiesStore, properties decoded on demand
+        self.geometry = None  # LayerGeometry of the features
+        self.index = None     # LayerGridIndex over the feature bboxes
+        self.lod = None       # LayerLODPyramid, levels built by lod_build() (or swapped in by lod_set())
+        self.label_anchors = None  # (F, 2) Mercator label anchor of each feature
+        self.label_sizes = None    # (F,) feature size (larger bbox side), Mercator units
 
         # Load geometry and properties from file
-        self.load_geojson(filepath)
+        self.load_geojson(filepath, layer_data)
 
     # =========================================================================
     # Data loading
     # =========================================================================
-    def load_geojson(self, filepath):
-        """Load features from the given GeoJSON file."""
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
+    def load_geojson(self, filepath, layer_data=None):
+        """
+        Load features from the given GeoJSON file.
+
+        If an up-to-date binary copy (.geobin, see layer_geobin.py) sits next to
+        the file, it is memory-mapped instead of parsing the JSON. `layer_data`
+        (already parsed content of the file) skips reading it.
+        """
+        # Taken before reading the file, so a file changed meanwhile gets a newer version next time
+        self.file_version = layer_file_version(filepath)
+        if layer_data is not None:
+            self._load_data(layer_data)
+        elif layer_geobin_is_fresh(filepath):
+            self._load_geobin(layer_geobin_path(filepath))
+        else:
+            self._load_json(filepath)
+
+        # Rendering and hit-testing work on the flat geometry arrays
+        self.index = LayerGridIndex(self.geometry.feature_bbox)
+        self.lod = LayerLODPyramid(self.geometry)
+        self.label_anchors, self.label_sizes = layer_label_anchors(self.geometry)
+
+    def _load_json(self, filepath):
+        self._load_data(layer_parse_geojson(filepath))
+
+    def _load_data(self, layer_data):
+        self.name = layer_data.name
+        self.crs = layer_data.crs
+        self.properties_store = LayerPropertiesStore(layer_data.props_offsets, layer_data.props)
+        self.geometry = LayerGeometry(
+            layer_data.merc,
+            layer_data.ring_offsets,
+            layer_data.ring_feature,
+            layer_data.ring_closed,
+            layer_data.feature_count,
+        )
+
+    def _load_geobin(self, geobin_path):
+        geobin = LayerGeobin(geobin_path)
+
+        self.name = geobin.name
+        self.crs = geobin.crs
+
+        # Properties stay in the mapped file until a feature is decoded
+        self.properties_store = LayerPropertiesStore(geobin.props_offsets, geobin.props)
+        self.geometry = LayerGeometry(
+            projection_lonlat_to_mercator(geobin.lonlat),
+            np.array(geobin.ring_offsets, dtype=np.int64),
+            np.array(geobin.ring_feature, dtype=np.int32),
+            np.array(geobin.ring_closed, dtype=bool),
+            geobin.feature_count,
+        )
+
+    def memory_bytes(self):
+        """Approximate memory held by the loaded data (geometry, LOD levels, index, packed properties)."""
+        store = self.properties_store
+        return (
+            self.geometry.nbytes + self.lod.nbytes + self.index.nbytes
+            + store.offsets.nbytes + len(store.blob)
+            + self.label_anchors.nbytes + self.label_sizes.nbytes
+        )
+
+    def has_features_in(self, bbox):
+        """Return True if any feature bbox intersects `bbox` (min_x, min_y, max_x, max_y), Mercator units."""
+        return len(self.index.query(*bbox)) > 0
+
+    def raster_style_key(self):
+        """Hash identifying the rendered look of this layer: data file (path and version) + style."""
+        return hash((
+            self.filepath,
+            self.file_version,
+            tuple(self.line_color),
+            self.line_width,
+            tuple(self.fill_color) if self.fill_color else None,
+            self.fill_opacity,
+            tuple(self.line_style),
+        ))
+
+    def lod_build(self, zoom_range):
+        """Build the simplified geometry levels for the map's zoom range (min_zoom, max_zoom)."""
+        self.lod.build(zoom_range)
+
+    def lod_rebuild(self, zoom_range):
+        """
+        Build the levels of a new zoom range into a new pyramid (worker thread).
 
-        # Store collection name if present
-        self.name = data.get("name", None)
+        self.lod is not touched, so the layer can keep drawing meanwhile; the
+        caller swaps the returned pyramid in on the main loop (see lod_set).
 
-        # Store features list
-        self.features = data.get("features", [])
+        Returns:
+            LayerLODPyramid: Pyramid built for `zoom_range`.
+        """
+        lod = LayerLODPyramid(self.geometry)
+        lod.build(zoom_range)
+        return lod
 
-        # Store CRS if present
-        crs_obj = data.get("crs", {})
-        self.crs = None
-        if isinstance(crs_obj, dict):
-            props = crs_obj.get("properties", {})
-            if isinstance(props, dict):
-                self.crs = props.get("name", None)
+    def lod_set(self, lod):
+        """Replace the LOD pyramid (main loop, result of lod_rebuild)."""
+        self.lod = lod
+
+    def lod_built_for(self, zoom_range):
+        """Return True if the LOD levels of `zoom_range` are already built."""
+        return self.lod.built_for(zoom_range)
+
+    def feature(self, feature_idx):
+        """
+        Return a GeoJSON-like feature dict for a feature index (properties decoded
+        on demand; geometry lives in self.geometry and is not included).
+        """
+        return {"type": "Feature", "id": feature_idx, "properties": self.properties_store.get(feature_idx)}
 
     def get_properties(self, feature):
         """Return the properties dictionary from a GeoJSON feature."""
@@ -108,60 +226,77 @@ class GeoJSONLayer:
         Render this GeoJSON layer using Cairo context `ctx`
         and a map projection object (`map_obj`).
         """
+        self.render_transform(ctx, map_obj.view_transform_get())
+
+    def render_transform(self, ctx, transform):
+        """
+        Render this layer with an explicit Mercator → pixel transform
+        (the map view, or a single map tile for the overlay raster cache).
+        """
         ctx.set_line_width(self.line_width)
 
-        for feature in self.features:
-            geometry = feature.get("geometry", {})
-            geom_type = geometry.get("type")
-            coords = geometry.get("coordinates")
-
-            if geom_type == "LineString":
-                ctx.set_source_rgb(*self.line_color)
-                self._draw_linestring(ctx, coords, map_obj)
-                self._apply_line_style(ctx)
-                self._draw_label(ctx, self.name)
-                ctx.stroke()
-
-            elif geom_type == "Polygon":
-                for ring in coords:
-                    if self.fill_color:
-                        self._draw_linestring(ctx, ring, map_obj)
-                        ctx.close_path()
-                        ctx.set_source_rgba(
-                            self.fill_color[0], self.fill_color[1], self.fill_color[2], self.fill_opacity
-                        )
-                        ctx.fill_preserve()
-                    ctx.set_source_rgb(*self.line_color)
-                    self._apply_line_style(ctx)
-                    self._draw_label(ctx, self.name)
-                    ctx.stroke()
-
-            elif geom_type == "MultiPolygon":
-                for polygon in coords:
-                    for ring in polygon:
-                        if self.fill_color:
-                            self._draw_linestring(ctx, ring, map_obj)
-                            ctx.close_path()
-                            ctx.set_source_rgba(
-                                self.fill_color[0], self.fill_color[1], self.fill_color[2], self.fill_opacity
-                            )
-                            ctx.fill_preserve()
-                        ctx.set_source_rgb(*self.line_color)
-                        self._apply_line_style(ctx)
-                        self._draw_label(ctx, self.name)
-                        ctx.stroke()
-
-    def _draw_linestring(self, ctx, coords, map_obj):
-        """Draw a LineString or polygon ring path (without stroking/filling)."""
-        for i, (lon, lat) in enumerate(coords):
-            x, y = map_obj.latlon_to_pixels(lat, lon)
-            if i == 0:
-                ctx.move_to(x, y)
-            else:
-                ctx.line_to(x, y)
-    
-    def _draw_label(self, ctx, label_str):
-        ctx.show_text(label_str)
+        geometry = self.lod.level_for_zoom(transform.zoom)
+
+        # Only features intersecting the drawn area (clip extents, widened by the stroke)
+        x0, y0, x1, y1 = ctx.clip_extents()
+        pad = self.line_width
+        visible = self.index.query(*transform.pixel_bbox_to_mercator(x0 - pad, y0 - pad, x1 + pad, y1 + pad))
+
+        rings = geometry.features_rings(visible)
+        if len(rings) == 0:
+            return
+
+        # Vertices are pre-projected: one multiply-add for all visible rings
+        merc, offsets = geometry.rings_vertices(rings)
+        points = transform.apply(merc).tolist()
+        offsets = offsets.tolist()
+        closed = geometry.ring_closed[rings]
+
+        # Polygon rings are filled feature by feature with the even-odd rule, as
+        # hit-testing does (LayerGeometry.feature_hit): holes stay empty whatever
+        # the winding of their rings, and overlapping features stay filled. Every
+        # ring of the layer is then stroked once, as one compound path
+        polygon_rings = np.nonzero(closed)[0]
+        fill_paths = []
+        if len(polygon_rings) and self.fill_color:
+            ctx.set_source_rgba(
+                self.fill_color[0], self.fill_color[1], self.fill_color[2], self.fill_opacity
+            )
+            fill_rule = ctx.get_fill_rule()
+            ctx.set_fill_rule(cairo.FILL_RULE_EVEN_ODD)
+            # Rings come grouped by feature: split where the owner changes
+            owners = geometry.ring_feature[rings[polygon_rings]]
+            bounds = np.flatnonzero(np.diff(owners)) + 1
+            for group in np.split(polygon_rings, bounds):
+                ctx.new_path()
+                for i in group.tolist():
+                    self._draw_linestring(ctx, points[offsets[i]:offsets[i + 1]])
+                    ctx.close_path()
+                fill_paths.append(ctx.copy_path())
+                ctx.fill()
+            ctx.set_fill_rule(fill_rule)
+
+        ctx.new_path()
+        if fill_paths:
+            for path in fill_paths:
+                ctx.append_path(path)
+        else:
+            for i in polygon_rings.tolist():
+                self._draw_linestring(ctx, points[offsets[i]:offsets[i + 1]])
+                ctx.close_path()
+
+        for i in np.nonzero(~closed)[0].tolist():
+            self._draw_linestring(ctx, points[offsets[i]:offsets[i + 1]])
+
+        ctx.set_source_rgb(*self.line_color)
+        self._apply_line_style(ctx)
+        ctx.stroke()
+
+    def _draw_linestring(self, ctx, points):
+        """Draw a LineString or polygon ring path from projected (x, y) points (without stroking/filling)."""
+        ctx.move_to(*points[0])
+        for x, y in points[1:]:
+            ctx.line_to(x, y)
 
     def _apply_line_style(self, ctx):
         """
@@ -176,57 +311,54 @@ class GeoJSONLayer:
         ctx.set_dash(self.line_style)
 
     # =========================================================================
-    # Hit-testing
+    # Labels
     # =========================================================================
-    def hit_test(self, px, py, map_obj, tolerance=5):
-        """
-        Return the first feature hit by the given pixel coords, or None.
-
-        For lines: checks if click is within `tolerance` pixels of any segment.
-        For polygons: checks against boundary rings.
-        """
-        for feature in self.features:
-            geometry = feature.get("geometry", {})
-            geom_type = geometry.get("type")
-            coords = geometry.get("coordinates")
-
-            if geom_type == "LineString":
-                if self._line_hit_test(coords, px, py, map_obj, tolerance):
-                    return feature
-            elif geom_type == "Polygon":
-                for ring in coords:
-                    if self._line_hit_test(ring, px, py, map_obj, tolerance):
-                        return feature
-            elif geom_type == "MultiPolygon":
-                for polygon in coords:
-                    for ring in polygon:
-                        if self._line_hit_test(ring, px, py, map_obj, tolerance):
-                            return feature
-        return None
+    def label_text(self, feature_idx):
+        """Return the label of a feature (the collection name; subclasses may use feature properties)."""
+        return self.name
 
-    def _line_hit_test(self, coords, px, py, map_obj, tolerance):
-        """Check if point (px, py) is near any line segment in coords."""
-        points = [map_obj.latlon_to_pixels(lat, lon) for lon, lat in coords]
-        for (x1, y1), (x2, y2) in zip(points, points[1:]):
-            if self._point_to_segment_dist(px, py, x1, y1, x2, y2) <= tolerance:
-                return True
-        return False
-
-    def _point_to_segment_dist(self, px, py, x1, y1, x2, y2):
+    def label_candidates(self, transform, clip):
         """
-        Compute the minimum distance from a point to a line segment.
+        Return the labels that may be drawn in a pixel area, largest features first.
+
+        Args:
+            transform (MapViewTransform): Mercator → pixel transform.
+            clip (tuple): (x0, y0, x1, y1) pixel area.
 
         Returns:
-            float: distance in pixels.
+            list: (feature_idx, anchor x, anchor y, feature size in pixels) tuples.
         """
-        dx = x2 - x1
-        dy = y2 - y1
-        if dx == dy == 0:  # degenerate segment (point)
-            return math.hypot(px - x1, py - y1)
+        x0, y0, x1, y1 = clip
+        features = self.index.query(*transform.pixel_bbox_to_mercator(x0, y0, x1, y1))
+        features = features[~np.isnan(self.label_anchors[features, 0])]
+        if len(features) == 0:
+            return []
+
+        anchors = transform.apply(self.label_anchors[features])
+        inside = (anchors[:, 0] >= x0) & (anchors[:, 0] <= x1) & (anchors[:, 1] >= y0) & (anchors[:, 1] <= y1)
+        features, anchors = features[inside], anchors[inside]
+        sizes = self.label_sizes[features] * transform.scale
+
+        order = np.argsort(-sizes, kind="stable")
+        return list(zip(features[order].tolist(), anchors[order, 0].tolist(), anchors[order, 1].tolist(), sizes[order].tolist()))
 
-        # Project point onto segment, clamped between [0, 1]
-        t = max(0, min(1, ((px - x1) * dx + (py - y1) * dy) / (dx * dx + dy * dy)))
-        proj_x = x1 + t * dx
-        proj_y = y1 + t * dy
+    # =========================================================================
+    # Hit-testing
+    # =========================================================================
+    def hit_test(self, px, py, map_obj, tolerance=5):
+        """
+        Return the topmost feature hit by the given pixel coords, or None.
 
-        return math.hypot(px - proj_x, py - proj_y)
+        Candidates come from the spatial index, then are refined in Mercator units:
+            - Lines and rings: within `tolerance` pixels of a segment.
+            - Polygons: also anywhere inside the area (holes excluded).
+        """
+        transform = map_obj.view_transform_get()
+        mx, my = transform.to_mercator(px, py)
+        tol = tolerance / transform.scale
+
+        candidates = self.index.query(mx - tol, my - tol, mx + tol, my + tol)
+        for feature_idx in candidates[::-1].tolist():
+            if self.geometry.feature_hit(feature_idx, mx, my, tol):
+                return self.feature(feature_idx)
+        return None
@@ -0,0 +1,82 @@
+"""
+layer_cache.py
+
+Memory-bounded cache of loaded vector layers, kept across visibility toggles
+and extent switches.
+
+Responsibilities:
+    - Keep loaded layers (geometry, spatial index, LOD levels, packed
+      properties) keyed by (layer name, file path, mtime, size), so re-checking
+      a layer in MapLayerCheckboxTable or returning to a recent extent reuses
+      it instead of reading the file again.
+    - Evict least recently used layers against a byte budget
+      (GeoJSONLayer.memory_bytes, see TileCache).
+
+A file modified on disk gets a new key: its old entry is never returned and
+ages out of the LRU. The same file version (layer_file_version) is part of the
+overlay raster tile keys of a layer (GeoJSONLayer.raster_style_key). A layer removed from the map stays cached; a cached layer
+that is evicted stays valid for as long as the map still draws it.
+
+Usage:
+    cache = LayerCache(max_bytes)
+    key = cache.key("ACHARE", "ENC/ACHARE.geojson")
+    layer = cache.get(key)
+    if layer is None:
+        layer = ACHARELayer("ENC/ACHARE.geojson")
+        cache.put(key, layer)
+
+Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
+"""
+
+import os
+
+from views.map.map_tile.tile_cache import TileCache
+
+
+def layer_file_version(filepath):
+    """Return (mtime_ns, size) of a layer file, or None if it cannot be read."""
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class LayerCache:
+    # =========================================================================
+    # Initialization
+    # =========================================================================
+    def __init__(self, max_bytes):
+        """
+        Args:
+            max_bytes (int): Memory budget of the cached layers, in bytes.
+        """
+        self.layers = TileCache(max_bytes)
+
+    # =========================================================================
+    # Access
+    # =========================================================================
+    @staticmethod
+    def key(layer_name, filepath):
+        """Return the cache key of a layer file, or None if the file cannot be read."""
+        version = layer_file_version(filepath)
+        if version is None:
+            return None
+        return (layer_name, os.path.abspath(filepath)) + version
+
+    def get(self, key):
+        """Return the cached layer for `key` (most recently used), or None."""
+        return self.layers.get(key) if key is not None else None
+
+    def put(self, key, layer):
+        """Cache a loaded layer (thread-safe, may be called from loader threads)."""
+        if key is not None:
+            self.layers.put(key, layer, size=layer.memory_bytes())
+
+    def clear(self):
+        """Drop every cached layer."""
+        self.layers.clear()
+
+    def stats(self):
+        """Return the cache statistics (see TileCache.stats)."""
+        return self.layers.stats()
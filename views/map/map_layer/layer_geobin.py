@@ -0,0 +1,94 @@
+"""
+layer_geobin.py
+
+Reader of the binary layer geometry format (.geobin) written next to each
+GeoJSON layer by database/python/S57/export_geobin.py.
+
+Responsibilities:
+    - Memory-map a .geobin file and expose its sections as NumPy arrays
+      (no JSON parsing, no per-vertex Python objects).
+    - Expose the packed feature properties (offsets + blob) without decoding
+      them (see layer_properties.LayerPropertiesStore).
+
+See export_geobin.py for the file layout.
+
+Usage:
+    from views.map.map_layer.layer_geobin import layer_geobin_path, LayerGeobin
+
+    geobin = LayerGeobin(layer_geobin_path("ENC/ACHARE.geojson"))
+    geobin.lonlat, geobin.ring_offsets, geobin.ring_feature, geobin.ring_closed
+    store = LayerPropertiesStore(geobin.props_offsets, geobin.props)
+
+Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
+"""
+
+import json
+import os
+import struct
+import numpy as np
+
+GEOBIN_MAGIC = b"VGEO"
+GEOBIN_VERSION = 1
+GEOBIN_HEADER = struct.Struct("<4sI5Q")
+GEOBIN_SUFFIX = ".geobin"
+
+
+def layer_geobin_path(geojson_path):
+    """Return the .geobin path written next to a GeoJSON layer file."""
+    return os.path.splitext(geojson_path)[0] + GEOBIN_SUFFIX
+
+
+def layer_geobin_is_fresh(geojson_path):
+    """Return True if a .geobin exists for the layer and is not older than its GeoJSON."""
+    geobin_path = layer_geobin_path(geojson_path)
+    if not os.path.exists(geobin_path):
+        return False
+    if not os.path.exists(geojson_path):
+        return True
+    return os.path.getmtime(geobin_path) >= os.path.getmtime(geojson_path)
+
+
+def _aligned(size):
+    return (size + 7) & ~7
+
+
+class LayerGeobin:
+    # =========================================================================
+    # Initialization
+    # =========================================================================
+    def __init__(self, path):
+        """
+        Map a .geobin file.
+
+        Raises:
+            ValueError: If the file is not a supported .geobin file.
+        """
+        self.path = path
+        data = np.memmap(path, dtype=np.uint8, mode="r")
+        if len(data) < GEOBIN_HEADER.size:
+            raise ValueError(f"Truncated geobin file: {path}")
+
+        magic, version, feature_count, ring_count, vertex_count, meta_size, props_size = \
+            GEOBIN_HEADER.unpack(data[:GEOBIN_HEADER.size].tobytes())
+        if magic != GEOBIN_MAGIC or version != GEOBIN_VERSION:
+            raise ValueError(f"Unsupported geobin file: {path}")
+
+        self.feature_count = feature_count
+        offset = GEOBIN_HEADER.size
+
+        def section(dtype, count):
+            nonlocal offset
+            arr = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+            offset += _aligned(arr.nbytes)
+            return arr
+
+        self.lonlat = section("<f8", vertex_count * 2).reshape(-1, 2)
+        self.ring_offsets = section("<i8", ring_count + 1)
+        self.ring_feature = section("<i4", ring_count)
+        self.ring_closed = section("u1", ring_count).view(bool)
+        self.props_offsets = section("<i8", feature_count + 1)
+        self.props = section("u1", props_size)
+
+        meta = json.loads(data[offset:offset + meta_size].tobytes().decode("utf-8") or "{}")
+        self.name = meta.get("name")
+        self.crs = meta.get("crs")
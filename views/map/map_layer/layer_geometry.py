@@ -0,0 +1,222 @@
+"""
+layer_geometry.py
+
+Flat, array-based storage of the geometry of a GeoJSON layer.
+
+Responsibilities:
+    - Flatten LineString / Polygon / MultiPolygon features into one vertex array,
+      projected once into normalized Web-Mercator units ([0, 1], see map_projection).
+    - Keep ring boundaries, owning feature and ring kind in offset arrays.
+    - Keep ring and feature bounding boxes (used by the spatial index).
+    - Exact hit-testing of a feature: point-to-segment distance and point-in-polygon.
+    - Let the renderer project every vertex of a layer in one vectorized call
+      (a multiply-add) and then walk rings as array slices.
+
+Layout (F features, R rings, N vertices):
+    merc                  float64 (N, 2)  normalized Mercator (x, y) of every vertex, ring after ring
+    ring_offsets          int64   (R + 1) ring r spans merc[ring_offsets[r]:ring_offsets[r + 1]]
+    ring_feature          int32   (R)     index of the feature owning ring r
+    ring_closed           bool    (R)     True for polygon rings, False for linestrings
+    feature_ring_offsets  int64   (F + 1) feature f owns rings [feature_ring_offsets[f], feature_ring_offsets[f + 1])
+    ring_bbox             float64 (R, 4)  (min_x, min_y, max_x, max_y) of each ring
+    feature_bbox          float64 (F, 4)  bbox of each feature (NaN for features without rings)
+
+Rings of one feature are contiguous and appear in feature order.
+
+Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
+"""
+
+import numpy as np
+
+from views.map.map_projection import projection_lonlat_to_mercator
+
+
+
+def layer_geometry_flatten(features):
+    """
+    Flatten the rings of GeoJSON features, without projecting them.
+
+    Unsupported geometry types (e.g. Point) contribute no ring.
+
+    Returns:
+        tuple: (lonlat (N, 2) float64, ring_offsets int64, ring_feature int32, ring_closed bool)
+    """
+    parts = []
+    ring_sizes = []
+    ring_feature = []
+    ring_closed = []
+
+    def add_ring(ring, feature_idx, closed):
+        if not ring:
+            return
+        parts.append(np.asarray(ring, dtype=np.float64)[:, :2])
+        ring_sizes.append(len(ring))
+        ring_feature.append(feature_idx)
+        ring_closed.append(closed)
+
+    for feature_idx, feature in enumerate(features):
+        geometry = feature.get("geometry") or {}
+        geom_type = geometry.get("type")
+        coords = geometry.get("coordinates")
+
+        if geom_type == "LineString":
+            add_ring(coords, feature_idx, False)
+        elif geom_type == "Polygon":
+            for ring in coords:
+                add_ring(ring, feature_idx, True)
+        elif geom_type == "MultiPolygon":
+            for polygon in coords:
+                for ring in polygon:
+                    add_ring(ring, feature_idx, True)
+
+    ring_offsets = np.zeros(len(ring_sizes) + 1, dtype=np.int64)
+    np.cumsum(ring_sizes, out=ring_offsets[1:])
+
+    lonlat = np.concatenate(parts) if parts else np.empty((0, 2), dtype=np.float64)
+    return lonlat, ring_offsets, np.asarray(ring_feature, dtype=np.int32), np.asarray(ring_closed, dtype=bool)
+
+
+class LayerGeometry:
+    # =========================================================================
+    # Initialization
+    # =========================================================================
+    def __init__(self, merc, ring_offsets, ring_feature, ring_closed, feature_count):
+        """
+        Wrap already-flattened geometry arrays (see module docstring for the layout)
+        and derive the per-feature ring ranges and bounding boxes.
+        """
+        self.merc = merc
+        self.ring_offsets = ring_offsets
+        self.ring_feature = ring_feature
+        self.ring_closed = ring_closed
+        self.feature_count = feature_count
+
+        # Rings are grouped by feature: feature f owns rings [offsets[f], offsets[f + 1])
+        self.feature_ring_offsets = np.zeros(feature_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(ring_feature, minlength=feature_count), out=self.feature_ring_offsets[1:])
+
+        self.ring_bbox = np.empty((len(ring_feature), 4), dtype=np.float64)
+        if len(ring_feature):
+            starts = ring_offsets[:-1]
+            self.ring_bbox[:, :2] = np.minimum.reduceat(merc, starts, axis=0)
+            self.ring_bbox[:, 2:] = np.maximum.reduceat(merc, starts, axis=0)
+
+        self.feature_bbox = np.full((feature_count, 4), np.nan, dtype=np.float64)
+        has_rings = np.diff(self.feature_ring_offsets) > 0
+        if has_rings.any():
+            starts = self.feature_ring_offsets[:-1][has_rings]
+            self.feature_bbox[has_rings, :2] = np.minimum.reduceat(self.ring_bbox[:, :2], starts, axis=0)
+            self.feature_bbox[has_rings, 2:] = np.maximum.reduceat(self.ring_bbox[:, 2:], starts, axis=0)
+
+    @classmethod
+    def from_features(cls, features):
+        """
+        Build the flat geometry of a list of GeoJSON features.
+
+        Unsupported geometry types (e.g. Point) contribute no ring.
+        """
+        lonlat, ring_offsets, ring_feature, ring_closed = layer_geometry_flatten(features)
+        return cls(projection_lonlat_to_mercator(lonlat), ring_offsets, ring_feature, ring_closed, len(features))
+
+    # =========================================================================
+    # Access
+    # =========================================================================
+    @property
+    def ring_count(self):
+        return len(self.ring_feature)
+
+    @property
+    def vertex_count(self):
+        return len(self.merc)
+
+    @property
+    def nbytes(self):
+        """Memory held by the geometry arrays, in bytes."""
+        return sum(arr.nbytes for arr in (
+            self.merc, self.ring_offsets, self.ring_feature, self.ring_closed,
+            self.feature_ring_offsets, self.ring_bbox, self.feature_bbox,
+        ))
+
+    def ring_range(self, ring_idx):
+        """Return (start, end) vertex indices of a ring."""
+        return int(self.ring_offsets[ring_idx]), int(self.ring_offsets[ring_idx + 1])
+
+    def feature_rings(self, feature_idx):
+        """Return the range of ring indices owned by a feature."""
+        return range(int(self.feature_ring_offsets[feature_idx]), int(self.feature_ring_offsets[feature_idx + 1]))
+
+    def features_rings(self, feature_ids):
+        """Return the ring indices owned by an array of features, in feature order."""
+        feature_ids = np.asarray(feature_ids, dtype=np.int64)
+        return _ranges_concat(self.feature_ring_offsets[feature_ids], self.feature_ring_offsets[feature_ids + 1])
+
+    def rings_vertices(self, rings):
+        """
+        Gather the vertices of several rings.
+
+        Returns:
+            tuple: ((M, 2) vertices, ring after ring; (len(rings) + 1) int64 offsets into them)
+        """
+        starts = self.ring_offsets[rings]
+        ends = self.ring_offsets[rings + 1]
+        offsets = np.zeros(len(starts) + 1, dtype=np.int64)
+        np.cumsum(ends - starts, out=offsets[1:])
+        return self.merc[_ranges_concat(starts, ends)], offsets
+
+    # =========================================================================
+    # Hit-testing
+    # =========================================================================
+    def feature_hit(self, feature_idx, x, y, tolerance):
+        """
+        Return True if point (x, y) hits a feature (Mercator units).
+
+        A feature is hit when the point lies within `tolerance` of any of its
+        rings, or inside its polygon area (even-odd rule over all polygon rings,
+        so holes and multipolygon parts are handled).
+        """
+        inside = False
+        for ring_idx in self.feature_rings(feature_idx):
+            start, end = self.ring_range(ring_idx)
+            points = self.merc[start:end]
+            closed = self.ring_closed[ring_idx]
+            if closed and end - start > 1 and not np.array_equal(points[0], points[-1]):
+                points = np.vstack((points, points[:1]))
+
+            a = points[:-1]
+            b = points[1:]
+            if len(a) == 0:
+                a = b = points
+
+            if _point_segments_min_distance(x, y, a, b) <= tolerance:
+                return True
+            if closed and _point_segments_crossings(x, y, a, b) % 2:
+                inside = not inside
+        return inside
+
+
+def _ranges_concat(starts, ends):
+    """Concatenate the integer ranges [starts[i], ends[i]) into one index array."""
+    counts = ends - starts
+    return np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(int(counts.sum()))
+
+
+def _point_segments_min_distance(x, y, a, b):
+    """Minimum distance from (x, y) to the segments a[i] → b[i] (vectorized)."""
+    d = b - a
+    length_sq = (d * d).sum(axis=1)
+    # Project the point onto each segment, clamped to [0, 1] (degenerate segments → t = 0)
+    t = ((x - a[:, 0]) * d[:, 0] + (y - a[:, 1]) * d[:, 1]) / np.where(length_sq > 0, length_sq, 1.0)
+    t = np.clip(t, 0.0, 1.0)
+    dx = a[:, 0] + t * d[:, 0] - x
+    dy = a[:, 1] + t * d[:, 1] - y
+    return float(np.sqrt((dx * dx + dy * dy).min()))
+
+
+def _point_segments_crossings(x, y, a, b):
+    """Number of segments a[i] → b[i] crossed by the ray from (x, y) towards +x."""
+    ay = a[:, 1]
+    by = b[:, 1]
+    straddle = (ay > y) != (by > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cross_x = a[:, 0] + (y - ay) * (b[:, 0] - a[:, 0]) / (by - ay)
+    return int(np.count_nonzero(straddle & (x < cross_x)))
@@ -0,0 +1,166 @@
+"""
+layer_index.py
+
+Uniform-grid spatial index over the feature bounding boxes of a vector layer.
+
+Responsibilities:
+    - Bucket features into a grid laid over the layer extent (normalized
+      Web-Mercator units, same space as LayerGeometry.merc).
+    - Answer "which features may intersect this bbox?" by reading the
+      buckets of the covered cells only, so render / hit-test cost follows
+      the number of features in view rather than the layer size.
+
+Structure:
+    The grid has about `target_per_cell` features per cell. Cell buckets are
+    stored CSR-style: feature ids sorted by row-major cell id
+    (`cell_features`), with `cell_offsets` giving each cell's slice, so one
+    grid row of a query is a single contiguous slice.
+    Features spanning more than `max_span` cells are kept aside in
+    `large_features` and bbox-tested on every query instead of being copied
+    into each cell.
+
+Query results are returned sorted by feature index, i.e. in drawing order.
+
+LayerSetIndex builds one such grid over the features of several layers, so
+that MapVisualize answers a click with a single query for all layers.
+
+Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
+"""
+
+import math
+import numpy as np
+
+
+class LayerGridIndex:
+    # =========================================================================
+    # Initialization
+    # =========================================================================
+    def __init__(self, bboxes, target_per_cell=8, max_span=64):
+        """
+        Build the grid.
+
+        Args:
+            bboxes (np.ndarray): (F, 4) feature bboxes (min_x, min_y, max_x, max_y).
+                Rows containing NaN (features without geometry) are never returned.
+            target_per_cell (int): Average number of features per cell to aim for.
+            max_span (int): Features covering more cells than this are not bucketed.
+        """
+        self.bboxes = bboxes
+        valid = ~np.isnan(bboxes).any(axis=1)
+        ids = np.nonzero(valid)[0]
+
+        if len(ids) == 0:
+            self.size = 0
+            self.large_features = ids
+            return
+
+        boxes = bboxes[ids]
+        self.min_x = float(boxes[:, 0].min())
+        self.min_y = float(boxes[:, 1].min())
+        extent = max(float(boxes[:, 2].max()) - self.min_x, float(boxes[:, 3].max()) - self.min_y)
+
+        self.size = max(1, min(1024, math.ceil(math.sqrt(len(ids) / target_per_cell))))
+        self.cell = max(extent / self.size, 1e-12)
+
+        cx0, cy0 = self._cells(boxes[:, 0], boxes[:, 1])
+        cx1, cy1 = self._cells(boxes[:, 2], boxes[:, 3])
+        span_w = cx1 - cx0 + 1
+        counts = span_w * (cy1 - cy0 + 1)
+
+        large = counts > max_span
+        self.large_features = ids[large]
+
+        small = ~large
+        ids, cx0, cy0, span_w, counts = ids[small], cx0[small], cy0[small], span_w[small], counts[small]
+
+        # One entry per (feature, covered cell), then grouped by cell id
+        feature_rep = np.repeat(ids, counts)
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        k = np.arange(len(feature_rep)) - starts
+        span_rep = np.repeat(span_w, counts)
+        cell_x = np.repeat(cx0, counts) + k % span_rep
+        cell_y = np.repeat(cy0, counts) + k // span_rep
+        cell_ids = cell_y * self.size + cell_x
+
+        order = np.argsort(cell_ids, kind="stable")
+        self.cell_features = feature_rep[order].astype(np.int32)
+        self.cell_offsets = np.zeros(self.size * self.size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cell_ids, minlength=self.size * self.size), out=self.cell_offsets[1:])
+
+    @property
+    def nbytes(self):
+        """Memory held by the grid arrays, in bytes (the bboxes belong to the layer geometry)."""
+        arrays = (self.large_features, getattr(self, "cell_features", None), getattr(self, "cell_offsets", None))
+        return sum(arr.nbytes for arr in arrays if arr is not None)
+
+    def _cells(self, x, y):
+        """Return grid cell coordinates (clamped to the grid) of Mercator positions."""
+        last = self.size - 1
+        cx = np.clip(np.floor((np.asarray(x) - self.min_x) / self.cell), 0, last).astype(np.int64)
+        cy = np.clip(np.floor((np.asarray(y) - self.min_y) / self.cell), 0, last).astype(np.int64)
+        return cx, cy
+
+    # =========================================================================
+    # Query
+    # =========================================================================
+    def query(self, min_x, min_y, max_x, max_y):
+        """
+        Return the ids of the features whose bbox intersects the given bbox.
+
+        Returns:
+            np.ndarray: Sorted int array of feature indices.
+        """
+        if self.size == 0:
+            return self.large_features
+
+        cx0, cy0 = self._cells(min_x, min_y)
+        cx1, cy1 = self._cells(max_x, max_y)
+        cx0, cy0, cx1, cy1 = int(cx0), int(cy0), int(cx1), int(cy1)
+
+        chunks = [self.large_features]
+        offsets = self.cell_offsets
+        for cy in range(cy0, cy1 + 1):
+            row = cy * self.size
+            chunks.append(self.cell_features[offsets[row + cx0]:offsets[row + cx1 + 1]])
+        candidates = np.unique(np.concatenate(chunks))
+
+        # Cells are coarse (and clamped at the grid border): exact bbox test
+        boxes = self.bboxes[candidates]
+        hit = (
+            (boxes[:, 0] <= max_x) & (boxes[:, 2] >= min_x) &
+            (boxes[:, 1] <= max_y) & (boxes[:, 3] >= min_y)
+        )
+        return candidates[hit]
+
+
+class LayerSetIndex:
+    # =========================================================================
+    # Initialization
+    # =========================================================================
+    def __init__(self, layers):
+        """
+        Build one grid over the features of several layers (e.g. every layer
+        shown by MapVisualize), so a click queries a single index.
+
+        Args:
+            layers (list): Layers exposing `geometry` (LayerGeometry); others are ignored.
+        """
+        self.layers = [layer for layer in layers if getattr(layer, "geometry", None) is not None]
+
+        bboxes = [layer.geometry.feature_bbox for layer in self.layers]
+        counts = [len(b) for b in bboxes]
+        self.layer_of = np.repeat(np.arange(len(self.layers), dtype=np.int32), counts)
+        self.feature_of = np.concatenate([np.arange(n, dtype=np.int32) for n in counts]) if counts else np.empty(0, dtype=np.int32)
+
+        self.grid = LayerGridIndex(np.concatenate(bboxes) if bboxes else np.empty((0, 4), dtype=np.float64))
+
+    # =========================================================================
+    # Query
+    # =========================================================================
+    def query(self, min_x, min_y, max_x, max_y):
+        """
+        Yield (layer, feature_idx) whose bbox intersects the given bbox,
+        topmost first (last layer, last feature: the one drawn on top).
+        """
+        for idx in self.grid.query(min_x, min_y, max_x, max_y)[::-1].tolist():
+            yield self.layers[self.layer_of[idx]], int(self.feature_of[idx])
@@ -0,0 +1,219 @@
+"""
+layer_labels.py
+
+Label placement for vector layers.
+
+Responsibilities:
+    - Compute one label anchor per feature, once per layer: the centroid of
+      the feature's largest polygon ring, or the midpoint (along its length)
+      of its longest line string (layer_label_anchors).
+    - Cache the text extents of label strings, so fonts are only measured
+      when a new string shows up (LabelTextExtents).
+    - Place labels greedily, largest features first, skipping labels that
+      overlap an already placed one (screen-space grid, LabelCollisionGrid)
+      or that are wider than their feature at the current zoom.
+
+Labels are drawn over all layers in one pass after the layers themselves
+(LayerLabelRenderer.draw), so they never collide across layers and are not
+baked into the overlay raster tiles.
+
+Usage:
+    renderer = LayerLabelRenderer()
+    renderer.draw(ctx, map_visualize.layers, map_visualize.view_transform_get())
+
+Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
+"""
+
+from collections import OrderedDict
+
+import cairo
+import numpy as np
+
+# Label font
+LABEL_FONT_FACE = "Sans"
+LABEL_FONT_SIZE = 11
+# Free space kept around each label, in pixels
+LABEL_PADDING_PX = 2
+# Cell size of the collision grid, in pixels
+LABEL_GRID_CELL_PX = 64
+# Number of label strings whose extents are kept
+LABEL_TEXT_CACHE_SIZE = 1024
+
+
+def layer_label_anchors(geometry):
+    """
+    Compute the label anchor of every feature of a LayerGeometry.
+
+    Returns:
+        tuple: ((F, 2) anchors in Mercator units, NaN for features without
+        rings; (F,) feature sizes, the larger side of the feature bbox)
+    """
+    feature_count = geometry.feature_count
+    anchors = np.full((feature_count, 2), np.nan, dtype=np.float64)
+    sizes = np.nan_to_num(np.max(geometry.feature_bbox[:, 2:] - geometry.feature_bbox[:, :2], axis=1))
+    if geometry.ring_count == 0:
+        return anchors, sizes
+
+    merc = geometry.merc
+    starts = geometry.ring_offsets[:-1]
+    counts = np.diff(geometry.ring_offsets)
+
+    # Segment k joins vertices k and k + 1; the segment after the last vertex of a ring is zeroed
+    inner = np.ones(len(merc), dtype=bool)
+    inner[geometry.ring_offsets[1:] - 1] = False
+    ring_of = np.repeat(np.arange(geometry.ring_count), counts)
+    # Vertices relative to their ring's bbox corner (keeps the cross products accurate)
+    rel = merc - geometry.ring_bbox[ring_of, :2]
+    a = rel
+    b = np.vstack((rel[1:], rel[-1:]))
+
+    # Polygon rings: signed area and centroid (shoelace)
+    cross = np.where(inner, a[:, 0] * b[:, 1] - b[:, 0] * a[:, 1], 0.0)
+    area2 = np.add.reduceat(cross, starts)
+    cx = np.add.reduceat((a[:, 0] + b[:, 0]) * cross, starts)
+    cy = np.add.reduceat((a[:, 1] + b[:, 1]) * cross, starts)
+    degenerate = np.abs(area2) <= 1e-30
+    safe = np.where(degenerate, 1.0, 3.0 * area2)
+    centroid = np.column_stack((cx / safe, cy / safe)) + geometry.ring_bbox[:, :2]
+    # Rings without area: center of their bbox
+    bbox_center = (geometry.ring_bbox[:, :2] + geometry.ring_bbox[:, 2:]) / 2
+    centroid[degenerate] = bbox_center[degenerate]
+
+    # Line strings: point at half of the length
+    seg_len = np.where(inner, np.hypot(*(b - a).T), 0.0)
+    cum = np.concatenate(([0.0], np.cumsum(seg_len)))  # cum[k] = length up to vertex k
+    ends = geometry.ring_offsets[1:] - 1
+    ring_len = cum[ends] - cum[starts]
+    target = cum[starts] + ring_len / 2
+    seg = np.clip(np.searchsorted(cum, target, side="right") - 1, starts, np.maximum(starts, ends - 1))
+    t = (target - cum[seg]) / np.where(seg_len[seg] > 0, seg_len[seg], 1.0)
+    p0 = merc[seg]
+    p1 = merc[np.minimum(seg + 1, ends)]
+    midpoint = p0 + np.clip(t, 0.0, 1.0)[:, None] * (p1 - p0)
+
+    closed = geometry.ring_closed
+    ring_anchor = np.where(closed[:, None], centroid, midpoint)
+    ring_size = np.where(closed, np.abs(area2), ring_len)
+
+    # Largest polygon ring of each feature (polygons win over lines), else its longest line
+    order = np.lexsort((ring_size, closed, geometry.ring_feature))
+    last = np.ones(len(order), dtype=bool)
+    last[:-1] = geometry.ring_feature[order[:-1]] != geometry.ring_feature[order[1:]]
+    best = order[last]
+    anchors[geometry.ring_feature[best]] = ring_anchor[best]
+    return anchors, sizes
+
+
+class LabelTextExtents:
+    """LRU of (width, height, x_bearing, y_bearing) of label strings, in the label font."""
+
+    def __init__(self, max_entries=LABEL_TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, ctx, text):
+        """Return the extents of `text` (ctx must have the label font selected)."""
+        extents = self._entries.get(text)
+        if extents is not None:
+            self._entries.move_to_end(text)
+            return extents
+
+        x_bearing, y_bearing, width, height, _, _ = ctx.text_extents(text)
+        extents = (width, height, x_bearing, y_bearing)
+        self._entries[text] = extents
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return extents
+
+
+class LabelCollisionGrid:
+    """Screen-space grid of placed label rectangles."""
+
+    def __init__(self, x0, y0, x1, y1, cell=LABEL_GRID_CELL_PX):
+        self.x0 = x0
+        self.y0 = y0
+        self.cell = cell
+        self.cols = max(1, int((x1 - x0) // cell) + 1)
+        self.rows = max(1, int((y1 - y0) // cell) + 1)
+        self._cells = {}  # (col, row) -> [rect, ...]
+
+    def _span(self, x0, y0, x1, y1):
+        c0 = max(0, int((x0 - self.x0) // self.cell))
+        r0 = max(0, int((y0 - self.y0) // self.cell))
+        c1 = min(self.cols - 1, int((x1 - self.x0) // self.cell))
+        r1 = min(self.rows - 1, int((y1 - self.y0) // self.cell))
+        return c0, r0, c1, r1
+
+    def place(self, x0, y0, x1, y1):
+        """Reserve a rectangle; return False (nothing reserved) if it overlaps a placed one."""
+        c0, r0, c1, r1 = self._span(x0, y0, x1, y1)
+        for col in range(c0, c1 + 1):
+            for row in range(r0, r1 + 1):
+                for px0, py0, px1, py1 in self._cells.get((col, row), ()):
+                    if x0 < px1 and px0 < x1 and y0 < py1 and py0 < y1:
+                        return False
+
+        rect = (x0, y0, x1, y1)
+        for col in range(c0, c1 + 1):
+            for row in range(r0, r1 + 1):
+                self._cells.setdefault((col, row), []).append(rect)
+        return True
+
+
+class LayerLabelRenderer:
+    # =========================================================================
+    # Initialization
+    # =========================================================================
+    def __init__(self):
+        self.extents = LabelTextExtents()
+
+    # =========================================================================
+    # Rendering
+    # =========================================================================
+    def draw(self, ctx, layers, transform, area=None):
+        """
+        Draw the labels of `layers` placed in a pixel area.
+
+        Topmost layers are placed first; within a layer, larger features first.
+        A label is skipped when it is wider than its feature at this zoom or
+        when it overlaps a label already placed.
+
+        Args:
+            area (tuple, optional): (x0, y0, x1, y1) placement area; defaults to
+                the clip extents of `ctx`. Placing over a larger area than the
+                clip keeps labels identical when only part of a view is redrawn.
+        """
+        x0, y0, x1, y1 = area if area is not None else ctx.clip_extents()
+        grid = LabelCollisionGrid(x0, y0, x1, y1)
+        pad = LABEL_PADDING_PX
+
+        ctx.save()
+        ctx.select_font_face(LABEL_FONT_FACE, cairo.FONT_SLANT_NORMAL, cairo.FONT_WEIGHT_NORMAL)
+        ctx.set_font_size(LABEL_FONT_SIZE)
+
+        for layer in reversed(layers):
+            if not hasattr(layer, "label_candidates"):
+                continue
+            placed = False
+            for feature_idx, x, y, size_px in layer.label_candidates(transform, (x0, y0, x1, y1)):
+                text = layer.label_text(feature_idx)
+                if not text:
+                    continue
+                width, height, x_bearing, y_bearing = self.extents.get(ctx, text)
+                if width > size_px:
+                    continue  # feature too small at this zoom
+
+                # Text centered on the anchor
+                left = x - width / 2
+                top = y - height / 2
+                if not grid.place(left - pad, top - pad, left + width + pad, top + height + pad):
+                    continue
+
+                if not placed:
+                    ctx.set_source_rgb(*layer.line_color)
+                    placed = True
+                ctx.move_to(left - x_bearing, top - y_bearing)
+                ctx.show_text(text)
+
+        ctx.new_path()
+        ctx.restore()
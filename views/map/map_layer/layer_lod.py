@@ -0,0 +1,189 @@
+"""
+layer_lod.py
+
+Zoom-dependent level-of-detail (LOD) pyramid for vector layer geometry.
+
+Responsibilities:
+    - Simplify a LayerGeometry with Douglas-Peucker at the tolerance of a
+      zoom level (LOD_TOLERANCE_PX pixels at that zoom, in Mercator units).
+    - Keep one simplified level per zoom of the map's ZoomRange. Levels are
+      built from the next finer level (cascade), so each pass works on an
+      already reduced vertex set.
+    - Return the level matching the current zoom to the renderer. At and above
+      the finest zoom of the range the original geometry is used.
+
+A simplified level keeps every ring (with at least its two end points), so
+ring / feature indices and the spatial index of the layer stay valid. A level
+that drops no vertex is the same object as the next finer one, so consecutive
+zooms with identical results share one geometry.
+Hit-testing keeps using the original geometry.
+
+Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
+"""
+
+import numpy as np
+
+from views.map.map_layer.layer_geometry import LayerGeometry
+
+# Maximum deviation of a simplified line, in pixels at the level's zoom
+LOD_TOLERANCE_PX = 0.5
+# Tile size in pixels (same as MapVisualize.TILE_SIZE)
+LOD_TILE_SIZE = 256
+
+
+def lod_tolerance(zoom):
+    """Return the simplification tolerance of a zoom level, in normalized Mercator units."""
+    return LOD_TOLERANCE_PX / ((1 << zoom) * LOD_TILE_SIZE)
+
+
+def lod_simplify_mask(merc, ring_offsets, tolerance):
+    """
+    Douglas-Peucker simplification of every ring at once.
+
+    All pending (start, end) intervals of all rings are refined together: one
+    pass measures, for every interval, the farthest interior vertex from its
+    chord and splits the intervals where it exceeds `tolerance`. The number of
+    passes is the recursion depth, not the number of splits.
+
+    Args:
+        merc (np.ndarray): (N, 2) vertices, ring after ring.
+        ring_offsets (np.ndarray): (R + 1) ring boundaries.
+        tolerance (float): Maximum allowed deviation.
+
+    Returns:
+        np.ndarray: Boolean mask of the vertices to keep (ring end points are always kept).
+    """
+    keep = np.zeros(len(merc), dtype=bool)
+    starts = ring_offsets[:-1]
+    ends = ring_offsets[1:] - 1
+    keep[starts] = True
+    keep[ends] = True
+
+    i, j = starts, ends
+    tol_sq = tolerance * tolerance
+    while True:
+        interior = j - i - 1
+        live = interior > 0
+        i, j, interior = i[live], j[live], interior[live]
+        if len(i) == 0:
+            break
+
+        # Interior vertex indices of every interval, and the interval each belongs to
+        first = np.cumsum(interior) - interior
+        owner = np.repeat(np.arange(len(i)), interior)
+        idx = np.arange(len(owner)) - first[owner] + i[owner] + 1
+
+        a = merc[i]
+        d = merc[j] - a
+        length_sq = (d * d).sum(axis=1)
+        rel = merc[idx] - a[owner]
+        # Distance to segment a → b (closed rings start and end on the same point)
+        t = (rel * d[owner]).sum(axis=1) / np.where(length_sq > 0, length_sq, 1.0)[owner]
+        rel -= np.clip(t, 0.0, 1.0)[:, None] * d[owner]
+        dist_sq = (rel * rel).sum(axis=1)
+
+        # Farthest interior vertex of each interval
+        max_sq = np.maximum.reduceat(dist_sq, first)
+        pos = np.where(dist_sq == max_sq[owner], np.arange(len(owner)), len(owner))
+        far = idx[np.minimum.reduceat(pos, first)]
+
+        split = max_sq > tol_sq
+        mid = far[split]
+        keep[mid] = True
+        i = np.concatenate((i[split], mid))
+        j = np.concatenate((mid, j[split]))
+    return keep
+
+
+def lod_simplify_geometry(geometry, tolerance):
+    """
+    Simplify every ring of a LayerGeometry.
+
+    Returns:
+        LayerGeometry: New geometry with the same rings / features and fewer
+        vertices, or `geometry` itself when no vertex is dropped.
+    """
+    if geometry.ring_count == 0:
+        return geometry
+    keep = lod_simplify_mask(geometry.merc, geometry.ring_offsets, tolerance)
+    if keep.all():
+        return geometry
+
+    ring_offsets = np.zeros(geometry.ring_count + 1, dtype=np.int64)
+    np.cumsum(np.add.reduceat(keep.astype(np.int64), geometry.ring_offsets[:-1]), out=ring_offsets[1:])
+
+    return LayerGeometry(
+        geometry.merc[keep],
+        ring_offsets,
+        geometry.ring_feature,
+        geometry.ring_closed,
+        geometry.feature_count,
+    )
+
+
+class LayerLODPyramid:
+    # =========================================================================
+    # Initialization
+    # =========================================================================
+    def __init__(self, geometry):
+        """
+        Create an empty pyramid over the original geometry of a layer.
+
+        Args:
+            geometry (LayerGeometry): Full-detail geometry.
+        """
+        self.geometry = geometry
+        self.max_zoom = None  # levels are used below this zoom
+        self.levels = {}      # zoom -> simplified LayerGeometry
+
+    def build(self, zoom_range):
+        """
+        Build the simplified levels of a zoom range, finest first.
+
+        Args:
+            zoom_range (tuple): (min_zoom, max_zoom) of the map.
+        """
+        min_zoom, max_zoom = zoom_range
+        if self.max_zoom != max_zoom:
+            self.levels = {}
+            self.max_zoom = max_zoom
+
+        source = self.geometry
+        for zoom in range(max_zoom - 1, min_zoom - 1, -1):
+            level = self.levels.get(zoom)
+            if level is None:
+                level = lod_simplify_geometry(source, lod_tolerance(zoom))
+                self.levels[zoom] = level
+            source = level
+
+    # =========================================================================
+    # Access
+    # =========================================================================
+    def built_for(self, zoom_range):
+        """Return True if every level of `zoom_range` (min_zoom, max_zoom) is built."""
+        min_zoom, max_zoom = zoom_range
+        return self.max_zoom == max_zoom and all(zoom in self.levels for zoom in range(min_zoom, max_zoom))
+
+    def level_for_zoom(self, zoom):
+        """
+        Return the geometry to draw at `zoom`.
+
+        Zooms below the built range use the coarsest level; zooms not built
+        (no range given yet) fall back to the original geometry.
+        """
+        if self.max_zoom is None or zoom >= self.max_zoom:
+            return self.geometry
+        level = self.levels.get(zoom)
+        if level is None and self.levels:
+            level = self.levels[min(self.levels)] if zoom < min(self.levels) else None
+        return level if level is not None else self.geometry
+
+    @property
+    def nbytes(self):
+        """Memory held by the simplified levels, in bytes (shared levels once, the original geometry not at all)."""
+        unique = {id(level): level for level in self.levels.values() if level is not self.geometry}
+        return sum(level.nbytes for level in unique.values())
+
+    def vertex_counts(self):
+        """Return {zoom: vertex count} of the built levels (diagnostics)."""
+        return {zoom: level.vertex_count for zoom, level in sorted(self.levels.items())}
@@ -0,0 +1,233 @@
+"""
+layer_parse.py
+
+Parsing of GeoJSON layer files into flat arrays, in this process or in a
+pool of worker processes.
+
+Responsibilities:
+    - Parse a <LAYER>.geojson into a LayerData: vertices already projected to
+      normalized Mercator, ring offsets / owners / kinds and the packed feature
+      properties (see layer_geometry.py and layer_properties.py for the layout).
+    - Parse several files in parallel across a ProcessPoolExecutor
+      (LayerParsePool), so the JSON decoding of the layers of an extent runs on
+      several cores instead of contending for the GIL of the GTK process.
+
+Worker processes are started with layer_parse_worker.py as their main module
+(never main.py and the GTK application) and are stopped as soon as no parse is
+pending, so no process stays resident between extent loads.
+
+A worker process packs the arrays of its LayerData into one shared memory
+block and only returns the block name and the array layout. The parent copies
+the arrays out and unlinks the block as soon as the job completes (also when
+nobody waits for the result), so no large object is pickled and no block
+outlives its job.
+
+Usage:
+    pool = LayerParsePool(processes=4)
+    future = pool.submit("ENC/ACHARE.geojson")
+    layer = ACHARELayer("ENC/ACHARE.geojson", layer_data=future.result())
+
+Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
+"""
+
+import contextlib
+import importlib
+import json
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from views.map.map_layer.layer_geometry import layer_geometry_flatten
+from views.map.map_layer.layer_properties import layer_properties_pack
+from views.map.map_projection import projection_lonlat_to_mercator
+
+# Arrays of a LayerData, in shared memory block order
+LAYER_DATA_ARRAYS = ("merc", "ring_offsets", "ring_feature", "ring_closed", "props_offsets", "props")
+# Default number of worker processes is one per CPU core, up to this
+LAYER_PARSE_MAX_DEFAULT_PROCESSES = 2
+# Main module of the worker processes
+LAYER_PARSE_WORKER_MAIN = "views.map.map_layer.layer_parse_worker"
+
+
+class LayerData:
+    """Parsed content of a layer file (see LAYER_DATA_ARRAYS), ready for GeoJSONLayer."""
+
+    def __init__(self, name, crs, feature_count, merc, ring_offsets, ring_feature, ring_closed, props_offsets, props):
+        self.name = name
+        self.crs = crs
+        self.feature_count = feature_count
+        self.merc = merc
+        self.ring_offsets = ring_offsets
+        self.ring_feature = ring_feature
+        self.ring_closed = ring_closed
+        self.props_offsets = props_offsets
+        self.props = props
+
+
+def layer_parse_geojson(filepath):
+    """
+    Parse a GeoJSON FeatureCollection file.
+
+    Returns:
+        LayerData: Projected geometry arrays and packed properties.
+    """
+    with open(filepath, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    # Flatten geometry and pack properties: the parsed feature dicts are dropped
+    features = data.get("features", [])
+    lonlat, ring_offsets, ring_feature, ring_closed = layer_geometry_flatten(features)
+    props_offsets, props = layer_properties_pack(features)
+
+    crs = None
+    crs_obj = data.get("crs", {})
+    if isinstance(crs_obj, dict):
+        crs_props = crs_obj.get("properties", {})
+        if isinstance(crs_props, dict):
+            crs = crs_props.get("name", None)
+
+    return LayerData(
+        data.get("name", None), crs, len(features),
+        projection_lonlat_to_mercator(lonlat), ring_offsets, ring_feature, ring_closed,
+        props_offsets, np.frombuffer(props, dtype=np.uint8),
+    )
+
+
+# =========================================================================
+# Shared memory transport
+# =========================================================================
+def _layer_parse_shared(filepath):
+    """Worker process: parse a file into a new shared memory block; return (block name, layout, meta)."""
+    data = layer_parse_geojson(filepath)
+
+    layout = []
+    size = 0
+    for field in LAYER_DATA_ARRAYS:
+        arr = getattr(data, field)
+        layout.append((field, arr.dtype.str, arr.shape, size))
+        size += (arr.nbytes + 7) & ~7
+
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        for field, dtype, shape, offset in layout:
+            np.ndarray(shape, dtype, buffer=shm.buf, offset=offset)[...] = getattr(data, field)
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    shm.close()
+
+    # The parent process unlinks the block: stop tracking it here
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm.name, layout, (data.name, data.crs, data.feature_count)
+
+
+def _layer_data_from_shared(result):
+    """Parent process: copy the arrays of a worker's block into a LayerData and unlink the block."""
+    shm_name, layout, (name, crs, feature_count) = result
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        arrays = {
+            field: np.ndarray(shape, dtype, buffer=shm.buf, offset=offset).copy()
+            for field, dtype, shape, offset in layout
+        }
+    finally:
+        shm.close()
+        shm.unlink()
+    return LayerData(name, crs, feature_count, **arrays)
+
+
+@contextlib.contextmanager
+def _layer_parse_worker_main():
+    """
+    Make layer_parse_worker the main module while worker processes are started.
+
+    A "spawn" child re-imports the main module of its parent; without this,
+    every worker would run main.py and import the whole GTK application.
+    """
+    main = sys.modules["__main__"]
+    sys.modules["__main__"] = importlib.import_module(LAYER_PARSE_WORKER_MAIN)
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main
+
+
+class LayerParsePool:
+    # =========================================================================
+    # Initialization
+    # =========================================================================
+    def __init__(self, processes=0, idle_shutdown=True):
+        """
+        Create the pool. Worker processes are started on the first submit.
+
+        Args:
+            processes (int): Number of worker processes (0 = one per CPU core,
+                at most LAYER_PARSE_MAX_DEFAULT_PROCESSES).
+            idle_shutdown (bool): Stop the worker processes as soon as no parse
+                is pending (they are started again by the next submit).
+        """
+        if processes <= 0:
+            processes = min(os.cpu_count() or 1, LAYER_PARSE_MAX_DEFAULT_PROCESSES)
+        self.processes = processes
+        self.idle_shutdown = idle_shutdown
+        self._executor = None
+        self._jobs = 0  # parses submitted and not completed
+        self._lock = threading.RLock()
+
+    def _executor_get(self):
+        """Return the executor, created if needed (caller holds the lock)."""
+        if self._executor is None:
+            # "spawn": never fork the threaded GTK process
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _shutdown_locked(self):
+        """Stop the executor (caller holds the lock)."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            # Cancelled parses run their done callback (and take the lock) from here
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """Stop the worker processes (pending parses are cancelled)."""
+        with self._lock:
+            self._shutdown_locked()
+
+    # =========================================================================
+    # Jobs
+    # =========================================================================
+    def submit(self, filepath):
+        """
+        Queue the parsing of a GeoJSON file in a worker process.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the LayerData of the file.
+        """
+        future = Future()
+
+        def done(parse_future):
+            # Runs in the executor's management thread: always collect the block
+            try:
+                future.set_result(_layer_data_from_shared(parse_future.result()))
+            except BaseException as e:
+                future.set_exception(e)
+            with self._lock:
+                self._jobs -= 1
+                if self._jobs == 0 and self.idle_shutdown:
+                    self._shutdown_locked()
+
+        with self._lock:
+            # Worker processes are started by submit (as needed, up to self.processes)
+            with _layer_parse_worker_main():
+                parse_future = self._executor_get().submit(_layer_parse_shared, filepath)
+            self._jobs += 1
+        parse_future.add_done_callback(done)
+        return future
@@ -0,0 +1,16 @@
+"""
+layer_parse_worker.py
+
+Entry module of the LayerParsePool worker processes.
+
+Worker processes are started with the "spawn" method, which re-imports the
+main module of the parent in every child. LayerParsePool starts them with
+this module as the main module instead of main.py, so a worker only imports
+numpy and the layer parsing modules (layer_parse.py and its imports), never
+GTK or the application.
+
+Usage:
+    Not imported directly; see LayerParsePool in layer_parse.py.
+
+Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
+"""
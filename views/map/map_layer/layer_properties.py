@@ -0,0 +1,85 @@
+"""
+layer_properties.py
+
+Offset-indexed, lazily decoded store of feature properties.
+
+Responsibilities:
+    - Hold the properties of every feature of a layer as one byte blob
+      (UTF-8 JSON per feature) plus an offset array, instead of one resident
+      Python dict per feature.
+    - Decode a feature's properties only when asked (e.g. on a click),
+      keeping a small LRU of decoded dicts.
+
+The blob can be a memory-mapped section of a .geobin file (nothing is read
+until a feature is decoded) or an in-memory buffer packed from parsed GeoJSON.
+
+Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
+"""
+
+import json
+from collections import OrderedDict
+
+import numpy as np
+
+# Number of decoded property dicts kept per layer
+LAYER_PROPERTIES_CACHE_SIZE = 32
+
+
+def layer_properties_pack(features):
+    """
+    Pack the properties of GeoJSON features as (offsets, blob).
+
+    Returns:
+        tuple: ((F + 1) int64 offsets, bytes of the concatenated UTF-8 JSON objects)
+    """
+    blob = bytearray()
+    offsets = np.zeros(len(features) + 1, dtype=np.int64)
+    for i, feature in enumerate(features):
+        blob += json.dumps(feature.get("properties") or {}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        offsets[i + 1] = len(blob)
+    return offsets, bytes(blob)
+
+
+class LayerPropertiesStore:
+    # =========================================================================
+    # Initialization
+    # =========================================================================
+    def __init__(self, offsets, blob, cache_size=LAYER_PROPERTIES_CACHE_SIZE):
+        """
+        Args:
+            offsets (np.ndarray): (F + 1) int64 offsets; feature f = blob[offsets[f]:offsets[f + 1]].
+            blob (np.ndarray | bytes): UTF-8 JSON objects, concatenated.
+            cache_size (int): Number of decoded dicts kept (LRU).
+        """
+        self.offsets = offsets
+        self.blob = blob
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    @classmethod
+    def from_features(cls, features, cache_size=LAYER_PROPERTIES_CACHE_SIZE):
+        """Pack the properties of parsed GeoJSON features (the dicts can then be dropped)."""
+        offsets, blob = layer_properties_pack(features)
+        return cls(offsets, blob, cache_size)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    # =========================================================================
+    # Access
+    # =========================================================================
+    def get(self, feature_idx):
+        """Return the properties dict of a feature (decoded on first access)."""
+        props = self._cache.get(feature_idx)
+        if props is not None:
+            self._cache.move_to_end(feature_idx)
+            return props
+
+        start = int(self.offsets[feature_idx])
+        end = int(self.offsets[feature_idx + 1])
+        props = json.loads(bytes(self.blob[start:end]).decode("utf-8"))
+
+        self._cache[feature_idx] = props
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return props
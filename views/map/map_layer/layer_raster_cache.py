@@ -0,0 +1,151 @@
+"""
+layer_raster_cache.py
+
+Pre-rendered raster tiles of vector layers (optional overlay cache).
+
+Responsibilities:
+    - Rasterize a GeoJSONLayer into transparent TILE_SIZE x TILE_SIZE ARGB32
+      surfaces aligned with the map tiles, in background worker threads.
+    - Keep them in an LRU TileCache keyed by (layer_id, zoom, x, y, style hash),
+      so composing the base map pastes overlay tiles instead of re-stroking paths.
+    - Answer tiles without any feature immediately (spatial index query),
+      without rendering anything.
+
+The style hash (GeoJSONLayer.raster_style_key) also covers the data file and
+its version (mtime, size), so a layer re-created with the same id / style /
+file (e.g. toggled off and on in MapLayerCheckboxTable) finds its tiles still
+cached, while a regenerated file never gets the tiles of its old content.
+
+Workers only draw into image surfaces (no GTK). `on_ready(key)` is called in
+the worker thread after a tile is cached; the owner is responsible for moving
+to the GTK main loop (GLib.idle_add).
+
+Usage:
+    cache = LayerRasterCache(max_bytes, workers=2, on_ready=lambda key: ...)
+    surface, key = cache.lookup(layer, zoom, x, y)
+    if surface is None:
+        cache.request(layer, key, priority)       # rendered in background
+    elif surface is not LAYER_TILE_EMPTY:
+        ctx.set_source_surface(surface, draw_x, draw_y)
+
+Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
+"""
+
+import threading
+import cairo
+
+from views.map.map_projection import MapViewTransform
+from views.map.map_tile.tile_cache import TileCache
+from views.map.map_tile.tile_loader import TileLoaderPool
+
+from utils.log import utils_log_get_logger
+LOG_ERR = utils_log_get_logger("layer_raster_cache")["err"]
+
+# Tile size in pixels (same as MapVisualize.TILE_SIZE)
+LAYER_TILE_SIZE = 256
+
+
+class _LayerTileEmpty:
+    """Cached marker for a tile in which a layer has no feature (costs 0 bytes)."""
+
+    def __repr__(self):
+        return "LAYER_TILE_EMPTY"
+
+
+LAYER_TILE_EMPTY = _LayerTileEmpty()
+
+
+def layer_tile_transform(zoom, x, y):
+    """Return the Mercator → pixel transform of map tile (zoom, x, y), origin at its top-left corner."""
+    return MapViewTransform(zoom, (1 << zoom) * LAYER_TILE_SIZE, -x * LAYER_TILE_SIZE, -y * LAYER_TILE_SIZE)
+
+
+def layer_tile_render(layer, zoom, x, y):
+    """
+    Rasterize one map tile of a layer.
+
+    Returns:
+        cairo.ImageSurface: Transparent ARGB32 surface with the layer drawn in it.
+    """
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, LAYER_TILE_SIZE, LAYER_TILE_SIZE)
+    ctx = cairo.Context(surface)
+    layer.render_transform(ctx, layer_tile_transform(zoom, x, y))
+    surface.flush()
+    return surface
+
+
+class LayerRasterCache:
+    # =========================================================================
+    # Initialization
+    # =========================================================================
+    def __init__(self, max_bytes, workers=2, on_ready=None):
+        """
+        Create the cache and its render workers.
+
+        Args:
+            max_bytes (int): Memory budget of the overlay tiles, in bytes.
+            workers (int): Number of render threads.
+            on_ready (Callable, optional): `on_ready(key)` called (worker thread) once a tile is cached.
+        """
+        self.tiles = TileCache(max_bytes)
+        self.on_ready = on_ready
+        self.pool = TileLoaderPool(workers, self._render_job, name="layer-raster")
+
+        self._lock = threading.Lock()  # protects self._rendering
+        self._rendering = set()        # keys queued or being rendered
+
+    # =========================================================================
+    # Lookup / scheduling
+    # =========================================================================
+    def lookup(self, layer, zoom, x, y):
+        """
+        Return (surface, key) for a tile of `layer`.
+
+        surface is a cairo.ImageSurface, LAYER_TILE_EMPTY when the layer has no
+        feature in the tile, or None when the tile still has to be rendered.
+        """
+        key = (layer.layer_id, zoom, x, y, layer.raster_style_key())
+        surface = self.tiles.get(key)
+        if surface is None and not layer.has_features_in(layer_tile_transform(zoom, x, y).pixel_bbox_to_mercator(
+            -layer.line_width, -layer.line_width, LAYER_TILE_SIZE + layer.line_width, LAYER_TILE_SIZE + layer.line_width
+        )):
+            surface = LAYER_TILE_EMPTY
+            self.tiles.put(key, surface, size=0)
+        return surface, key
+
+    def request(self, layer, key, priority=0.0):
+        """Queue the rendering of a tile (re-prioritized if already queued)."""
+        with self._lock:
+            if key in self._rendering and not self.pool.is_pending(key):
+                return  # already being rendered by a worker
+            self._rendering.add(key)
+        self.pool.submit(key, layer, priority)
+
+    def cancel_except(self, keep_keys):
+        """Drop queued renders whose key is not in `keep_keys`."""
+        cancelled = self.pool.cancel_except(keep_keys)
+        if cancelled:
+            with self._lock:
+                self._rendering.difference_update(cancelled)
+
+    def clear(self):
+        """Drop every cached and queued tile."""
+        self.cancel_except(set())
+        self.tiles.clear()
+
+    # =========================================================================
+    # Worker
+    # =========================================================================
+    def _render_job(self, key, layer):
+        _, zoom, x, y, _ = key
+        try:
+            self.tiles.put(key, layer_tile_render(layer, zoom, x, y))
+        except Exception as e:
+            LOG_ERR(f"[layer_raster_cache] Failed to render {key}: {e}")
+            return
+        finally:
+            with self._lock:
+                self._rendering.discard(key)
+
+        if self.on_ready is not None:
+            self.on_ready(key)
@@ -8,6 +8,7 @@ checkboxes for Electronic Navigational Chart (ENC) layers. It allows users to:
     - Update checkbox states from metadata (enabled/disabled, active/inactive).
     - Track newly discovered ENC layers and persist them to `.new_layers.txt`.
     - Query currently active (visible) layers.
+    - Show which layers are still loading in the background.
 
 Usage:
     from views.map.map_layer_visibility import MapLayerCheckboxTable
@@ -163,3 +164,17 @@ class MapLayerCheckboxTable(Gtk.Box):
             list[str]: Names of active ENC layers.
         """
         return [layer for layer, cb in self.checkboxes.items() if cb.get_active()]
+
+    def layer_loading_set(self, layer, loading):
+        """
+        Show or clear the "loading" state of a layer checkbox.
+
+        Args:
+            layer (str): ENC layer identifier.
+            loading (bool): True while the layer is being loaded in the background.
+        """
+        checkbox = self.checkboxes.get(layer)
+        if checkbox is None:
+            return
+        checkbox.set_label(f"{layer} …" if loading else layer)
+        checkbox.set_tooltip_text("Loading…" if loading else None)
@@ -41,6 +41,8 @@ class MapMarkerShip:
         name (str): Ship name displayed above the marker.
         last_draw_bounds (tuple): Pixel bounds (x, y, w, h) of last draw 
                                   for hit detection.
+        last_paint_bounds (tuple): Pixel bounds (x, y, w, h) of everything painted
+                                   by the last draw (rotated icon + label), for redraws.
     """
 
     def __init__(self, image_path, size=24, name="My Ship"):
@@ -59,6 +61,8 @@ class MapMarkerShip:
         self.visible = True
         self.name = name
         self.last_draw_bounds = None  # (x, y, w, h) in pixels
+        self.last_paint_bounds = None  # (x, y, w, h) in pixels, icon rotation and label included
+        self.label_extents = None     # cairo text extents of the name, measured on first draw
 
     def set_location(self, lat, lon):
         """Set the latitude and longitude of the ship."""
@@ -110,12 +114,46 @@ class MapMarkerShip:
             ctx.set_font_size(12)
             ctx.set_source_rgb(0, 0, 0)  # black color
             text_extents = ctx.text_extents(self.name)
+            self.label_extents = tuple(text_extents)
             text_x = cx - text_extents.width / 2
             text_y = cy - self.pixbuf.get_height() / 2 - 5  # 5px above the pixbuf
             ctx.move_to(text_x, text_y)
             ctx.show_text(self.name)
             ctx.restore()
 
+        self.last_paint_bounds = self.paint_bounds(cx, cy)
+
+    def paint_bounds(self, cx, cy):
+        """
+        Return the pixel bounds (x, y, w, h) painted by a draw centered on (cx, cy).
+
+        Covers the icon at any rotation and the label above it (its size is
+        estimated until the label has been measured by a first draw).
+
+        Args:
+            cx (float): X position of the marker center in pixels.
+            cy (float): Y position of the marker center in pixels.
+        """
+        if self.pixbuf is None:
+            return None
+        w = self.pixbuf.get_width()
+        h = self.pixbuf.get_height()
+        radius = math.hypot(w, h) / 2
+        x0, y0, x1, y1 = cx - radius, cy - radius, cx + radius, cy + radius
+
+        if self.name:
+            if self.label_extents is not None:
+                x_bearing, y_bearing, text_w, text_h = self.label_extents[:4]
+            else:
+                x_bearing, y_bearing, text_w, text_h = 0, -12, 8 * len(self.name), 16
+            text_x = cx - text_w / 2 + x_bearing
+            text_y = cy - h / 2 - 5 + y_bearing
+            x0, y0 = min(x0, text_x), min(y0, text_y)
+            x1, y1 = max(x1, text_x + text_w), max(y1, text_y + text_h)
+
+        # One extra pixel for antialiasing
+        return (x0 - 1, y0 - 1, x1 - x0 + 2, y1 - y0 + 2)
+
     def hit_test(self, click_x, click_y):
         """
         Check if a click is inside the marker bounds.
@@ -0,0 +1,122 @@
+"""
+map_projection.py - Vectorized Web-Mercator (slippy map) projection helpers.
+
+`MapVisualize.deg2num` projects one coordinate at a time with the math module.
+The helpers here do the same projection on whole NumPy arrays.
+
+Vector layers project their vertices once, at load time, into normalized
+Mercator units: x, y in [0, 1], (0, 0) = north-west corner of the world. At any
+zoom a normalized point maps to widget pixels with a single multiply-add:
+
+    px = mx * scale + origin_x        scale = 2**zoom * TILE_SIZE
+    py = my * scale + origin_y
+
+`MapViewTransform` holds (scale, origin) for the current view, so no
+transcendental math is left in the render path.
+
+Coordinates follow the GeoJSON order: arrays of shape (N, 2) holding (lon, lat).
+
+Usage:
+    from views.map.map_projection import projection_lonlat_to_mercator, MapViewTransform
+
+    merc = projection_lonlat_to_mercator(lonlat)          # once, at load time
+    pixels = map_obj.view_transform_get().apply(merc)     # every frame
+
+Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
+"""
+
+import math
+import numpy as np
+
+# Latitude limit of the Web-Mercator square (same clamp as MapVisualize.deg2num)
+PROJECTION_LAT_LIMIT = 85.0511
+
+
+# ********************************************************************************************
+def projection_lonlat_to_mercator(lonlat) -> np.ndarray:
+    """
+    Project (lon, lat) degrees into normalized Web-Mercator units.
+
+    Args:
+        lonlat (array-like): Array of shape (N, 2) with (lon, lat) in degrees.
+
+    Returns:
+        np.ndarray: float64 array of shape (N, 2) with (x, y) in [0, 1].
+    """
+    lonlat = np.asarray(lonlat, dtype=np.float64).reshape(-1, 2)
+
+    lat_rad = np.radians(np.clip(lonlat[:, 1], -PROJECTION_LAT_LIMIT, PROJECTION_LAT_LIMIT))
+
+    out = np.empty_like(lonlat)
+    out[:, 0] = (lonlat[:, 0] + 180.0) / 360.0
+    out[:, 1] = (1.0 - np.log(np.tan(lat_rad) + 1.0 / np.cos(lat_rad)) / math.pi) / 2.0
+    return out
+
+
+def projection_lonlat_to_tile(lonlat, zoom: int) -> np.ndarray:
+    """
+    Project (lon, lat) degrees into fractional tile coordinates of a zoom level.
+
+    Args:
+        lonlat (array-like): Array of shape (N, 2) with (lon, lat) in degrees.
+        zoom (int): Zoom level.
+
+    Returns:
+        np.ndarray: float64 array of shape (N, 2) with (x_tile, y_tile).
+    """
+    out = projection_lonlat_to_mercator(lonlat)
+    out *= 2.0 ** zoom
+    return out
+# ********************************************************************************************
+
+
+# ********************************************************************************************
+class MapViewTransform:
+    """
+    Affine mapping from normalized Mercator units to widget pixels for one view.
+
+    Attributes:
+        zoom (int): Zoom level of the view.
+        scale (float): Pixels per normalized unit (2**zoom * tile_size).
+        origin_x (float): Pixel x of Mercator x = 0.
+        origin_y (float): Pixel y of Mercator y = 0.
+    """
+
+    def __init__(self, zoom, scale, origin_x, origin_y):
+        self.zoom = zoom
+        self.scale = scale
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+
+    def apply(self, merc) -> np.ndarray:
+        """
+        Map normalized Mercator points to pixels.
+
+        Args:
+            merc (np.ndarray): Array of shape (N, 2) in normalized units.
+
+        Returns:
+            np.ndarray: New float64 array of shape (N, 2) with (px, py).
+        """
+        pixels = merc * self.scale
+        pixels += (self.origin_x, self.origin_y)
+        return pixels
+
+    def to_mercator(self, px, py):
+        """Map a pixel position back to normalized Mercator units."""
+        return (px - self.origin_x) / self.scale, (py - self.origin_y) / self.scale
+
+    def pixel_bbox_to_mercator(self, x0, y0, x1, y1):
+        """Return the normalized Mercator bbox (min_x, min_y, max_x, max_y) of a pixel rect."""
+        mx0, my0 = self.to_mercator(x0, y0)
+        mx1, my1 = self.to_mercator(x1, y1)
+        return min(mx0, mx1), min(my0, my1), max(mx0, mx1), max(my0, my1)
+
+    def __eq__(self, other):
+        return isinstance(other, MapViewTransform) and (
+            self.zoom, self.scale, self.origin_x, self.origin_y
+        ) == (other.zoom, other.scale, other.origin_x, other.origin_y)
+
+    def __hash__(self):
+        return hash((self.zoom, self.scale, self.origin_x, self.origin_y))
+# ********************************************************************************************
@@ -8,7 +8,7 @@ map rendering system. It tracks the following:
     - Ship marker (custom drawable object).
     - Zoom range and current zoom level.
     - Panning offsets and drag state.
-    - Tile rendering (cached Cairo surfaces).
+    - Tile rendering (bounded LRU tile cache).
     - User interaction states (mouse clicks, dragging).
     - Debug mode toggle for diagnostics.
 
@@ -26,8 +26,10 @@ import gi
 gi.require_version("Gtk", "3.0")
 from gi.repository import Gtk, Gdk, GdkPixbuf
 
+from config import MAP_TILE_CACHE_MAX_BYTES
 from utils.path import utils_path_get_asset
 from views.map.map_marker.marker_ship import MapMarkerShip
+from views.map.map_tile.tile_cache import TileCache
 
 
 class MapState:
@@ -44,8 +46,8 @@ class MapState:
         curr_zoom (int): Current zoom level.
         offset_x (int): Horizontal pan offset in pixels.
         offset_y (int): Vertical pan offset in pixels.
-        tiles_dir_path (str|None): Path to tile storage directory.
-        tiles (dict): Map of {(x, y): Cairo surface} tile cache.
+        tiles_dir_path (str|None): Path to tile storage (directory or packed tile archive).
+        tiles (TileCache): LRU cache of {(zoom, x, y): cairo.ImageSurface} bounded by MAP_TILE_CACHE_MAX_BYTES.
         last_clicked_pos (tuple): Last mouse click position (x, y).
         dragging (bool): True if drag operation is active.
         drag_start_x (int): X coordinate where drag began.
@@ -88,7 +90,7 @@ class MapState:
 
         # Tile rendering cache
         self.tiles_dir_path = None
-        self.tiles = {}
+        self.tiles = TileCache(MAP_TILE_CACHE_MAX_BYTES)
 
         # Interaction state
         self.last_clicked_pos = (0, 0)
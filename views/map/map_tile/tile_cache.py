@@ -0,0 +1,184 @@
+"""
+tile_cache.py - Bounded LRU cache for decoded map tiles.
+
+This module defines the `TileCache` class, the in-memory store used by
+`MapVisualize` for decoded raster tiles. It provides:
+
+    - Least-recently-used eviction against a byte budget.
+    - Tiles of every zoom level kept side by side (keys are (zoom, x, y)).
+    - Hit / miss / eviction counters for diagnostics.
+    - Thread-safe access (tiles are produced by loader threads).
+
+The size of an entry is the size of its pixel buffer (stride x height),
+which is what actually occupies memory for a decoded tile.
+
+Usage:
+    from views.map.map_tile.tile_cache import TileCache
+
+    cache = TileCache(max_bytes=64 * 1024 * 1024)
+    cache.put((16, 52345, 30876), surface)
+    surface = cache.get((16, 52345, 30876))
+    print(cache.stats())
+
+Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
+"""
+
+import threading
+from collections import OrderedDict
+
+
+# ********************************************************************************************
+def tile_cache_entry_size(value) -> int:
+    """
+    Return the memory footprint of a cached tile in bytes.
+
+    Args:
+        value: A cairo.ImageSurface or GdkPixbuf.Pixbuf.
+
+    Returns:
+        int: stride x height, or 0 if the size cannot be determined.
+    """
+    if hasattr(value, "get_stride") and hasattr(value, "get_height"):
+        return value.get_stride() * value.get_height()
+    if hasattr(value, "get_rowstride") and hasattr(value, "get_height"):
+        return value.get_rowstride() * value.get_height()
+    return 0
+# ********************************************************************************************
+
+
+# ********************************************************************************************
+class TileCache:
+    """
+    LRU tile cache bounded by a byte budget.
+
+    Attributes:
+        max_bytes (int): Memory budget in bytes.
+        curr_bytes (int): Bytes currently held by cached entries.
+        hits (int): Number of successful lookups.
+        misses (int): Number of failed lookups.
+        evictions (int): Number of entries evicted to respect the budget.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Initialize an empty tile cache.
+
+        Args:
+            max_bytes (int): Memory budget in bytes.
+        """
+        self.max_bytes = max_bytes
+        self.curr_bytes = 0
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # key -> (value, size); ordered from least to most recently used
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ----------------------------------------------------------------------------------------
+    # [Lookup]
+    def get(self, key):
+        """
+        Return the cached value for `key` and mark it as most recently used.
+
+        Args:
+            key (tuple): Tile key (zoom, x, y).
+
+        Returns:
+            The cached value, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, key):
+        """
+        Return the cached value for `key` without touching LRU order or counters.
+
+        Args:
+            key (tuple): Tile key (zoom, x, y).
+
+        Returns:
+            The cached value, or None if not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry is not None else None
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    # ----------------------------------------------------------------------------------------
+    # [Update]
+    def put(self, key, value, size=None):
+        """
+        Insert or replace a cache entry, evicting LRU entries if over budget.
+
+        Args:
+            key (tuple): Tile key (zoom, x, y).
+            value: Tile object to cache.
+            size (int, optional): Entry size in bytes. Computed from `value` when None.
+                Pass a nominal size for shared placeholders (their pixels are not held per entry).
+        """
+        if size is None:
+            size = tile_cache_entry_size(value)
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.curr_bytes -= old[1]
+
+            self._entries[key] = (value, size)
+            self.curr_bytes += size
+
+            # Evict least recently used entries (never the one just inserted)
+            while self.curr_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.curr_bytes -= evicted_size
+                self.evictions += 1
+
+    def discard(self, key):
+        """Remove `key` from the cache if present."""
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.curr_bytes -= old[1]
+
+    def clear(self):
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.curr_bytes = 0
+
+    # ----------------------------------------------------------------------------------------
+    # [Diagnostics]
+    def stats(self) -> dict:
+        """
+        Return cache statistics.
+
+        Returns:
+            dict: { "entries", "bytes", "max_bytes", "hits", "misses", "evictions" }
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.curr_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+# ********************************************************************************************
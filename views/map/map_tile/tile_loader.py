@@ -0,0 +1,191 @@
+"""
+tile_loader.py - Fixed-size worker pool for background tile loading.
+
+This module defines the `TileLoaderPool` class, used by `MapVisualize` to
+decode tiles off the GTK main thread without spawning one thread per tile.
+
+Features:
+    - Fixed number of daemon worker threads.
+    - Priority queue: lower priority value is served first
+      (MapVisualize uses the distance from the viewport center).
+    - Re-prioritization when a pending tile is requested again
+      (`reprioritize` leaves jobs already running untouched).
+    - Cancellation of pending requests that are no longer needed
+      (e.g. tiles that have left the viewport).
+
+The pool does not touch GTK. The job handler runs in a worker thread and is
+responsible for handing results back to the main loop (GLib.idle_add).
+
+Usage:
+    from views.map.map_tile.tile_loader import TileLoaderPool
+
+    pool = TileLoaderPool(4, handler=lambda key, payload: ...)
+    pool.submit((16, 52345, 30876), "/tiles/16/52345/30876.png", priority=0.7)
+    cancelled = pool.cancel_except(visible_keys)
+
+Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
+"""
+
+import heapq
+import itertools
+import threading
+
+from utils.log import utils_log_get_logger
+LOG_INFO  = utils_log_get_logger("tile_loader")["info"]
+LOG_DEBUG = utils_log_get_logger("tile_loader")["debug"]
+LOG_WARN  = utils_log_get_logger("tile_loader")["warn"]
+LOG_ERR   = utils_log_get_logger("tile_loader")["err"]
+
+
+# ********************************************************************************************
+class TileLoaderPool:
+    """
+    Priority-ordered worker pool for tile jobs.
+
+    Attributes:
+        num_workers (int): Number of worker threads.
+        handler (Callable): Function `handler(key, payload)` executed in a worker thread.
+    """
+
+    def __init__(self, num_workers: int, handler, name: str = "tile-loader"):
+        """
+        Create the pool and start its worker threads.
+
+        Args:
+            num_workers (int): Number of worker threads (at least 1).
+            handler (Callable): Job function `handler(key, payload)`.
+            name (str): Thread name prefix (for debugging).
+        """
+        self.num_workers = max(1, int(num_workers))
+        self.handler = handler
+
+        self._cond = threading.Condition()
+        self._heap = []                 # [priority, seq, key, payload, valid]
+        self._pending = {}              # key -> heap entry
+        self._counter = itertools.count()
+        self._running = True
+
+        self._threads = []
+        for i in range(self.num_workers):
+            t = threading.Thread(target=self._worker_loop, name=f"{name}-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    # ----------------------------------------------------------------------------------------
+    # [Queue API]
+    def submit(self, key, payload, priority: float = 0.0) -> bool:
+        """
+        Queue a job, or update the priority of an already pending job.
+
+        Args:
+            key (Hashable): Job identifier (tile key).
+            payload: Data passed to the handler (e.g. tile path).
+            priority (float): Lower values are served first.
+
+        Returns:
+            bool: True if a new job was queued, False if it was already pending.
+        """
+        with self._cond:
+            entry = self._pending.get(key)
+            if entry is not None:
+                if priority < entry[0]:
+                    # Lazy deletion: invalidate the old entry and push a new one
+                    entry[4] = False
+                    self._push(key, entry[3], priority)
+                return False
+
+            self._push(key, payload, priority)
+            self._cond.notify()
+            return True
+
+    def reprioritize(self, key, priority: float) -> bool:
+        """
+        Update the priority of a pending job; never queues a new one.
+
+        Unlike `submit`, this is a no-op for a job that a worker has already
+        picked up (it would otherwise run a second time).
+
+        Returns:
+            bool: True if the job is still pending.
+        """
+        with self._cond:
+            entry = self._pending.get(key)
+            if entry is None:
+                return False
+            if priority < entry[0]:
+                entry[4] = False
+                self._push(key, entry[3], priority)
+            return True
+
+    def cancel_except(self, keep_keys) -> list:
+        """
+        Cancel every pending job whose key is not in `keep_keys`.
+
+        Jobs already running in a worker are not interrupted.
+
+        Args:
+            keep_keys (set): Keys that must stay queued.
+
+        Returns:
+            list: Keys of the cancelled jobs.
+        """
+        with self._cond:
+            cancelled = [key for key in self._pending if key not in keep_keys]
+            for key in cancelled:
+                self._pending.pop(key)[4] = False
+            if cancelled:
+                self._compact()
+            return cancelled
+
+    def is_pending(self, key) -> bool:
+        """Return True if `key` is queued and not yet picked up by a worker."""
+        with self._cond:
+            return key in self._pending
+
+    def shutdown(self):
+        """Stop the workers once they finish their current job. Pending jobs are dropped."""
+        with self._cond:
+            self._running = False
+            self._heap.clear()
+            self._pending.clear()
+            self._cond.notify_all()
+
+    # ----------------------------------------------------------------------------------------
+    # [Internals]
+    def _push(self, key, payload, priority):
+        """Push a new heap entry (caller holds the lock)."""
+        entry = [priority, next(self._counter), key, payload, True]
+        self._pending[key] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _compact(self):
+        """Drop invalidated entries when they dominate the heap (caller holds the lock)."""
+        if len(self._heap) > 2 * len(self._pending) + 64:
+            self._heap = [e for e in self._heap if e[4]]
+            heapq.heapify(self._heap)
+
+    def _pop(self):
+        """Block until a valid job is available; return (key, payload) or None on shutdown."""
+        with self._cond:
+            while True:
+                if not self._running:
+                    return None
+                while self._heap:
+                    _, _, key, payload, valid = heapq.heappop(self._heap)
+                    if valid:
+                        del self._pending[key]
+                        return key, payload
+                self._cond.wait()
+
+    def _worker_loop(self):
+        """Worker thread body."""
+        while True:
+            job = self._pop()
+            if job is None:
+                return
+            key, payload = job
+            try:
+                self.handler(key, payload)
+            except Exception as e:
+                LOG_ERR(f"[tile_loader] Job {key} failed: {e}")
+# ********************************************************************************************
@@ -0,0 +1,173 @@
+"""
+tile_prefetch.py - Viewport-ahead tile prefetch planning.
+
+This module defines the `TilePrefetcher` class, used by `MapVisualize` to warm
+the tile cache before tiles become visible. It keeps a smoothed estimate of
+how the view is moving and turns it into a list of tiles to load:
+
+    - Ring:      tiles just outside the composed tile range (the viewport when
+                 none is given), closest to the predicted viewport center
+                 first (tiles ahead of the motion win).
+    - Ahead:     the composed range (or viewport) predicted `lookahead_s`
+                 seconds from now, from the drag velocity or from the ship's
+                 heading and speed.
+    - Next zoom: tiles of zoom + 1 covering the viewport (zoom-in is one scroll away).
+
+Priorities are offset by `TILE_PREFETCH_PRIORITY_BASE`, so prefetch requests are
+always served after visible-tile requests (which use the distance to the
+viewport center, in tiles) in the same `TileLoaderPool`.
+
+All coordinates are fractional tile coordinates of the current zoom level;
+velocities are in tiles per second.
+
+Usage:
+    from views.map.map_tile.tile_prefetch import TilePrefetcher
+
+    prefetcher = TilePrefetcher(lookahead_s=1.5)
+    prefetcher.velocity_update(vx, vy)
+    for key, priority in prefetcher.plan(zoom, cx, cy, half_w, half_h, max_zoom, limit=64):
+        pool.submit(key, source, priority)
+
+Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
+"""
+
+import math
+
+# Added to the distance of every prefetch request (visible tiles use the bare distance)
+TILE_PREFETCH_PRIORITY_BASE = 1000.0
+# Extra offset for next-zoom tiles, after ring / ahead tiles
+TILE_PREFETCH_PRIORITY_NEXT_ZOOM = 1000.0
+
+
+# ********************************************************************************************
+class TilePrefetcher:
+    """
+    Predicts the next viewport and lists the tiles worth loading ahead of time.
+
+    Attributes:
+        lookahead_s (float): How far ahead (seconds) the viewport is predicted.
+        ring (int): Width, in tiles, of the ring prefetched around the composed range / viewport.
+        smoothing (float): Weight of a new velocity sample in [0, 1] (exponential smoothing).
+        vx (float): Smoothed horizontal velocity, tiles/s.
+        vy (float): Smoothed vertical velocity, tiles/s.
+    """
+
+    def __init__(self, lookahead_s: float = 1.5, ring: int = 1, smoothing: float = 0.5):
+        """
+        Initialize a prefetcher with zero velocity.
+
+        Args:
+            lookahead_s (float): Prediction horizon in seconds.
+            ring (int): Width of the ring around the viewport, in tiles.
+            smoothing (float): Weight of a new velocity sample in [0, 1].
+        """
+        self.lookahead_s = lookahead_s
+        self.ring = max(0, int(ring))
+        self.smoothing = min(1.0, max(0.0, smoothing))
+        self.vx = 0.0
+        self.vy = 0.0
+
+    # ----------------------------------------------------------------------------------------
+    # [Motion]
+    def velocity_update(self, vx: float, vy: float):
+        """
+        Feed a new velocity sample (tiles/s, current zoom).
+
+        Args:
+            vx (float): Horizontal velocity (positive = view moves east).
+            vy (float): Vertical velocity (positive = view moves south).
+        """
+        a = self.smoothing
+        self.vx = (1.0 - a) * self.vx + a * vx
+        self.vy = (1.0 - a) * self.vy + a * vy
+
+    def velocity_reset(self):
+        """Forget the current motion (e.g. after a zoom change or a jump)."""
+        self.vx = 0.0
+        self.vy = 0.0
+
+    def predict_center(self, cx: float, cy: float):
+        """Return the viewport center predicted `lookahead_s` seconds ahead."""
+        return cx + self.vx * self.lookahead_s, cy + self.vy * self.lookahead_s
+
+    # ----------------------------------------------------------------------------------------
+    # [Planning]
+    def plan(self, zoom, cx, cy, half_w, half_h, max_zoom, limit, exclude=(), composed=None):
+        """
+        List the tiles to prefetch for a viewport, most useful first.
+
+        Args:
+            zoom (int): Current zoom level.
+            cx, cy (float): Viewport center, fractional tile coordinates.
+            half_w, half_h (float): Half the viewport size, in tiles.
+            max_zoom (int): Highest zoom level the map allows.
+            limit (int): Maximum number of tiles returned (cache budget).
+            exclude (Container): Keys not to list (visible / already handled tiles).
+            composed (tuple, optional): (x0, y0, x1, y1) inclusive tile range already
+                drawn around the viewport (MapVisualize draws a margin beyond the
+                widget). The ring and the predicted range are built around it.
+
+        Returns:
+            list[tuple]: [((zoom, x, y), priority), ...] sorted by priority.
+        """
+        if limit <= 0:
+            return []
+
+        px, py = self.predict_center(cx, cy)
+        candidates = {}
+
+        # Ring around the viewport + viewport predicted ahead, closest to the prediction first
+        if composed is not None:
+            x0, y0, x1, y1 = composed
+            dx = math.floor(px - cx + 0.5)
+            dy = math.floor(py - cy + 0.5)
+            rects = (
+                (x0 - self.ring, y0 - self.ring, x1 + self.ring, y1 + self.ring),
+                (x0 + dx, y0 + dy, x1 + dx, y1 + dy),
+            )
+        else:
+            rects = (
+                self._rect(cx, cy, half_w + self.ring, half_h + self.ring),
+                self._rect(px, py, half_w, half_h),
+            )
+        for rect in rects:
+            for x, y in self._rect_tiles(rect, zoom):
+                key = (zoom, x, y)
+                if key in exclude or key in candidates:
+                    continue
+                candidates[key] = TILE_PREFETCH_PRIORITY_BASE + math.hypot(x + 0.5 - px, y + 0.5 - py)
+
+        # Next zoom level around the current center
+        if zoom + 1 <= max_zoom:
+            nz = zoom + 1
+            ncx, ncy = cx * 2.0, cy * 2.0
+            for x, y in self._rect_tiles(self._rect(ncx, ncy, half_w * 2.0, half_h * 2.0), nz):
+                key = (nz, x, y)
+                if key in exclude:
+                    continue
+                candidates[key] = (
+                    TILE_PREFETCH_PRIORITY_BASE + TILE_PREFETCH_PRIORITY_NEXT_ZOOM
+                    + math.hypot(x + 0.5 - ncx, y + 0.5 - ncy)
+                )
+
+        ordered = sorted(candidates.items(), key=lambda item: item[1])
+        return ordered[:limit]
+
+    @staticmethod
+    def _rect(cx, cy, half_w, half_h):
+        return (
+            math.floor(cx - half_w),
+            math.floor(cy - half_h),
+            math.floor(cx + half_w),
+            math.floor(cy + half_h),
+        )
+
+    @staticmethod
+    def _rect_tiles(rect, zoom):
+        """Yield (x, y) of the tiles in an inclusive rect, clipped to the zoom's range."""
+        num_tiles = 1 << zoom
+        x0, y0, x1, y1 = rect
+        for x in range(max(0, x0), min(num_tiles - 1, x1) + 1):
+            for y in range(max(0, y0), min(num_tiles - 1, y1) + 1):
+                yield x, y
+# ********************************************************************************************
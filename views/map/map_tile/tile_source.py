@@ -0,0 +1,395 @@
+"""
+tile_source.py - Tile source backends for MapVisualize.
+
+A tile source answers "does tile (z, x, y) exist?" and returns the encoded
+tile bytes (PNG). `MapVisualize` only talks to this interface, so an extent's
+`tile_dir` can point at any supported storage.
+
+Each source can build an in-memory presence index once per extent
+(`build_presence_index()`, a directory scan / index read). Once built,
+`has_tile()` is a set lookup with no I/O; before that it probes the storage.
+
+Backends:
+
+    - DirectoryTileSource: classic `<tile_dir>/<z>/<x>/<y>.png` tree.
+    - MBTilesTileSource:   single-file MBTiles (SQLite) archive, read through
+                           a pool of read-only connections shared by the
+                           tile loader workers.
+    - PackTileSource:      memory-mapped tile pack (<name>.tpk data file +
+                           <name>.tpx sorted offset index), written by
+                           database/python/map/tile_pack.py.
+
+Usage:
+    from views.map.map_tile.tile_source import tile_source_open
+
+    source = tile_source_open("database/.../tiles.mbtiles")
+    source.build_presence_index()
+    if source.has_tile(16, 52345, 30876):
+        data = source.read_tile(16, 52345, 30876)
+    source.close()
+
+Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
+"""
+
+import bisect
+import mmap
+import os
+import queue
+import sqlite3
+import struct
+import threading
+
+from utils.log import utils_log_get_logger
+LOG_INFO  = utils_log_get_logger("tile_source")["info"]
+LOG_DEBUG = utils_log_get_logger("tile_source")["debug"]
+LOG_WARN  = utils_log_get_logger("tile_source")["warn"]
+LOG_ERR   = utils_log_get_logger("tile_source")["err"]
+
+MBTILES_EXTENSIONS = (".mbtiles",)
+
+# Tile pack format (must match database/python/map/tile_pack.py)
+TILE_PACK_EXTENSIONS = (".tpk",)
+TILE_PACK_INDEX_SUFFIX = ".tpx"
+TILE_PACK_MAGIC = b"VTPX"
+TILE_PACK_VERSION = 1
+TILE_PACK_HEADER = struct.Struct("<4sIQ")
+
+
+# ********************************************************************************************
+def tile_source_key(zoom: int, x: int, y: int) -> int:
+    """Pack a tile coordinate into one integer (same layout as the tile pack index)."""
+    return (zoom << 56) | (x << 28) | y
+# ********************************************************************************************
+
+
+# ********************************************************************************************
+class TileSource:
+    """
+    Base class for tile storage backends.
+
+    Subclasses implement `_probe_tile()` (direct existence check) and
+    `_scan_tiles()` (enumerate all tiles, used to build the presence index).
+
+    Attributes:
+        path (str): Location of the tile storage (directory or archive file).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._presence = None  # set of tile_source_key() once the index is built
+
+    # ----------------------------------------------------------------------------------------
+    # [Presence index]
+    def build_presence_index(self) -> int:
+        """
+        Enumerate the source once and keep the set of existing tiles in memory.
+
+        Safe to call from a background thread: `has_tile()` keeps probing the
+        storage until the index is published.
+
+        Returns:
+            int: Number of tiles indexed.
+        """
+        presence = {tile_source_key(z, x, y) for z, x, y in self._scan_tiles()}
+        self._presence = presence
+        return len(presence)
+
+    def has_presence_index(self) -> bool:
+        """Return True once `has_tile()` is answered from memory."""
+        return self._presence is not None
+
+    def has_tile(self, zoom: int, x: int, y: int) -> bool:
+        """Return True if the tile exists in this source."""
+        presence = self._presence
+        if presence is not None:
+            return tile_source_key(zoom, x, y) in presence
+        return self._probe_tile(zoom, x, y)
+
+    def _mark_present(self, zoom: int, x: int, y: int):
+        """Record a tile added at runtime (e.g. downloaded)."""
+        presence = self._presence
+        if presence is not None:
+            presence.add(tile_source_key(zoom, x, y))
+
+    def _probe_tile(self, zoom: int, x: int, y: int) -> bool:
+        raise NotImplementedError
+
+    def _scan_tiles(self):
+        """Yield (zoom, x, y) for every tile in the source."""
+        raise NotImplementedError
+
+    # ----------------------------------------------------------------------------------------
+    # [Tile data]
+
+    def read_tile(self, zoom: int, x: int, y: int):
+        """Return the encoded tile bytes, or None if the tile does not exist."""
+        raise NotImplementedError
+
+    def store_tile(self, zoom: int, x: int, y: int, data: bytes) -> bool:
+        """
+        Store downloaded tile bytes (runtime tile download).
+
+        Returns:
+            bool: True if stored, False if the source is read-only.
+        """
+        return False
+
+    def close(self):
+        """Release resources held by the source."""
+        pass
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.path!r})"
+# ********************************************************************************************
+
+
+# ********************************************************************************************
+class DirectoryTileSource(TileSource):
+    """Tiles stored as `<path>/<z>/<x>/<y>.png` files."""
+
+    def tile_file_path(self, zoom: int, x: int, y: int) -> str:
+        """Return the file path of a tile."""
+        return os.path.join(self.path, str(zoom), str(x), f"{y}.png")
+
+    def _probe_tile(self, zoom, x, y):
+        return os.path.exists(self.tile_file_path(zoom, x, y))
+
+    def _scan_tiles(self):
+        for zoom_entry in os.scandir(self.path):
+            if not zoom_entry.name.isdigit() or not zoom_entry.is_dir():
+                continue
+            zoom = int(zoom_entry.name)
+            for x_entry in os.scandir(zoom_entry.path):
+                if not x_entry.name.isdigit() or not x_entry.is_dir():
+                    continue
+                x = int(x_entry.name)
+                for y_entry in os.scandir(x_entry.path):
+                    y_name, ext = os.path.splitext(y_entry.name)
+                    if ext == ".png" and y_name.isdigit():
+                        yield zoom, x, int(y_name)
+
+    def read_tile(self, zoom, x, y):
+        try:
+            with open(self.tile_file_path(zoom, x, y), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def store_tile(self, zoom, x, y, data):
+        tile_path = self.tile_file_path(zoom, x, y)
+        os.makedirs(os.path.dirname(tile_path), exist_ok=True)
+        with open(tile_path, "wb") as f:
+            f.write(data)
+        self._mark_present(zoom, x, y)
+        return True
+# ********************************************************************************************
+
+
+# ********************************************************************************************
+class MBTilesTileSource(TileSource):
+    """
+    Tiles stored in an MBTiles (SQLite) archive.
+
+    MBTiles rows use the TMS scheme (y axis flipped), converted here to the
+    XYZ scheme used by MapVisualize. Connections are opened read-only and
+    pooled; a worker borrows one per query.
+    """
+
+    def __init__(self, path: str, pool_size: int = 4):
+        """
+        Args:
+            path (str): Path to the .mbtiles file.
+            pool_size (int): Number of pooled read-only connections.
+        """
+        super().__init__(path)
+        self._uri = f"file:{os.path.abspath(path)}?mode=ro"
+        self._pool = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        for _ in range(max(1, pool_size)):
+            self._pool.put(self._connect())
+
+    def _connect(self):
+        # Connections are shared between worker threads (one at a time, via the pool)
+        return sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+
+    def _query(self, sql, params):
+        """Run a single-row query on a pooled connection."""
+        if self._closed:
+            return None
+        try:
+            conn = self._pool.get(timeout=1.0)
+        except queue.Empty:
+            return None  # source closed while waiting
+        try:
+            return conn.execute(sql, params).fetchone()
+        except sqlite3.Error as e:
+            LOG_ERR(f"[mbtiles] Query failed on {self.path}: {e}")
+            return None
+        finally:
+            with self._lock:
+                if self._closed:
+                    conn.close()
+                else:
+                    self._pool.put(conn)
+
+    def _probe_tile(self, zoom, x, y):
+        row = self._query(
+            "SELECT 1 FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+            (zoom, x, (1 << zoom) - 1 - y),
+        )
+        return row is not None
+
+    def _scan_tiles(self):
+        conn = self._connect()
+        try:
+            for zoom, x, tms_y in conn.execute("SELECT zoom_level, tile_column, tile_row FROM tiles"):
+                yield zoom, x, (1 << zoom) - 1 - tms_y
+        finally:
+            conn.close()
+
+    def read_tile(self, zoom, x, y):
+        row = self._query(
+            "SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+            (zoom, x, (1 << zoom) - 1 - y),
+        )
+        return bytes(row[0]) if row is not None else None
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            while not self._pool.empty():
+                self._pool.get_nowait().close()
+# ********************************************************************************************
+
+
+# ********************************************************************************************
+class PackTileSource(TileSource):
+    """
+    Tiles stored in a memory-mapped tile pack.
+
+    The .tpx index holds sorted uint64 keys ((zoom << 56) | (x << 28) | y)
+    followed by uint64 offsets and uint32 lengths into the .tpk data file.
+    Both files are mapped once; a lookup is a binary search over the mapped
+    key array and a read is a slice of the mapped data (no per-tile open).
+
+    Loader workers may still be reading when the source is closed (extent
+    switch): a lookup or read on a closed source is a quiet miss.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Path to the .tpk data file (index expected next to it as .tpx).
+
+        Raises:
+            ValueError: If the index is missing its header or has an unsupported version.
+        """
+        super().__init__(path)
+        index_path = os.path.splitext(path)[0] + TILE_PACK_INDEX_SUFFIX
+
+        with open(index_path, "rb") as f:
+            self._index_mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = TILE_PACK_HEADER.unpack_from(self._index_mm, 0)
+        if magic != TILE_PACK_MAGIC or version != TILE_PACK_VERSION:
+            self._index_mm.close()
+            raise ValueError(f"Unsupported tile pack index: {index_path}")
+
+        with open(path, "rb") as f:
+            # mmap of an empty file is not allowed
+            self._data_mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if count else b""
+
+        # Zero-copy typed views over the mapped index (little-endian, as on all supported targets)
+        index = memoryview(self._index_mm)
+        keys_at = TILE_PACK_HEADER.size
+        offsets_at = keys_at + 8 * count
+        lengths_at = offsets_at + 8 * count
+        self._keys = index[keys_at:offsets_at].cast("Q")
+        self._offsets = index[offsets_at:lengths_at].cast("Q")
+        self._lengths = index[lengths_at:lengths_at + 4 * count].cast("I")
+        self.count = count
+        self._closed = False
+
+    def _find(self, zoom, x, y):
+        """Return the index entry position of a tile, or -1 (also once closed)."""
+        if self._closed:
+            return -1
+        key = tile_source_key(zoom, x, y)
+        try:
+            pos = bisect.bisect_left(self._keys, key)
+            if pos < self.count and self._keys[pos] == key:
+                return pos
+        except ValueError:
+            pass  # views released by close() in another thread
+        return -1
+
+    def _probe_tile(self, zoom, x, y):
+        return self._find(zoom, x, y) >= 0
+
+    def _scan_tiles(self):
+        return self.iter_keys()
+
+    def read_tile(self, zoom, x, y):
+        pos = self._find(zoom, x, y)
+        if pos < 0:
+            return None
+        try:
+            offset = self._offsets[pos]
+            return self._data_mm[offset:offset + self._lengths[pos]]
+        except ValueError:
+            return None  # closed by another thread meanwhile
+
+    def iter_keys(self):
+        """Yield (zoom, x, y) for every tile in the pack, in index order."""
+        mask = (1 << 28) - 1
+        try:
+            for key in self._keys:
+                yield key >> 56, (key >> 28) & mask, key & mask
+        except ValueError:
+            return  # closed while iterating
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        # Views must be released before the mapping can be closed
+        for view in (self._keys, self._offsets, self._lengths):
+            view.release()
+        self._index_mm.close()
+        if isinstance(self._data_mm, mmap.mmap):
+            self._data_mm.close()
+# ********************************************************************************************
+
+
+# ********************************************************************************************
+def tile_source_open(path: str, pool_size: int = 4):
+    """
+    Open the tile source matching `path`.
+
+    Args:
+        path (str): Tile directory, or a packed tile archive file.
+        pool_size (int): Connection pool size for database-backed sources.
+
+    Returns:
+        TileSource | None: The opened source, or None if `path` is not supported.
+    """
+    if os.path.isdir(path):
+        return DirectoryTileSource(path)
+
+    if os.path.isfile(path) and path.lower().endswith(MBTILES_EXTENSIONS):
+        try:
+            return MBTilesTileSource(path, pool_size=pool_size)
+        except sqlite3.Error as e:
+            LOG_ERR(f"[✗] Cannot open MBTiles archive {path}: {e}")
+            return None
+
+    if os.path.isfile(path) and path.lower().endswith(TILE_PACK_EXTENSIONS):
+        try:
+            return PackTileSource(path)
+        except (OSError, ValueError, struct.error) as e:
+            LOG_ERR(f"[✗] Cannot open tile pack {path}: {e}")
+            return None
+
+    return None
+# ********************************************************************************************
@@ -0,0 +1,71 @@
+"""
+tile_surface.py - Conversion of decoded tiles into ready-to-paint cairo surfaces.
+
+`Gdk.cairo_set_source_pixbuf` converts a GdkPixbuf (unpremultiplied RGB/RGBA)
+into a premultiplied cairo image surface every time it is called. Converting
+once, in the loader worker, lets `on_draw` paint tiles with a plain
+`set_source_surface` + `paint`.
+
+Formats:
+    - Pixbufs without alpha → cairo.FORMAT_RGB24
+    - Pixbufs with alpha    → cairo.FORMAT_ARGB32
+
+The conversion only uses image surfaces (no GDK display access), so it is
+safe to run in tile loader threads.
+
+Usage:
+    from views.map.map_tile.tile_surface import tile_surface_from_pixbuf, tile_surface_from_bytes
+
+    surface = tile_surface_from_pixbuf(GdkPixbuf.Pixbuf.new_from_file(path))
+    surface = tile_surface_from_bytes(tile_source.read_tile(z, x, y))
+    ctx.set_source_surface(surface, x, y)
+    ctx.paint()
+
+Author: Khuong Nguyen (ntkhuong.coder@gmail.com)
+"""
+
+import cairo
+import gi
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gdk, GdkPixbuf
+
+
+# ********************************************************************************************
+def tile_surface_from_pixbuf(pixbuf) -> cairo.ImageSurface:
+    """
+    Convert a GdkPixbuf into a premultiplied cairo image surface.
+
+    Args:
+        pixbuf (GdkPixbuf.Pixbuf): Decoded tile image.
+
+    Returns:
+        cairo.ImageSurface: Surface in FORMAT_RGB24 (opaque) or FORMAT_ARGB32 (with alpha).
+    """
+    fmt = cairo.FORMAT_ARGB32 if pixbuf.get_has_alpha() else cairo.FORMAT_RGB24
+    surface = cairo.ImageSurface(fmt, pixbuf.get_width(), pixbuf.get_height())
+
+    ctx = cairo.Context(surface)
+    ctx.set_operator(cairo.OPERATOR_SOURCE)
+    Gdk.cairo_set_source_pixbuf(ctx, pixbuf, 0, 0)
+    ctx.paint()
+    surface.flush()
+    return surface
+# ********************************************************************************************
+
+
+# ********************************************************************************************
+def tile_surface_from_bytes(data) -> cairo.ImageSurface:
+    """
+    Decode encoded tile bytes (PNG/JPEG) and convert them into a cairo image surface.
+
+    Args:
+        data (bytes): Encoded tile image, as returned by a TileSource.
+
+    Returns:
+        cairo.ImageSurface: Ready-to-paint tile surface.
+    """
+    loader = GdkPixbuf.PixbufLoader()
+    loader.write(data)
+    loader.close()
+    return tile_surface_from_pixbuf(loader.get_pixbuf())
+# ********************************************************************************************
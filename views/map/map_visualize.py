@@ -8,11 +8,16 @@ Provides panning, zooming, tile caching, dynamic GeoJSON layer rendering, and a
 Main Features
 -------------
 - Tile-based rendering with async downloading and caching.
+- Composited base-map surface: panning only blits the cached tiles + layers.
+- Frame clock driven redraws: requests and tile arrivals are batched into at
+  most one redraw per display refresh.
+- Viewport-ahead tile prefetch from pan velocity and ship motion.
 - Smooth pan and zoom interactions (mouse drag + scroll wheel).
 - Ship marker with heading, scale, and simulated drift.
 - Layer system with GeoJSON parsing, styling, and hit testing.
 - Popups on marker and feature clicks.
-- Signal emission (`view-changed`) for extent updates.
+- Signal emission (`view-changed`) for extent updates: at most once per frame,
+  only when the view actually changed, carrying the new view parameters.
 
 Usage Example
 -------------
@@ -53,6 +58,7 @@ from gi.repository import GLib
 
 import math
 import os
+import time
 import urllib.request
 
 from utils.path import utils_path_get_asset
@@ -70,20 +76,62 @@ MY_LOCATION_LAT = 10.8382543
 MY_LOCATION_LON = 106.8317088
 
 from config import ENABLE_FEATURE_TILE_DOWNLOAD_RUNTIME
+from config import ENABLE_FEATURE_LAYER_RASTER_CACHE
+from config import MAP_LAYER_RASTER_CACHE_MAX_BYTES, MAP_LAYER_RASTER_WORKERS
+from config import MAP_LAYER_CACHE_MAX_BYTES, MAP_LAYER_LOADER_WORKERS, MAP_LAYER_PARSE_PROCESSES
 from config import VNEST_AUTOPILOT_DATABASE_PATH
+from config import MAP_TILE_LOADER_WORKERS
+from config import MAP_TILE_PREFETCH_LOOKAHEAD_S, MAP_TILE_PREFETCH_BUDGET_RATIO
 from views.map.map_state import MapState
+from views.map.map_base_surface import MapBaseSurface
+from views.map.map_tile.tile_loader import TileLoaderPool
+from views.map.map_tile.tile_surface import tile_surface_from_pixbuf, tile_surface_from_bytes
+from views.map.map_tile.tile_source import tile_source_open
+from views.map.map_tile.tile_prefetch import TilePrefetcher
+from views.map.map_projection import projection_lonlat_to_mercator, MapViewTransform
 from views.map.map_layer.layer_factory import LAYER_CLASS_MAP
+from views.map.map_layer.layer_index import LayerSetIndex
+from views.map.map_layer.layer_geobin import layer_geobin_is_fresh
+from views.map.map_layer.layer_parse import LayerParsePool
+from views.map.map_layer.layer_cache import LayerCache
+from views.map.map_layer.layer_labels import LayerLabelRenderer
+from views.map.map_layer.layer_raster_cache import LayerRasterCache, LAYER_TILE_EMPTY
 
 G_TILE_EMPTY = "empty.png"
 
+# Placeholder search depth while a tile loads: cached ancestors (upscaled) and
+# cached descendants (downsampled) within this many zoom levels are used.
+TILE_FALLBACK_PARENT_LEVELS = 5
+TILE_FALLBACK_CHILD_LEVELS = 2
+
+# Minimum time between two prefetch plans while dragging (motion events are frequent)
+TILE_PREFETCH_INTERVAL_MS = 100
+
+# Cache size charged for a known-missing tile (the placeholder surface is shared;
+# this bounds the number of such entries by the cache budget)
+TILE_PLACEHOLDER_CACHE_BYTES = 512
+# Minimum time before the download of a tile that failed is tried again
+TILE_DOWNLOAD_RETRY_S = 30.0
+
+
+def _rect_intersects(rect, extents):
+    """Return True if rect (x, y, w, h) intersects extents (x0, y0, x1, y1); a None rect never does."""
+    if rect is None:
+        return False
+    x, y, w, h = rect
+    x0, y0, x1, y1 = extents
+    return x < x1 and x0 < x + w and y < y1 and y0 < y + h
+
+
 class MapVisualize(Gtk.DrawingArea):
 
     # ****************************************************************************************
     # [Custom signal]
     # Define a GObject signal to notify whenever the map view changes
     __gsignals__ = {
-        # No arguments, just notifies that the view (center/zoom) changed
-        "view-changed": (GObject.SignalFlags.RUN_FIRST, None, ()),
+        # (center lat, center lon, zoom, offset x, offset y) of the new view; the
+        # center is NaN while no tiles directory is set (see curr_center_location_get)
+        "view-changed": (GObject.SignalFlags.RUN_FIRST, None, (float, float, int, float, float)),
     }
     # ****************************************************************************************
 
@@ -101,6 +149,7 @@ class MapVisualize(Gtk.DrawingArea):
 
         # store added layer objects
         self.layers = []
+        self.layers_hit_index = None  # LayerSetIndex over self.layers, built on first click
 
         # Enable event masks
         self.add_events(
@@ -122,16 +171,57 @@ class MapVisualize(Gtk.DrawingArea):
 
         self.map_state = MapState(MY_LOCATION_LAT, MY_LOCATION_LON, (6, 19))
 
-        # async tile loading state
-        self.tiles_lock = threading.Lock()         # protects access to self.map_state.tiles
+        # async tile loading state (tiles themselves live in the LRU self.map_state.tiles)
+        self.tiles_lock = threading.Lock()         # protects self.loading_keys / self.tiles_arrived / self.layer_tiles_arrived
         self.loading_keys = set()                  # keys currently being loaded (avoid duplicate workers)
-        self.empty_pixbuf = GdkPixbuf.Pixbuf.new_from_file(
-            utils_path_get_asset("map", G_TILE_EMPTY)
+        self.empty_surface = tile_surface_from_pixbuf(
+            GdkPixbuf.Pixbuf.new_from_file(utils_path_get_asset("map", G_TILE_EMPTY))
         )
+        # tile storage backend of the current extent (directory or packed archive)
+        self.tile_source = None
+        self.tile_download_failed = {}             # tile key -> monotonic time of its last failed download
+
+        # fixed-size decoder pool, served closest-to-viewport-center first
+        self.tile_loader = TileLoaderPool(MAP_TILE_LOADER_WORKERS, self._tile_loader_job)
+
+        # composed tiles + vector layers; panning only blits it (see on_draw)
+        self.base_surface = MapBaseSurface(margin=TILE_SIZE)
+
+        # viewport-ahead prefetch (see prefetch_tiles)
+        self.tile_prefetcher = TilePrefetcher(lookahead_s=MAP_TILE_PREFETCH_LOOKAHEAD_S)
+        self.visible_keys = set()                  # tiles of the last composed base surface
+        self.tile_slots = {}                       # tile key -> (draw x, draw y) in the last composition
+        self.composed_tiles = None                 # (zoom, x0, y0, x1, y1) tile range of the last composition
+        self.prefetch_keys = set()                 # tiles requested by the last prefetch plan
+        self._drag_sample = None                   # (x, y, event time ms) of the last drag motion
+        self._ship_sample = None                   # (tile x, tile y, zoom, monotonic s) of the last GPS fix
+        self._prefetch_last_ms = 0
+
+        # optional pre-rendered vector layer tiles (see _draw_layers_rasterized)
+        self.layer_raster_cache = None
+        self.layer_tiles_arrived = []              # overlay tile keys rendered since the last frame
+        if ENABLE_FEATURE_LAYER_RASTER_CACHE:
+            self.layer_raster_cache = LayerRasterCache(
+                MAP_LAYER_RASTER_CACHE_MAX_BYTES, MAP_LAYER_RASTER_WORKERS, on_ready=self._layer_tile_ready
+            )
+
+        # background GeoJSON layer loading (see layers_load_async)
+        self.layer_loader = TileLoaderPool(MAP_LAYER_LOADER_WORKERS, self._layer_loader_job, name="layer-loader")
+        self.layer_parse_pool = LayerParsePool(MAP_LAYER_PARSE_PROCESSES)  # JSON decoding, stopped when idle
+        self.layers_loading = {}                   # load token -> (layer name, geojson file) of pending loads
+        self.layers_table = None                   # MapLayerCheckboxTable showing the loading state
+        self.layer_cache = LayerCache(MAP_LAYER_CACHE_MAX_BYTES)  # loaded layers kept across toggles / extents
+
+        # feature labels of all layers, placed after the layers (see _compose_base_map)
+        self.label_renderer = LayerLabelRenderer()
+
+        # frame clock driven redraws (see queue_draw)
+        self._frame_pending = False                # a tick callback is scheduled
+        self._frame_full = False                   # redraw the whole widget on the next frame
+        self._frame_areas = []                     # else widget areas (x, y, w, h) to redraw
+        self.tiles_arrived = []                    # (key, surface, tile source) loaded since the last frame
+        self._view_changed_state = None            # view state of the last view-changed emission
 
-        # TODO(perf): replace dict cache with a bounded LRU to prevent unbounded growth.
-        # Consider: collections.OrderedDict with max size, or functools.lru_cache around loader.
-        
         LOG_DEBUG("MapVisualize init done")
     # ****************************************************************************************
 
@@ -139,12 +229,77 @@ class MapVisualize(Gtk.DrawingArea):
     # Override for queue_draw to add emit custom signal.
     def queue_draw(self, *args, **kwargs):
         """
-	Queue a redraw and emit view-changed.
-        TODO: Emitting on every queue_draw may be noisy. If downstream listeners do heavy work,
-        consider throttling (e.g., coalescing with GLib.idle_add) or emitting only when view actually changes.
+        Queue a redraw of the whole widget on the next frame.
+
+        Redraws are not queued to GTK right away: the requests made between two
+        frames (drag motion, tile arrivals, GPS updates) are collected and
+        turned into one redraw by the frame clock tick (see _frame_tick).
         """
-        super().queue_draw(*args, **kwargs)
-        self.emit("view-changed")
+        self._frame_full = True
+        self._frame_request()
+
+    def _view_state_get(self):
+        """Return the view state compared for view-changed (the signal arguments)."""
+        if self.map_state.tiles_dir_path is None:
+            lat = lon = math.nan
+        else:
+            lat, lon = self.map_state.center_loc_lat, self.map_state.center_loc_lon
+        return (lat, lon, self.map_state.curr_zoom, self.map_state.offset_x, self.map_state.offset_y)
+
+    def _view_changed_check(self):
+        """Emit view-changed if the view changed since the last emission (once per frame, see _frame_tick)."""
+        state = self._view_state_get()
+        # NaN != NaN: compare the centers by their "unset" flag
+        key = tuple("unset" if isinstance(v, float) and math.isnan(v) else v for v in state)
+        if key != self._view_changed_state:
+            self._view_changed_state = key
+            self.emit("view-changed", *state)
+
+    def queue_draw_rect(self, rect):
+        """
+        Queue a redraw of a widget area (x, y, w, h) only; the view itself is unchanged.
+
+        on_draw then gets a context clipped to the damaged areas.
+        """
+        if rect is None:
+            return
+        x, y, w, h = rect
+        x0 = max(0, math.floor(x))
+        y0 = max(0, math.floor(y))
+        x1 = min(self.get_allocated_width(), math.ceil(x + w))
+        y1 = min(self.get_allocated_height(), math.ceil(y + h))
+        if x1 > x0 and y1 > y0:
+            self._frame_areas.append((x0, y0, x1 - x0, y1 - y0))
+            self._frame_request()
+
+    def _frame_request(self):
+        """Schedule _frame_tick for the next frame (once, however many requests come before it)."""
+        if not self._frame_pending:
+            self._frame_pending = True
+            self.add_tick_callback(self._frame_tick)
+
+    def _frame_tick(self, widget, frame_clock):
+        """
+        Frame clock callback, before the frame is painted: commit the tiles that
+        arrived since the last frame, queue one redraw for everything requested
+        and emit view-changed if the view changed.
+
+        Runs only while the widget is mapped; requests made meanwhile wait for it.
+        """
+        self._tiles_arrived_commit()  # may add areas to this frame
+
+        full, areas = self._frame_full, self._frame_areas
+        self._frame_pending = False
+        self._frame_full = False
+        self._frame_areas = []
+        if full:
+            super().queue_draw()
+        else:
+            for area in areas:
+                self.queue_draw_area(*area)
+
+        self._view_changed_check()
+        return GLib.SOURCE_REMOVE
     # ****************************************************************************************
 
     # ****************************************************************************************
@@ -155,17 +310,24 @@ class MapVisualize(Gtk.DrawingArea):
         TODO: de-dup if the same layer_id is added twice.
         """
         self.layers.append(layer)
+        self.layers_hit_index = None
+        self.layers_lod_rebuild_async(layer)  # no-op if the loader already built this range
+        self.base_surface.invalidate()
         self.queue_draw()
 
     def remove_layer(self, layer):
         """Remove a map layer and redraw."""
         if layer in self.layers:
             self.layers.remove(layer)
+            self.layers_hit_index = None
+            self.base_surface.invalidate()
             self.queue_draw()
 
     def clear_layers(self):
         """Remove all layers."""
         self.layers.clear()
+        self.layers_hit_index = None
+        self.base_surface.invalidate()
         self.queue_draw()
     # ****************************************************************************************
 
@@ -179,13 +341,12 @@ class MapVisualize(Gtk.DrawingArea):
             return False  # Ignore other buttons
 
         # Exec hit test for all layers
-        for layer in self.layers:
-            if hasattr(layer, "hit_test"):
-                feature = layer.hit_test(event.x, event.y, self)
-                if feature:
-                    info_text = layer.properties_str(layer.get_properties(feature))
-                    self.show_ship_info_popup(info_text)
-                    return True
+        hit = self.layers_hit_test(event.x, event.y)
+        if hit:
+            layer, feature = hit
+            info_text = layer.properties_str(layer.get_properties(feature))
+            self.show_ship_info_popup(info_text)
+            return True
         
         # Exec hit test for marker
         if self.map_state.my_ship_marker.hit_test(event.x, event.y):
@@ -196,6 +357,7 @@ class MapVisualize(Gtk.DrawingArea):
             self.map_state.dragging = True
             self.map_state.drag_start_x = event.x
             self.map_state.drag_start_y = event.y
+            self._drag_sample = (event.x, event.y, event.time)
             self.start_offset_x = self.map_state.offset_x
             self.start_offset_y = self.map_state.offset_y
             # Also treat this as a click for coordinate detection
@@ -203,6 +365,31 @@ class MapVisualize(Gtk.DrawingArea):
 
         return True
 
+    def layers_hit_test(self, px, py, tolerance=5):
+        """
+        Return (layer, feature) of the topmost feature at widget pixel (px, py), or None.
+
+        Every layer with vector geometry is served by one shared spatial index;
+        layers without geometry keep using their own `hit_test`.
+        """
+        if self.layers_hit_index is None:
+            self.layers_hit_index = LayerSetIndex(self.layers)
+
+        transform = self.view_transform_get()
+        mx, my = transform.to_mercator(px, py)
+        tol = tolerance / transform.scale
+
+        for layer, feature_idx in self.layers_hit_index.query(mx - tol, my - tol, mx + tol, my + tol):
+            if layer.geometry.feature_hit(feature_idx, mx, my, tol):
+                return layer, layer.feature(feature_idx)
+
+        for layer in self.layers:
+            if getattr(layer, "geometry", None) is None and hasattr(layer, "hit_test"):
+                feature = layer.hit_test(px, py, self, tolerance)
+                if feature:
+                    return layer, feature
+        return None
+
     def on_scroll(self, widget, event):
         # TODO(UX): zoom to mouse pointer position (adjust center so the mouse stays on the same geo coord)
         if event.direction == Gdk.ScrollDirection.SMOOTH:
@@ -223,12 +410,31 @@ class MapVisualize(Gtk.DrawingArea):
             dy = event.y - self.map_state.drag_start_y
             self.map_state.offset_x = self.start_offset_x + dx
             self.map_state.offset_y = self.start_offset_y + dy
+            self._drag_velocity_update(event.x, event.y, event.time)
             self.queue_draw()
         return True
 
+    def _drag_velocity_update(self, x, y, time_ms):
+        """Feed the pan velocity to the prefetcher and re-plan (throttled)."""
+        if self._drag_sample is not None:
+            last_x, last_y, last_ms = self._drag_sample
+            dt = (time_ms - last_ms) / 1000.0
+            if dt > 0:
+                # Dragging the map right moves the view west: velocity is opposite to the pointer
+                self.tile_prefetcher.velocity_update(
+                    -(x - last_x) / TILE_SIZE / dt,
+                    -(y - last_y) / TILE_SIZE / dt,
+                )
+        self._drag_sample = (x, y, time_ms)
+
+        if time_ms - self._prefetch_last_ms >= TILE_PREFETCH_INTERVAL_MS:
+            self._prefetch_last_ms = time_ms
+            self.prefetch_tiles()
+
     def on_button_release(self, widget, event):
         if event.button == 1 and self.map_state.dragging:
             self.map_state.dragging = False
+            self._drag_sample = None
             dx = -self.map_state.offset_x / TILE_SIZE
             dy = -self.map_state.offset_y / TILE_SIZE
             cx, cy = self.deg2num(self.map_state.center_loc_lat, self.map_state.center_loc_lon, self.map_state.curr_zoom)
@@ -261,7 +467,6 @@ class MapVisualize(Gtk.DrawingArea):
         lat, lon = self.num2deg(clicked_xtile, clicked_ytile, self.map_state.curr_zoom)
         self.map_state.last_clicked_pos = (lat, lon)
         LOG_DEBUG(f"Clicked at pixel ({x:.0f}, {y:.0f}) => Coordinates: ({lat:.6f}, {lon:.6f})")
-        self.queue_draw()
     # ****************************************************************************************
 
     # ****************************************************************************************
@@ -275,7 +480,75 @@ class MapVisualize(Gtk.DrawingArea):
 
         width = self.get_allocated_width()
         height = self.get_allocated_height()
-        
+        offset_x = self.map_state.offset_x
+        offset_y = self.map_state.offset_y
+
+        # Tiles + vector layers come from the cached base surface: while only the pan
+        # offset changes (drag), a frame is a single blit.
+        view_key = (
+            self.map_state.center_loc_lat,
+            self.map_state.center_loc_lon,
+            self.map_state.curr_zoom,
+            width,
+            height,
+        )
+        if self.base_surface.needs_compose(view_key, offset_x, offset_y):
+            surface_ctx = self.base_surface.begin_compose(view_key, width, height, offset_x, offset_y)
+            self._compose_base_map(surface_ctx, width, height)
+        elif self.base_surface.damaged:
+            # Only damaged parts (e.g. tiles that arrived this frame) are redrawn
+            self._repair_base_map(width, height)
+        # Clipped by GTK to the queued areas (see queue_draw_rect)
+        self.base_surface.blit(ctx, offset_x, offset_y)
+
+        # Draw real-time ship marker (instead of GPS pixbuf) on top of the base map
+        if self.map_state.gps_loc_lat is not None and self.map_state.gps_loc_lon is not None:
+            gps_px, gps_py = self.latlon_to_pixels(self.map_state.gps_loc_lat, self.map_state.gps_loc_lon)
+            gps_px = round(gps_px)
+            gps_py = round(gps_py)
+            marker = self.map_state.my_ship_marker
+
+            if not _rect_intersects(marker.paint_bounds(gps_px, gps_py), ctx.clip_extents()):
+                pass  # outside the redrawn area
+            elif 0 <= gps_px < width and 0 <= gps_py < height:
+                # Update marker position
+                self.map_state.my_ship_marker.set_location(self.map_state.gps_loc_lat, self.map_state.gps_loc_lon)
+                # Draw marker at map coordinates
+                self.map_state.my_ship_marker.draw(ctx, gps_px, gps_py, center=True)
+
+                # LOG_DEBUG(f"[✓] Draw ship marker '{self.map_state.my_ship_marker.name}' "
+                #         f"at ({gps_px}, {gps_py}) heading={self.map_state.my_ship_marker.heading}")
+            else:
+                LOG_DEBUG(f"[ ] Ship marker out of view: ({gps_px}, {gps_py})")
+
+    def _repair_base_map(self, width, height):
+        """
+        Redraw the damaged areas of the base surface in one clipped compose pass.
+
+        The composition code positions everything from the current pan offset:
+        it is set to the offset the surface was composed at for the pass, so
+        damaged areas (margin included) are redrawn in place while panning.
+        """
+        surface_ctx = self.base_surface.begin_repair()
+        pan = (self.map_state.offset_x, self.map_state.offset_y)
+        self.map_state.offset_x, self.map_state.offset_y = self.base_surface.composed_offset
+        try:
+            self._compose_base_map(surface_ctx, width, height, repair=True)
+        finally:
+            self.map_state.offset_x, self.map_state.offset_y = pan
+
+    def _compose_base_map(self, ctx, width, height, repair=False):
+        """
+        Draw tiles and vector layers for the current view into the base surface.
+
+        `ctx` uses widget coordinates; the area covered extends `base_surface.margin`
+        pixels beyond each side of the widget so that short pans can be blitted.
+        Tiles and features outside the clip extents of `ctx` are skipped; with
+        `repair` (a damaged area of an existing composition) the tile bookkeeping
+        and prefetching of the view are left untouched.
+        """
+        clip = ctx.clip_extents()
+        margin = self.base_surface.margin
         lat = self.map_state.center_loc_lat
         lon = self.map_state.center_loc_lon
         zoom = self.map_state.curr_zoom
@@ -284,8 +557,8 @@ class MapVisualize(Gtk.DrawingArea):
 
         center_x, center_y = self.deg2num(lat, lon, zoom)
 
-        tiles_x = math.ceil(width / TILE_SIZE) + 2
-        tiles_y = math.ceil(height / TILE_SIZE) + 2
+        tiles_x = math.ceil((width + 2 * margin) / TILE_SIZE) + 2
+        tiles_y = math.ceil((height + 2 * margin) / TILE_SIZE) + 2
         start_x = int(center_x - tiles_x // 2)
         start_y = int(center_y - tiles_y // 2)
 
@@ -293,59 +566,196 @@ class MapVisualize(Gtk.DrawingArea):
         offset_x = width / 2 - (center_x - start_x) * TILE_SIZE + self.map_state.offset_x
         offset_y = height / 2 - (center_y - start_y) * TILE_SIZE + self.map_state.offset_y
 
+        # Tile coordinate currently shown at the widget center (includes drag offset)
+        view_cx = center_x - self.map_state.offset_x / TILE_SIZE
+        view_cy = center_y - self.map_state.offset_y / TILE_SIZE
+        visible_keys = set()
+        tile_slots = {}
+        tile_positions = []  # (key, draw_x, draw_y, priority) of every drawn tile slot, for layer overlays
+        num_tiles = 1 << zoom
+
         for i in range(tiles_x):
             for j in range(tiles_y):
                 x = start_x + i
                 y = start_y + j
-                tile_path = self.query_tile(x, y, self.map_state.curr_zoom)
-                # LOG_DEBUG(f"Tile path: {tile_path}")
-                if tile_path:
-                    try:
-                        key = f"{self.map_state.curr_zoom}/{x}/{y}"
-
-                        # Try to get from memory cache
-                        pixbuf = self._get_cached_tile(key)
-
-                        if pixbuf is None:
-                            # Not cached yet → show placeholder and load in background
-                            pixbuf = self.empty_pixbuf
-                            self.queue_tile_load(key, tile_path)
-
-                        draw_x = round(i * TILE_SIZE + offset_x)
-                        draw_y = round(j * TILE_SIZE + offset_y)
-                        Gdk.cairo_set_source_pixbuf(ctx, pixbuf, draw_x, draw_y)
-                        ctx.paint()
-                    except Exception as e:
-                        LOG_ERR(f"Error drawing tile {x},{y}: {e}")
-
-        # Draw real-time ship marker (instead of GPS pixbuf)
-        if self.map_state.gps_loc_lat is not None and self.map_state.gps_loc_lon is not None:
-            gps_xtile, gps_ytile = self.deg2num(
-                self.map_state.gps_loc_lat,
-                self.map_state.gps_loc_lon,
-                self.map_state.curr_zoom
-            )
+                if x < 0 or y < 0 or x >= num_tiles or y >= num_tiles:
+                    continue
+                try:
+                    key = (zoom, x, y)
+                    visible_keys.add(key)
+
+                    draw_x = round(i * TILE_SIZE + offset_x)
+                    draw_y = round(j * TILE_SIZE + offset_y)
+                    tile_slots[key] = (draw_x, draw_y)
+                    if not _rect_intersects((draw_x, draw_y, TILE_SIZE, TILE_SIZE), clip):
+                        continue
+                    priority = math.hypot(x + 0.5 - view_cx, y + 0.5 - view_cy)
+                    tile_positions.append((key, draw_x, draw_y, priority))
+
+                    # Try to get from memory cache (no tile source access for cached tiles)
+                    surface = self._get_cached_tile(key)
+                    if surface is None:
+                        exists = self.query_tile(x, y, zoom)
+                        if exists is None:
+                            continue
+                        if not exists:
+                            # Known-missing tile: shared placeholder, remembered in the
+                            # cache so later frames skip the existence check as well.
+                            # A failed download is not: it is tried again later
+                            if key not in self.tile_download_failed:
+                                self._set_cached_tile(key, self.empty_surface)
+                            ctx.set_source_surface(self.empty_surface, draw_x, draw_y)
+                            ctx.paint()
+                            continue
+                        # Not cached yet → load in background, meanwhile draw a scaled
+                        # ancestor/descendant from the cache (or the empty placeholder)
+                        self.queue_tile_load(key, priority)
+                        if self._draw_tile_fallback(ctx, key, draw_x, draw_y):
+                            continue
+                        surface = self.empty_surface
+
+                    # Cached tiles are already premultiplied cairo surfaces: no conversion here
+                    ctx.set_source_surface(surface, draw_x, draw_y)
+                    ctx.paint()
+                except Exception as e:
+                    LOG_ERR(f"Error drawing tile {x},{y}: {e}")
 
-            gps_px = round((gps_xtile - start_x) * TILE_SIZE + offset_x)
-            gps_py = round((gps_ytile - start_y) * TILE_SIZE + offset_y)
+        # Warm the cache around / ahead of the view; this also drops queued loads
+        # for tiles that have left the viewport
+        if not repair:
+            self.visible_keys = visible_keys
+            self.tile_slots = tile_slots
+            self.composed_tiles = (zoom, start_x, start_y, start_x + tiles_x - 1, start_y + tiles_y - 1)
+            self.prefetch_tiles()
 
-            if 0 <= gps_px < width and 0 <= gps_py < height:
-                # Update marker position
-                self.map_state.my_ship_marker.set_location(self.map_state.gps_loc_lat, self.map_state.gps_loc_lon)
-                # Draw marker at map coordinates
-                self.map_state.my_ship_marker.draw(ctx, gps_px, gps_py, center=True)
-
-                # LOG_DEBUG(f"[✓] Draw ship marker '{self.map_state.my_ship_marker.name}' "
-                #         f"at ({gps_px}, {gps_py}) heading={self.map_state.my_ship_marker.heading}")
-            else:
-                LOG_DEBUG(f"[ ] Ship marker out of view: ({gps_px}, {gps_py})")
-        
         # Draw all added layers
+        if self.layer_raster_cache is not None:
+            self._draw_layers_rasterized(ctx, tile_positions, repair)
+        else:
+            for layer in self.layers:
+                if hasattr(layer, "draw"):
+                    layer.draw(ctx, self)
+                elif hasattr(layer, "render"):
+                    layer.render(ctx, self)
+
+        # Labels of all layers in one pass: no overlaps, also across layers. Always
+        # placed over the whole composition, so a repaired area gets the same labels
+        self.label_renderer.draw(
+            ctx, self.layers, self.view_transform_get(), (-margin, -margin, width + margin, height + margin)
+        )
+
+    def _draw_layers_rasterized(self, ctx, tile_positions, repair=False):
+        """
+        Draw the layers from their cached overlay tiles (ENABLE_FEATURE_LAYER_RASTER_CACHE).
+
+        Missing overlay tiles are queued for background rendering; meanwhile the
+        layer is drawn as vectors, clipped to those tiles only.
+        """
+        cache = self.layer_raster_cache
+        wanted = set()
+
         for layer in self.layers:
-            if hasattr(layer, "draw"):
-                layer.draw(ctx, self)
-            elif hasattr(layer, "render"):
+            if not hasattr(layer, "render_transform"):
+                if hasattr(layer, "draw"):
+                    layer.draw(ctx, self)
+                elif hasattr(layer, "render"):
+                    layer.render(ctx, self)
+                continue
+
+            missing = []
+            for (zoom, x, y), draw_x, draw_y, priority in tile_positions:
+                surface, key = cache.lookup(layer, zoom, x, y)
+                if surface is None:
+                    wanted.add(key)
+                    cache.request(layer, key, priority)
+                    missing.append((draw_x, draw_y))
+                elif surface is not LAYER_TILE_EMPTY:
+                    ctx.set_source_surface(surface, draw_x, draw_y)
+                    ctx.paint()
+
+            if missing:
+                ctx.save()
+                for draw_x, draw_y in missing:
+                    ctx.rectangle(draw_x, draw_y, TILE_SIZE, TILE_SIZE)
+                ctx.clip()
                 layer.render(ctx, self)
+                ctx.restore()
+
+        # Overlay tiles no longer on screen (or of removed layers) are not rendered;
+        # a repair only sees part of the screen
+        if not repair:
+            cache.cancel_except(wanted)
+
+    def _layer_tile_ready(self, key):
+        """Render worker callback: redraw the slot of a finished overlay tile on the next frame, with the other arrivals."""
+        with self.tiles_lock:
+            self.layer_tiles_arrived.append(key)
+            first = len(self.layer_tiles_arrived) + len(self.tiles_arrived) == 1
+        if first:
+            GLib.idle_add(self._tiles_arrived_notify)
+
+    def _draw_tile_fallback(self, ctx, key, draw_x, draw_y):
+        """
+        Draw a placeholder for a tile that is still loading, using cached tiles of other zooms.
+
+        1. Nearest cached ancestor (z-1, z-2, ...): the matching sub-rectangle is upscaled.
+        2. Otherwise cached descendants (z+1, ...): they are downsampled into place.
+
+        Returns:
+            bool: True if something was drawn, False if no usable tile is cached.
+        """
+        zoom, x, y = key
+        tiles = self.map_state.tiles
+
+        # --- Ancestors: upscale the covering sub-rectangle ---
+        for dz in range(1, min(TILE_FALLBACK_PARENT_LEVELS, zoom) + 1):
+            parent = tiles.peek((zoom - dz, x >> dz, y >> dz))
+            if parent is None or parent is self.empty_surface:
+                continue
+
+            scale = 1 << dz
+            sub_size = TILE_SIZE / scale
+            src_x = (x - ((x >> dz) << dz)) * sub_size
+            src_y = (y - ((y >> dz) << dz)) * sub_size
+
+            ctx.save()
+            ctx.rectangle(draw_x, draw_y, TILE_SIZE, TILE_SIZE)
+            ctx.clip()
+            ctx.translate(draw_x, draw_y)
+            ctx.scale(scale, scale)
+            ctx.set_source_surface(parent, -src_x, -src_y)
+            ctx.paint()
+            ctx.restore()
+            return True
+
+        # --- Descendants: downsample whichever children are cached ---
+        for dz in range(1, TILE_FALLBACK_CHILD_LEVELS + 1):
+            count = 1 << dz
+            children = []
+            for i in range(count):
+                for j in range(count):
+                    child = tiles.peek((zoom + dz, x * count + i, y * count + j))
+                    if child is not None and child is not self.empty_surface:
+                        children.append((i, j, child))
+            if not children:
+                continue
+
+            # Missing children keep the empty placeholder underneath
+            if len(children) < count * count:
+                ctx.set_source_surface(self.empty_surface, draw_x, draw_y)
+                ctx.paint()
+
+            ctx.save()
+            ctx.translate(draw_x, draw_y)
+            ctx.scale(1.0 / count, 1.0 / count)
+            for i, j, child in children:
+                ctx.set_source_surface(child, i * TILE_SIZE, j * TILE_SIZE)
+                ctx.rectangle(i * TILE_SIZE, j * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+                ctx.fill()
+            ctx.restore()
+            return True
+
+        return False
 
     def deg2num(self, lat_deg, lon_deg, zoom):
         # LOG_DEBUG(f"deg2num input -> lat: {lat_deg}, lon: {lon_deg}, zoom: {zoom}")
@@ -401,102 +811,249 @@ class MapVisualize(Gtk.DrawingArea):
 
         return px, py
 
+    def lonlat_array_to_pixels(self, lonlat):
+        """
+        Vectorized `latlon_to_pixels` for many points at once.
+
+        The view parameters (widget size, center, zoom, pan offset) are read once
+        per call, so a whole ring or layer costs one projection instead of one
+        GObject round trip per vertex.
+
+        Args:
+            lonlat (np.ndarray): Array of shape (N, 2) with (lon, lat) in degrees (GeoJSON order).
+
+        Returns:
+            np.ndarray: float64 array of shape (N, 2) with (px, py) relative to the widget.
+        """
+        return self.view_transform_get().apply(projection_lonlat_to_mercator(lonlat))
+
+    def view_transform_get(self):
+        """
+        Return the normalized-Mercator → widget-pixel transform of the current view.
+
+        Vector layers keep their vertices in normalized Mercator units, so
+        projecting them for a frame is `transform.apply(merc)` (multiply-add only).
+
+        Returns:
+            MapViewTransform: (zoom, scale, origin) of the current view, including the pan offset.
+        """
+        zoom = self.map_state.curr_zoom
+        n = 2.0 ** zoom
+        center_x, center_y = self.deg2num(self.map_state.center_loc_lat, self.map_state.center_loc_lon, zoom)
+
+        return MapViewTransform(
+            zoom,
+            n * TILE_SIZE,
+            self.get_allocated_width() / 2 + self.map_state.offset_x - center_x * TILE_SIZE,
+            self.get_allocated_height() / 2 + self.map_state.offset_y - center_y * TILE_SIZE,
+        )
+
     def query_tile(self, x, y, zoom):
+        """
+        Check whether tile (zoom, x, y) is available from the current tile source.
+
+        Answered from the source's in-memory presence index once it is built
+        (see `_build_presence_index`); until then the storage is probed.
+
+        Returns:
+            bool | None: True if the tile exists, False if it is missing,
+                         None if out of range or no tile source is set.
+        """
         if x < 0 or y < 0 or x >= 2 ** zoom or y >= 2 ** zoom:
             return None
 
-        tile_name = os.path.join(str(zoom), str(x), f"{y}.png")
-        
-        # LOG_DEBUG(f" * tiles_dir_path: {self.map_state.tiles_dir_path}")
-        # LOG_DEBUG(f" * tile_name: {tile_name}")
+        if self.tile_source is None:
+            LOG_DEBUG("[✗] tile source not set")
+            return None
 
-        # Case 1: tiles_dir_path is set
-        if self.map_state.tiles_dir_path:
-            tile_path = os.path.join(self.map_state.tiles_dir_path, tile_name)
-        else:
-            # fallback to empty tile
-            tile_path = utils_path_get_asset("tiles", G_TILE_EMPTY)
-            LOG_DEBUG(f"[✗] tiles_dir_path not set, using empty tile: {tile_path}")
-            return tile_path
+        # Check if tile exists
+        if self.tile_source.has_tile(zoom, x, y):
+            return True
 
-        # LOG_DEBUG(f"Check tile path: {tile_path}")
+        if ENABLE_FEATURE_TILE_DOWNLOAD_RUNTIME:
+            key = (zoom, x, y)
+            failed_at = self.tile_download_failed.get(key)
+            if failed_at is not None and time.monotonic() - failed_at < TILE_DOWNLOAD_RETRY_S:
+                return False
 
-        # Check if tile exists
-        if not os.path.exists(tile_path):
-            if ENABLE_FEATURE_TILE_DOWNLOAD_RUNTIME:
-                os.makedirs(os.path.dirname(tile_path), exist_ok=True)
-                url = f"https://tile.openstreetmap.org/{zoom}/{x}/{y}.png"
-                headers = {
-                    "User-Agent": "MyGTKMapViewer/1.0 (ntkhuong.coder@gmail.com)"
-                }
-                req = urllib.request.Request(url, headers=headers)
-                try:
-                    # Add a small timeout to avoid hangs
-                    with urllib.request.urlopen(req, timeout=10) as response, open(tile_path, 'wb') as out_file:
-                        out_file.write(response.read())
-                    LOG_DEBUG(f"[✓] Downloaded tile: {tile_path}")
-                except Exception as e:
-                    LOG_ERR(f"[✗] Download error for tile {x},{y}: {e}")
-                    return utils_path_get_asset("tiles", G_TILE_EMPTY)
-            else:
-                tile_path = utils_path_get_asset("tiles", G_TILE_EMPTY)
+            url = f"https://tile.openstreetmap.org/{zoom}/{x}/{y}.png"
+            headers = {
+                "User-Agent": "MyGTKMapViewer/1.0 (ntkhuong.coder@gmail.com)"
+            }
+            req = urllib.request.Request(url, headers=headers)
+            try:
+                # Add a small timeout to avoid hangs
+                with urllib.request.urlopen(req, timeout=10) as response:
+                    data = response.read()
+                self.tile_download_failed.pop(key, None)
+                if self.tile_source.store_tile(zoom, x, y, data):
+                    LOG_DEBUG(f"[✓] Downloaded tile: {zoom}/{x}/{y}")
+                    return True
+                LOG_WARN(f"[✗] Tile source is read-only, downloaded tile dropped: {zoom}/{x}/{y}")
+            except Exception as e:
+                LOG_ERR(f"[✗] Download error for tile {x},{y}: {e}")
+                self.tile_download_failed[key] = time.monotonic()
 
-        # LOG_DEBUG(f"tile_path: {tile_path}")
-        return tile_path
+        return False
     # ****************************************************************************************
 
     # ****************************************************************************************
     # [ASYN LOADING]
     def _is_tile_cached(self, key):
-        with self.tiles_lock:
-            return key in self.map_state.tiles
+        return key in self.map_state.tiles
 
     def _get_cached_tile(self, key):
-        with self.tiles_lock:
-            return self.map_state.tiles.get(key)
+        return self.map_state.tiles.get(key)
 
-    def _set_cached_tile(self, key, pixbuf):
-        with self.tiles_lock:
-            self.map_state.tiles[key] = pixbuf
+    def _set_cached_tile(self, key, surface):
+        # The shared placeholder only costs its cache entry
+        size = TILE_PLACEHOLDER_CACHE_BYTES if surface is self.empty_surface else None
+        self.map_state.tiles.put(key, surface, size=size)
 
-    def queue_tile_load(self, key, tile_path):
+    def queue_tile_load(self, key, priority=0.0):
         """
         Schedule a background load for a tile if it's not cached and not already loading.
+        If the tile is already queued, only its priority is updated; a tile whose
+        load is already running is left alone.
+
+        Args:
+            key (tuple): Tile key (zoom, x, y).
+            priority (float): Distance from the viewport center (lower loads first).
         """
-        if self._is_tile_cached(key):
+        if self.tile_source is None or self._is_tile_cached(key):
             return
         with self.tiles_lock:
             if key in self.loading_keys:
+                self.tile_loader.reprioritize(key, priority)
                 return
             self.loading_keys.add(key)
 
-        # Start background worker
-        t = threading.Thread(target=self._tile_loader_thread, args=(key, tile_path), daemon=True)
-        t.start()
+        self.tile_loader.submit(key, self.tile_source, priority)
+
+    def prefetch_tiles(self):
+        """
+        Queue loads for tiles likely to be needed next: the ring just outside the
+        composed base surface (viewport + margin), the composition predicted
+        from the current motion and the next
+        zoom level. Prefetch loads are served after every visible tile and are
+        limited to MAP_TILE_PREFETCH_BUDGET_RATIO of the cache budget, without
+        ever evicting the tiles currently shown.
+
+        Queued loads that are neither visible nor part of the new plan are cancelled.
+        """
+        planned = []
+        if self.tile_source is not None and MAP_TILE_PREFETCH_BUDGET_RATIO > 0:
+            zoom = self.map_state.curr_zoom
+            width = self.get_allocated_width()
+            height = self.get_allocated_height()
+            center_x, center_y = self.deg2num(self.map_state.center_loc_lat, self.map_state.center_loc_lon, zoom)
+            view_cx = center_x - self.map_state.offset_x / TILE_SIZE
+            view_cy = center_y - self.map_state.offset_y / TILE_SIZE
+
+            # Budget: prefetched tiles may use their share of the cache, but never
+            # the bytes held by the visible tiles (they must not be evicted)
+            cache = self.map_state.tiles
+            tile_bytes = TILE_SIZE * TILE_SIZE * 4
+            budget = min(
+                cache.max_bytes * MAP_TILE_PREFETCH_BUDGET_RATIO,
+                cache.max_bytes - len(self.visible_keys) * tile_bytes,
+            )
+            # The composition already holds every tile around the viewport: plan around it
+            composed = self.composed_tiles
+            planned = self.tile_prefetcher.plan(
+                zoom, view_cx, view_cy,
+                width / 2 / TILE_SIZE, height / 2 / TILE_SIZE,
+                self.map_state.zoom_range[1],
+                limit=int(budget // tile_bytes),
+                exclude=self.visible_keys,
+                composed=composed[1:] if composed is not None and composed[0] == zoom else None,
+            )
+
+        indexed = self.tile_source is not None and self.tile_source.has_presence_index()
+        self.prefetch_keys = set()
+        for key, priority in planned:
+            # Known-missing tiles are skipped (without an index the loader caches the placeholder)
+            if indexed and not self.tile_source.has_tile(*key):
+                continue
+            self.prefetch_keys.add(key)
+            self.queue_tile_load(key, priority)
+
+        self.cancel_tile_loads(self.visible_keys | self.prefetch_keys)
+
+    def cancel_tile_loads(self, keep_keys):
+        """
+        Cancel queued tile loads whose key is not in `keep_keys`.
+        Loads already running in a worker are allowed to finish.
+        """
+        cancelled = self.tile_loader.cancel_except(keep_keys)
+        if cancelled:
+            with self.tiles_lock:
+                self.loading_keys.difference_update(cancelled)
 
-    def _tile_loader_thread(self, key, tile_path):
+    def _tile_loader_job(self, key, tile_source):
         """
-        Worker thread: load tile from disk, then hand-off to GTK main loop.
+        Worker job (runs in the loader pool): read tile from its source, then hand-off to GTK main loop.
         """
+        zoom, x, y = key
         try:
-            # Loading GdkPixbuf in a thread is generally fine if we only touch GTK in the main thread.
-            pixbuf = GdkPixbuf.Pixbuf.new_from_file(tile_path) if os.path.exists(tile_path) else self.empty_pixbuf
+            # Decoding + converting in a thread is fine as long as we only touch GTK in the main thread.
+            data = tile_source.read_tile(zoom, x, y)
+            surface = tile_surface_from_bytes(data) if data else self.empty_surface
         except Exception as e:
-            LOG_ERR(f"[tile_loader] Failed to load {tile_path}: {e}")
-            pixbuf = self.empty_pixbuf
+            LOG_ERR(f"[tile_loader] Failed to load {zoom}/{x}/{y} from {tile_source}: {e}")
+            surface = self.empty_surface
 
-        # Install into cache and trigger redraw on GTK main thread
-        GLib.idle_add(self._store_loaded_tile, key, pixbuf)
+        # Install into cache on the next frame (GTK main thread), with the other arrivals
+        with self.tiles_lock:
+            self.tiles_arrived.append((key, surface, tile_source))
+            first = len(self.tiles_arrived) + len(self.layer_tiles_arrived) == 1
+        if first:
+            GLib.idle_add(self._tiles_arrived_notify)
 
-    def _store_loaded_tile(self, key, pixbuf):
+    def _build_presence_index(self, tile_source):
         """
-        Runs on GTK main thread. Commit loaded pixbuf, clear 'loading' flag, and redraw.
+        Worker thread: index the tiles of a newly opened source so that
+        `query_tile` no longer touches the storage.
         """
-        self._set_cached_tile(key, pixbuf)
-        with self.tiles_lock:
-            self.loading_keys.discard(key)
-        self.queue_draw()
+        try:
+            count = tile_source.build_presence_index()
+            LOG_DEBUG(f"[tile_source] Presence index ready: {count} tiles in {tile_source}")
+        except Exception as e:
+            LOG_WARN(f"[tile_source] Presence index unavailable for {tile_source}: {e}")
+
+    def _tiles_arrived_notify(self):
+        """Runs on GTK main thread, once per batch of tile / overlay tile arrivals: schedule the next frame."""
+        self._frame_request()
         return False  # remove this idle handler
+
+    def _tiles_arrived_commit(self):
+        """
+        Runs on GTK main thread (see _frame_tick). Commit the tiles loaded since the last
+        frame, clear their 'loading' flag, and queue the redraw of their slots and of
+        the slots of the overlay tiles rendered since the last frame.
+        Tiles read from a previous extent's source are dropped.
+        """
+        with self.tiles_lock:
+            arrived = [(key, surface) for key, surface, tile_source in self.tiles_arrived
+                       if tile_source is self.tile_source]
+            self.tiles_arrived = []
+            self.loading_keys.difference_update(key for key, _ in arrived)
+            # Overlay tile keys are (layer id, zoom, x, y, style): their map tile is key[1:4]
+            damaged = {key[1:4] for key in self.layer_tiles_arrived}
+            self.layer_tiles_arrived = []
+
+        for key, surface in arrived:
+            self._set_cached_tile(key, surface)
+            damaged.add(key)
+
+        for key in damaged:
+            # Prefetched tiles only warm the cache: redraw the slot of a shown tile only.
+            # Slots in the margin are off-screen: repaired with the next drawn frame
+            slot = self.tile_slots.get(key)
+            if key in self.visible_keys and slot is not None:
+                area = (slot[0], slot[1], TILE_SIZE, TILE_SIZE)
+                self.base_surface.damage(*area)
+                self.queue_draw_rect(self.base_surface.to_widget(area, self.map_state.offset_x, self.map_state.offset_y))
     # ****************************************************************************************
 
     # ****************************************************************************************
@@ -552,7 +1109,7 @@ class MapVisualize(Gtk.DrawingArea):
     def curr_gps_location_force(self):
         """
         Center the map on the current GPS location.
-        TODO: Map triggers a reload of all tiles → needs improvement for performance in this case.
+        Cached tiles are kept; only tiles not yet in the LRU cache are loaded.
         """
         if self.map_state.gps_loc_lat is None or self.map_state.gps_loc_lon is None:
             LOG_WARN("[✗] No GPS location set — cannot go to my location.")
@@ -563,9 +1120,6 @@ class MapVisualize(Gtk.DrawingArea):
         self.map_state.offset_x = 0
         self.map_state.offset_y = 0
 
-        # Clear tile cache to force re-render
-        self.map_state.tiles.clear()
-
         self.queue_draw()
         LOG_DEBUG(f"[✓] Map centered at GPS location: ({self.map_state.center_loc_lat:.6f}, {self.map_state.center_loc_lon:.6f})")
 
@@ -578,15 +1132,50 @@ class MapVisualize(Gtk.DrawingArea):
             LOG_WARN(f"Ignored invalid center location: lat={lat}, lon={lon}")
             return
 
+        marker = self.map_state.my_ship_marker
+        old_bounds = marker.last_paint_bounds
+        panned = self.map_state.offset_x != 0 or self.map_state.offset_y != 0
+
         self.map_state.gps_loc_lat = lat
         self.map_state.gps_loc_lon = lon
         # reset drag offsets so marker movement is clean, but do not change center here
         self.map_state.offset_x = 0
         self.map_state.offset_y = 0
-        self.map_state.my_ship_marker.set_location(self.map_state.gps_loc_lat, self.map_state.gps_loc_lon)
-        self.map_state.my_ship_marker.set_heading(heading_deg)  # or 0 if no heading
-        self.queue_draw()
+        marker.set_location(self.map_state.gps_loc_lat, self.map_state.gps_loc_lon)
+        marker.set_heading(heading_deg)  # or 0 if no heading
+        self._ship_velocity_update(lat, lon, heading_deg)
+
+        if panned:
+            self.queue_draw()
+        else:
+            # Only the marker moved: redraw its old and new areas
+            gps_px, gps_py = self.latlon_to_pixels(lat, lon)
+            self.queue_draw_rect(old_bounds)
+            self.queue_draw_rect(marker.paint_bounds(round(gps_px), round(gps_py)))
         LOG_INFO(f"GPS location updated to: ({lat:.6f}, {lon:.6f})")
+
+    def _ship_velocity_update(self, lat, lon, heading_deg):
+        """
+        Feed the ship motion (heading + speed from consecutive fixes) to the
+        prefetcher and re-plan. Only a ship shown in the view drives the prediction.
+        """
+        zoom = self.map_state.curr_zoom
+        tx, ty = self.deg2num(lat, lon, zoom)
+        now = time.monotonic()
+        last = self._ship_sample
+        self._ship_sample = (tx, ty, zoom, now)
+        if last is None or last[2] != zoom or now <= last[3]:
+            return
+
+        px, py = self.latlon_to_pixels(lat, lon)
+        if not (0 <= px < self.get_allocated_width() and 0 <= py < self.get_allocated_height()):
+            return
+
+        speed = math.hypot(tx - last[0], ty - last[1]) / (now - last[3])  # tiles/s
+        rad = math.radians(heading_deg or 0)
+        # Heading 0° = north = -y in tile coordinates
+        self.tile_prefetcher.velocity_update(speed * math.sin(rad), -speed * math.cos(rad))
+        self.prefetch_tiles()
     # ----------------------------------------------------------------------------------------
 
     # ----------------------------------------------------------------------------------------
@@ -671,7 +1260,7 @@ class MapVisualize(Gtk.DrawingArea):
         Update the map's extent, tile source, and zoom level — only if all parameters are valid.
 
         Parameters:
-            tile_base_path (str): Path to tile folder (must be a directory).
+            tile_base_path (str): Path to tile folder, or to a packed tile archive (.mbtiles / .tpk).
             center_lat (float): Latitude in range [-90, 90].
             center_lon (float): Longitude in range [-180, 180].
             zoom_range (tuple or object): Zoom range (tuple/list of 2 ints, or object with .min and .max).
@@ -683,13 +1272,15 @@ class MapVisualize(Gtk.DrawingArea):
         self.curr_gps_location_sim_stop()
 
         # --- Validate tile path ---
+        new_tile_source = None
         if tile_base_path:
             full_tile_path = os.path.join(VNEST_AUTOPILOT_DATABASE_PATH, tile_base_path)
+            new_tile_source = tile_source_open(full_tile_path, pool_size=MAP_TILE_LOADER_WORKERS + 1)
 
-            if os.path.isdir(full_tile_path):
-                LOG_DEBUG(f"[✓] Valid tile path: {full_tile_path}")
+            if new_tile_source is not None:
+                LOG_DEBUG(f"[✓] Valid tile path: {full_tile_path} ({new_tile_source.__class__.__name__})")
             else:
-                LOG_WARN(f"[✗] Invalid tile path (not a directory): {full_tile_path}")
+                LOG_WARN(f"[✗] Invalid tile path (not a tile directory or archive): {full_tile_path}")
                 valid = False
 
         # --- Validate center coordinates ---
@@ -740,6 +1331,12 @@ class MapVisualize(Gtk.DrawingArea):
         if valid:
             if tile_base_path:
                 self.map_state.tiles_dir_path = full_tile_path
+                if self.tile_source is not None:
+                    self.tile_source.close()
+                self.tile_source = new_tile_source
+                threading.Thread(
+                    target=self._build_presence_index, args=(new_tile_source,), daemon=True
+                ).start()
             if center_lat is not None and center_lon is not None:
                 self.map_state.center_loc_lat = center_lat
                 self.map_state.center_loc_lon = center_lon
@@ -749,10 +1346,22 @@ class MapVisualize(Gtk.DrawingArea):
             if parsed_zoom_range:
                 self.map_state.zoom_range = parsed_zoom_range
                 self.map_state.curr_zoom = parsed_zoom_range[0]
+                for layer in self.layers:
+                    self.layers_lod_rebuild_async(layer)
 
             self.map_state.offset_x = 0
             self.map_state.offset_y = 0
+            # Tile source may have changed: cached/queued tiles belong to the previous extent
+            self.visible_keys = set()
+            self.composed_tiles = None
+            self.prefetch_keys = set()
+            self.tile_download_failed.clear()
+            self.tile_prefetcher.velocity_reset()
+            self.cancel_tile_loads(set())
+            with self.tiles_lock:
+                self.loading_keys.clear()  # in-flight loads of the old source are dropped on arrival
             self.map_state.tiles.clear()
+            self.base_surface.invalidate()
             self.queue_draw()
 
             LOG_DEBUG("[✓] update_extent applied")
@@ -761,6 +1370,8 @@ class MapVisualize(Gtk.DrawingArea):
             # TODO: expose a flag parameter to control this behavior.
             self.curr_gps_location_sim_start()
         else:
+            if new_tile_source is not None:
+                new_tile_source.close()
             LOG_WARN("[✗] update_extent aborted due to invalid parameters")
     # ----------------------------------------------------------------------------------------
 
@@ -772,7 +1383,7 @@ class MapVisualize(Gtk.DrawingArea):
         
         if new_zoom != self.map_state.curr_zoom:
             self.map_state.curr_zoom = new_zoom
-            self.map_state.tiles.clear()
+            self.tile_prefetcher.velocity_reset()  # velocities are in tiles of the old zoom
             self.queue_draw()
             LOG_DEBUG(f"Zoom in (set to {self.map_state.curr_zoom})")
 
@@ -783,7 +1394,7 @@ class MapVisualize(Gtk.DrawingArea):
         
         if new_zoom != self.map_state.curr_zoom:
             self.map_state.curr_zoom = new_zoom
-            self.map_state.tiles.clear()
+            self.tile_prefetcher.velocity_reset()  # velocities are in tiles of the old zoom
             self.queue_draw()
             LOG_DEBUG(f"Zoom out (set to {self.map_state.curr_zoom})")
 
@@ -793,6 +1404,15 @@ class MapVisualize(Gtk.DrawingArea):
         """
         return self.map_state.curr_zoom
     # ----------------------------------------------------------------------------------------
+
+    # ----------------------------------------------------------------------------------------
+    # [API: Tile cache]
+    def tile_cache_stats_get(self):
+        """
+        Return tile cache statistics (entries, bytes, hits, misses, evictions).
+        """
+        return self.map_state.tiles.stats()
+    # ----------------------------------------------------------------------------------------
     # ----------------------------------------------------------------------------------------
         
     # ----------------------------------------------------------------------------------------
@@ -817,28 +1437,18 @@ class MapVisualize(Gtk.DrawingArea):
     # ----------------------------------------------------------------------------------------
     # [API: UPDATE LAYER]
     def layers_update(self, geojson_path, comboxbox_table):
+        """Load the active layers of an extent in the background (see layers_load_async)."""
         self.current_geojson_dir = geojson_path
+        self.layers_table = comboxbox_table
         active_layers = comboxbox_table.get_active_layers()
         LOG_DEBUG(f"Currently active layers: {active_layers}")
 
         for layer_name in active_layers:
             if layer_name in LAYER_CLASS_MAP:
-                layer_info = LAYER_CLASS_MAP[layer_name]
-                layer_class = layer_info["class"]
-
                 geojson_file = os.path.join(geojson_path, f"{layer_name}.geojson")
 
                 if os.path.exists(geojson_file):
-                    layer_instance = layer_class(
-                        filepath=geojson_file,
-                        line_color=layer_info.get("line_color", (0, 0, 0)),
-                        line_width=layer_info.get("width", 2),
-                        fill_color=layer_info.get("fill_color"),
-                        fill_opacity=layer_info.get("fill_opacity", 0.3),
-                        line_style=layer_info.get("line_style", "solid") 
-                    )
-                    self.add_layer(layer_instance)
-                    LOG_DEBUG(f"Added layer: {layer_name} with style {layer_info}")
+                    self.layers_load_async(layer_name, geojson_file)
                 else:
                     LOG_WARN(f"GeoJSON file not found for {layer_name}: {geojson_file}")
 
@@ -849,26 +1459,145 @@ class MapVisualize(Gtk.DrawingArea):
         if visible:
             if not matching_layers:  # Only load if not already loaded
                 if layer_name in LAYER_CLASS_MAP:
-                    layer_info = LAYER_CLASS_MAP[layer_name]
-                    layer_class = layer_info["class"]
                     geojson_file = os.path.join(self.current_geojson_dir, f"{layer_name}.geojson")
                     if os.path.exists(geojson_file):
-                        layer_instance = layer_class(
-                            filepath=geojson_file,
-                            line_color=layer_info.get("line_color", (0, 0, 0)),
-                            line_width=layer_info.get("width", 2),
-                            fill_color=layer_info.get("fill_color"),
-                            fill_opacity=layer_info.get("fill_opacity", 0.3),
-                            line_style=layer_info.get("line_style", "solid"),
-                            layer_id=layer_name,  # Make sure every feature has same id
-                        )
-                        self.add_layer(layer_instance)
+                        self.layers_load_async(layer_name, geojson_file)
         else:
-            # Remove ALL layers with this id (multi-polygons case)
+            # Drop a load still in progress, then remove ALL layers with this id (multi-polygons case)
+            self.layers_load_cancel(layer_name)
             for l in matching_layers:
                 self.remove_layer(l)
 
         self.queue_draw()
     # ----------------------------------------------------------------------------------------
 
+    # ----------------------------------------------------------------------------------------
+    # [LAYER LOADER]
+    def layers_load_async(self, layer_name, geojson_file):
+        """
+        Load a layer in a worker thread; it is added to the map once ready.
+
+        The worker parses the file, projects it and builds its LOD levels, so
+        the GTK main loop only appends the finished layer (see _layer_loaded).
+        Files without an up-to-date .geobin are decoded in the process pool,
+        so all layers of an extent are parsed in parallel. A layer loaded
+        before from the same unchanged file is taken from self.layer_cache.
+        """
+        if (layer_name, geojson_file) in self.layers_loading.values():
+            return  # already loading
+
+        cache_key = self.layer_cache.key(layer_name, geojson_file)
+        layer = self.layer_cache.get(cache_key)
+        if layer is not None:
+            if layer not in self.layers:
+                self.add_layer(layer)
+            return
+
+        parse_future = None
+        if not layer_geobin_is_fresh(geojson_file):
+            parse_future = self.layer_parse_pool.submit(geojson_file)
+
+        token = object()
+        self.layers_loading[token] = (layer_name, geojson_file)
+        self.layer_loader.submit(token, (layer_name, geojson_file, self.map_state.zoom_range, parse_future, cache_key, None))
+        self._layer_loading_notify(layer_name)
+
+    def layers_lod_rebuild_async(self, layer):
+        """
+        Rebuild the LOD levels of a shown layer for the current zoom range in the layer loader.
+
+        The layer keeps drawing with its previous levels until _layer_loaded
+        swaps the new pyramid in.
+        """
+        zoom_range = self.map_state.zoom_range
+        if not hasattr(layer, "lod_rebuild") or layer.lod_built_for(zoom_range):
+            return
+        layer_name, geojson_file = layer.layer_id, layer.filepath
+        if (layer_name, geojson_file) in self.layers_loading.values():
+            return  # the running load or rebuild re-checks the range when it ends
+
+        token = object()
+        self.layers_loading[token] = (layer_name, geojson_file)
+        self.layer_loader.submit(token, (layer_name, geojson_file, zoom_range, None, None, layer))
+        self._layer_loading_notify(layer_name)
+
+    def layers_load_cancel(self, layer_name):
+        """Forget the pending loads of a layer (a load already running is dropped when it ends)."""
+        tokens = [token for token, (name, _) in self.layers_loading.items() if name == layer_name]
+        if not tokens:
+            return
+        for token in tokens:
+            del self.layers_loading[token]
+        self.layer_loader.cancel_except(set(self.layers_loading))
+        self._layer_loading_notify(layer_name)
+
+    def _layer_create(self, layer_name, geojson_file, layer_data=None):
+        """Instantiate a layer with its LAYER_CLASS_MAP style (`layer_data`: already parsed file content)."""
+        layer_info = LAYER_CLASS_MAP[layer_name]
+        layer_class = layer_info["class"]
+        return layer_class(
+            filepath=geojson_file,
+            line_color=layer_info.get("line_color", (0, 0, 0)),
+            line_width=layer_info.get("width", 2),
+            fill_color=layer_info.get("fill_color"),
+            fill_opacity=layer_info.get("fill_opacity", 0.3),
+            line_style=layer_info.get("line_style", "solid"),
+            layer_id=layer_name,  # Make sure every feature has same id
+            layer_data=layer_data,
+        )
+
+    def _layer_loader_job(self, token, payload):
+        """Worker thread: build the layer (or the new LOD levels of `rebuild_layer`), then hand it to the main loop."""
+        layer_name, geojson_file, zoom_range, parse_future, cache_key, rebuild_layer = payload
+        if rebuild_layer is not None:
+            try:
+                lod = rebuild_layer.lod_rebuild(zoom_range)
+            except Exception as e:
+                LOG_ERR(f"Failed to build LOD levels of layer {layer_name}: {e}")
+                lod = None
+            GLib.idle_add(self._layer_loaded, token, rebuild_layer, lod)
+            return
+
+        layer_data = None
+        if parse_future is not None:
+            try:
+                layer_data = parse_future.result()
+            except Exception as e:
+                LOG_WARN(f"Parse worker failed for {geojson_file} ({e}), parsing in-process")
+        try:
+            layer = self._layer_create(layer_name, geojson_file, layer_data)
+            if hasattr(layer, "lod_build"):
+                layer.lod_build(zoom_range)
+            self.layer_cache.put(cache_key, layer)  # also kept if hidden meanwhile
+        except Exception as e:
+            LOG_ERR(f"Failed to load layer {layer_name} from {geojson_file}: {e}")
+            layer = None
+        GLib.idle_add(self._layer_loaded, token, layer)
+
+    def _layer_loaded(self, token, layer, lod=None):
+        """Main loop: add a loaded layer (or swap in its rebuilt `lod`) unless cancelled meanwhile."""
+        pending = self.layers_loading.pop(token, None)
+        if pending is None:
+            return False  # hidden while loading
+        layer_name, geojson_file = pending
+
+        if lod is not None:
+            layer.lod_set(lod)
+            if layer in self.layers:
+                self.base_surface.invalidate()
+                self.queue_draw()
+                self.layers_lod_rebuild_async(layer)  # zoom range changed again meanwhile
+        elif layer is not None and layer not in self.layers:
+            self.add_layer(layer)
+            LOG_DEBUG(f"Added layer: {layer_name} from {geojson_file}")
+        self._layer_loading_notify(layer_name)
+        return False
+
+    def _layer_loading_notify(self, layer_name):
+        """Show in the checkbox table whether a layer still has a load in progress."""
+        if self.layers_table is not None:
+            loading = any(name == layer_name for name, _ in self.layers_loading.values())
+            self.layers_table.layer_loading_set(layer_name, loading)
+    # ----------------------------------------------------------------------------------------
+
     # ****************************************************************************************
@@ -27,6 +27,8 @@ import gi
 gi.require_version("Gtk", "3.0")
 from gi.repository import Gtk
 
+import math
+
 from views.map.map_visualize import MapVisualize
 
 from utils.log import utils_log_get_logger
@@ -153,7 +155,7 @@ class MapView(Gtk.Overlay):
         self.info_label.set_margin_top(MARGIN_BASE)
         self.info_label.get_style_context().add_class("map_info_label")
         self.add_overlay(self.info_label)
-        self.map_visualize.connect("view-changed", lambda *a: self.update_info_label())
+        self.map_visualize.connect("view-changed", self.on_view_changed)
 
         # Initial update
         self.update_info_label()
@@ -205,15 +207,29 @@ class MapView(Gtk.Overlay):
     def on_pan_right(self, button): self.map_visualize.pan_handler_right()
     def on_my_location(self, button): self.map_visualize.curr_gps_location_force()
 
-    def update_info_label(self):
-        """Update info label with current center coordinates and zoom level."""
-        zoom = self.map_visualize.zoom_level_get_curr_value()
-        center_lat, center_lon = self.map_visualize.curr_center_location_get()
+    def on_view_changed(self, widget, center_lat, center_lon, zoom, offset_x, offset_y):
+        """view-changed handler: the new view comes with the signal (NaN center = no tiles directory)."""
+        if math.isnan(center_lat) or math.isnan(center_lon):
+            center_lat = center_lon = None
+        self.update_info_label(center_lat, center_lon, zoom)
+
+    def update_info_label(self, center_lat=None, center_lon=None, zoom=None):
+        """
+        Update info label with center coordinates and zoom level.
+
+        Without arguments, the current view is queried from MapVisualize. The
+        label text is only set when it changes (set_text queues a relayout).
+        """
+        if zoom is None:
+            zoom = self.map_visualize.zoom_level_get_curr_value()
+            center_lat, center_lon = self.map_visualize.curr_center_location_get()
         if center_lat is None or center_lon is None:
             self.info_label.hide()
         else:
             self.info_label.show()
-            self.info_label.set_text(f"[{center_lat:.6f}, {center_lon:.6f}] [Zoom: {zoom}]")
+            text = f"[{center_lat:.6f}, {center_lon:.6f}] [Zoom: {zoom}]"
+            if text != self.info_label.get_text():
+                self.info_label.set_text(text)
 
     # ----------------------------------------------------------------------------------------
     # [Common Popup Methods]